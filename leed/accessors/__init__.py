@@ -1,2 +1,3 @@
 from .featureAccessor import FeatureAccessor
+from .spectrum import Spectrum
 from .spectrumAccessor import SpectrumAccessor
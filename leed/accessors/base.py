@@ -1,9 +1,55 @@
+import abc
+from typing import Tuple, Union
+
 import numpy as np
 
 import pandas as pd
 
 
-class Base:
+class SpectralArrays(abc.ABC):
+    """Base class for objects exposing spectral data as ``wave`` and ``flux`` arrays
+
+    Calculation mixins only rely on the ``wave`` and ``flux`` attributes, so
+    they can run on both the pandas accessors and ``Spectrum`` instances.
+    """
+
+    __slots__ = ()
+
+    wave: np.array
+    flux: np.array
+
+    @abc.abstractmethod
+    def _like(self, flux: np.array) -> Union[pd.Series, 'SpectralArrays']:
+        """Wrap flux values sampled on the current wavelengths in the current data type
+
+        Args:
+            flux: Flux values to wrap
+
+        Returns:
+            An object of the same kind as the current spectrum
+        """
+
+    def _continuumArrays(self, continuum: Union[pd.Series, 'SpectralArrays', np.array]) -> Tuple[np.array, np.array]:
+        """Return the wavelength and flux values of a continuum
+
+        Args:
+            continuum: A ``Series``, spectral object, or array sampled on the current wavelengths
+
+        Returns:
+            - The wavelength values of the continuum
+            - The flux values of the continuum
+        """
+
+        if isinstance(continuum, pd.Series):
+            return continuum.index.values, continuum.values
+
+        if isinstance(continuum, SpectralArrays):
+            return continuum.wave, continuum.flux
+
+        return self.wave, np.asarray(continuum)
+
+
+class Base(SpectralArrays):
     """Base class to use for constructing pandas accessors for spectral data"""
 
     def __init__(self, obj: pd.Series) -> None:
@@ -16,7 +62,7 @@ class Base:
             ValueError: If the series is not sorted
         """
 
-        if not self._obj.index.is_monotonic:
+        if not self._obj.index.is_monotonic_increasing:
             raise ValueError('Series index must be sorted')
 
     @property
@@ -30,3 +76,26 @@ class Base:
         """Return series data as an array"""
 
         return self._obj.values
+
+    @property
+    def core(self) -> 'Spectrum':
+        """Array backed ``Spectrum`` sharing memory with the pandas object
+
+        pandas reuses an accessor for the lifetime of a ``Series``, so the
+        spectrum is built from the current index and values on every access.
+        This only creates views of the existing arrays and checks the
+        wavelengths are sorted.
+
+        Raises:
+            ValueError: If the series is not sorted
+        """
+
+        # Imported here to avoid a circular import with the calculation mixins
+        from .spectrum import Spectrum
+
+        return Spectrum.fromSeries(self._obj)
+
+    def _like(self, flux: np.array) -> pd.Series:
+        """Wrap flux values sampled on the current wavelengths in a ``Series``"""
+
+        return pd.Series(flux, index=self.wave)
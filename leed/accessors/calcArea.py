@@ -1,13 +1,17 @@
+from typing import Union
+
 import numpy as np
 import pandas as pd
 
-from leed.accessors.base import Base
+from leed.accessors.base import SpectralArrays
 
 
-class CalcArea(Base):
+class CalcArea(SpectralArrays):
     """Represents the area calculation for a spectroscopic feature"""
 
-    def _continuumArea(self, continuum: pd.Series) -> float:
+    __slots__ = ()
+
+    def _continuumArea(self, continuum: Union[pd.Series, SpectralArrays, np.array]) -> float:
         """The area under the pseudo continuum curve
 
         Args:
@@ -15,8 +19,9 @@ class CalcArea(Base):
         """
 
         # Evaluate continuum at beginning and end of feature
-        y1 = np.interp(self.wave.min(), continuum.index, continuum)
-        y2 = np.interp(self.wave.max(), continuum.index, continuum)
+        continuumWave, continuumFlux = self._continuumArrays(continuum)
+        y1 = np.interp(self.wave.min(), continuumWave, continuumFlux)
+        y2 = np.interp(self.wave.max(), continuumWave, continuumFlux)
 
         # Treat continuum as a straight-line and find the area underneath
         return (self.wave[-1] - self.wave[0]) * (y1 + y2) / 2
@@ -26,7 +31,7 @@ class CalcArea(Base):
 
         return np.trapz(y=self.flux, x=self.wave)
 
-    def area(self, continuum: pd.Series) -> float:
+    def area(self, continuum: Union[pd.Series, SpectralArrays, np.array]) -> float:
         """The area of the feature
 
         Area is determined between the sudo continuum of the binned flux
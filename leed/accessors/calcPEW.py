@@ -1,17 +1,24 @@
+from typing import Union
+
 import numpy as np
 import pandas as pd
 
-from leed.accessors.base import Base
+from leed.accessors.base import SpectralArrays
 
 
-class CalcPEW(Base):
+class CalcPEW(SpectralArrays):
     """Represents the pEW calculation for a spectroscopic feature"""
 
-    def pew(self, continuum: pd.Series) -> float:
+    __slots__ = ()
+
+    def pew(self, continuum: Union[pd.Series, SpectralArrays, np.array]) -> float:
         """Calculate the pseudo equivalent-width of the feature
 
+        The continuum must be sampled on the same wavelengths as the feature.
+
         Returns:
             The pseudo equivalent-width of the feature
         """
 
-        return (self.wave[-1] - self.wave[0]) - np.trapz(y=(self._obj / continuum), x=self.wave)
+        _, continuumFlux = self._continuumArrays(continuum)
+        return (self.wave[-1] - self.wave[0]) - np.trapz(y=(self.flux / continuumFlux), x=self.wave)
@@ -1,13 +1,21 @@
+from typing import Union
+
 import pandas as pd
 
-from leed.accessors.base import Base
+from leed.accessors.base import SpectralArrays
 
 
-class calcPseudoContinuum(Base):
+class calcPseudoContinuum(SpectralArrays):
     """Fitting of the pseudo-continuum for a spectroscopic SN feature"""
 
-    def fitPseudoContinuum(self) -> pd.Series:
-        """Array of values for the fitted sudo continuum"""
+    __slots__ = ()
+
+    def fitPseudoContinuum(self) -> Union[pd.Series, SpectralArrays]:
+        """Array of values for the fitted sudo continuum
+
+        Returns:
+            The continuum as the same data type as the feature (e.g., a ``Series``)
+        """
 
         # Fit a line to the end points
         x0, x1 = self.wave[0], self.wave[-1]
@@ -15,4 +23,4 @@ class calcPseudoContinuum(Base):
         m = (y0 - y1) / (x0 - x1)
         b = - m * x0 + y0
 
-        return pd.Series(m * self.wave + b, index=self.wave)
+        return self._like(m * self.wave + b)
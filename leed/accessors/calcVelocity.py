@@ -1,16 +1,23 @@
 from dataclasses import dataclass
+from typing import Optional, Tuple, Union
 
 import numpy as np
-from astropy import units
-from astropy.constants import c
-from scipy.optimize import curve_fit
 
-from leed.accessors.base import Base
+from leed.accessors.base import SpectralArrays
+
+SPEED_OF_LIGHT = 299792.458  # km / s
+
+
+FIT_METHODS = ('exact', 'fast', 'refine')
 
 
 @dataclass
 class GaussianFit:
-    """Basic wrapper to provide easy access to fitted Gaussian parameters"""
+    """Basic wrapper to provide easy access to fitted Gaussian parameters
+
+    Fits to a batch of samples store each parameter as an array with one
+    element per sample and a covariance array of shape ``(N, 4, 4)``.
+    """
 
     amplitude: float
     avg: float
@@ -20,24 +27,59 @@ class GaussianFit:
 
     @property
     def amplitudeErr(self) -> None:  # pragma: no cover
-        return np.sqrt(self.cov[0][0])
+        return np.sqrt(self.cov[..., 0, 0])
 
     @property
     def avgErr(self) -> None:  # pragma: no cover
-        return np.sqrt(self.cov[1][1])
+        return np.sqrt(self.cov[..., 1, 1])
 
     @property
     def stdDevErr(self) -> None:  # pragma: no cover
-        return np.sqrt(self.cov[2][2])
+        return np.sqrt(self.cov[..., 2, 2])
 
     @property
     def offsetErr(self) -> None:  # pragma: no cover
-        return np.sqrt(self.cov[3][3])
+        return np.sqrt(self.cov[..., 3, 3])
+
+    @property
+    def params(self) -> np.array:
+        """The fitted parameters in the order expected by ``CalcVelocity.gaussian``"""
+
+        return np.array([self.amplitude, self.avg, self.stdDev, self.offset])
+
+    def __getitem__(self, item: int) -> 'GaussianFit':
+        """Return the fit for a single sample from a batch of fits"""
+
+        return GaussianFit(*self.params[:, item], self.cov[item])
+
+    def isPlausible(self, waveMin: Union[float, np.array], waveMax: Union[float, np.array]) -> Union[bool, np.array]:
+        """Return whether the fit describes a feature within a given wavelength range
+
+        A fit is plausible if it succeeded, is centered within the range, and
+        is narrower than the range. Poorly constrained fits can instead
+        approximate a parabola using an extremely wide and deep gaussian.
+
+        Args:
+            waveMin: The smallest wavelength of the fitted sample(s)
+            waveMax: The largest wavelength of the fitted sample(s)
+
+        Returns:
+            A boolean, or a boolean array for a batch of fits
+        """
+
+        with np.errstate(invalid='ignore'):
+            return (
+                    np.isfinite(self.avgErr)
+                    & (waveMin <= self.avg) & (self.avg <= waveMax)
+                    & (np.abs(self.stdDev) < waveMax - waveMin)
+            )
 
 
-class CalcVelocity(Base):
+class CalcVelocity(SpectralArrays):
     """Represents the velocity calculation for a spectroscopic feature"""
 
+    __slots__ = ()
+
     @staticmethod
     def gaussian(x: np.array, depth: float, avg: float, std: float, offset: float) -> np.array:
         """Evaluate a negative gaussian
@@ -57,19 +99,56 @@ class CalcVelocity(Base):
 
         return -depth * np.exp(-((x - avg) ** 2) / (2 * std ** 2)) + offset
 
-    def _fitGaussian(self) -> GaussianFit:
-        """Fitted an negative gaussian to the binned flux
+    @staticmethod
+    def gaussianJacobian(x: np.array, depth: float, avg: float, std: float, offset: float) -> np.array:
+        """Evaluate the partial derivatives of ``gaussian`` with respect to each parameter
+
+        Args:
+            x: Values to evaluate the derivatives at
+            depth: Amplitude of the gaussian
+            avg: Average of the gaussian
+            std: Standard deviation of the gaussian
+            offset: Vertical offset
 
         Returns:
-            A list of fitted parameters
+            An array of shape ``(len(x), 4)``
+        """
+
+        delta = x - avg
+        exponential = np.exp(-(delta ** 2) / (2 * std ** 2))
+        return np.stack([
+            -exponential,
+            -depth * exponential * delta / std ** 2,
+            -depth * exponential * delta ** 2 / std ** 3,
+            np.ones_like(exponential)
+        ], axis=-1)
+
+    @staticmethod
+    def fitGaussian(wave: np.array, flux: np.array, guess: Optional[GaussianFit] = None) -> GaussianFit:
+        """Fit a negative gaussian to the given wavelength and flux values
+
+        Args:
+            wave: Wavelength values to fit
+            flux: Flux values to fit
+            guess: Optional fit result to use as the initial parameter guess
+
+        Returns:
+            The fitted gaussian parameters
         """
 
+        p0 = [0.5, np.median(wave), 50., 0]
+        if guess is not None and np.all(np.isfinite(guess.params)):
+            p0 = guess.params
+
+        from scipy.optimize import curve_fit
+
         try:
             gaussParams, cov = curve_fit(
-                f=self.gaussian,
-                xdata=self.wave,
-                ydata=self.flux,
-                p0=[0.5, np.median(self.wave), 50., 0])
+                f=CalcVelocity.gaussian,
+                xdata=wave,
+                ydata=flux,
+                p0=p0,
+                jac=CalcVelocity.gaussianJacobian)
 
         except RuntimeError:
             gaussParams = [np.nan, np.nan, np.nan, np.nan]
@@ -77,7 +156,271 @@ class CalcVelocity(Base):
 
         return GaussianFit(*gaussParams, cov)
 
-    def velocity(self, restFrame: float) -> float:
+    @staticmethod
+    def refineGaussian(wave: np.array, flux: np.array, guess: GaussianFit) -> GaussianFit:
+        """Fit a negative gaussian using ``curve_fit``, starting from a closed form fit
+
+        The fixed initial guess of ``fitGaussian`` is used instead if the
+        closed form fit, or the fit refined from it, is not plausible (see
+        ``GaussianFit.isPlausible``).
+
+        Args:
+            wave: Wavelength values to fit
+            flux: Flux values to fit
+            guess: Fit returned by ``fitGaussianLinearized`` for the same values
+
+        Returns:
+            The fitted gaussian parameters
+        """
+
+        if guess.isPlausible(wave[0], wave[-1]):
+            refinedFit = CalcVelocity.fitGaussian(wave, flux, guess)
+            if refinedFit.isPlausible(wave[0], wave[-1]):
+                return refinedFit
+
+        return CalcVelocity.fitGaussian(wave, flux)
+
+    @staticmethod
+    def refineGaussianBatch(
+            wave: np.array, flux: np.array, guess: GaussianFit, maxIterations: int = 100, tolerance: float = 1.49012e-08
+    ) -> Tuple[GaussianFit, np.array]:
+        """Refine closed form fits to many flux realizations at once
+
+        Every realization is fit by nonlinear least squares using
+        Levenberg-Marquardt iterations that are evaluated for all
+        realizations at once, starting from the given closed form fits. The
+        covariance is scaled by the reduced chi-squared, matching the
+        covariance returned by ``curve_fit``.
+
+        Args:
+            wave: 1D array of wavelength values
+            flux: Flux values with shape ``(N, len(wave))``
+            guess: Fits returned by ``fitGaussianLinearized`` for the same values
+            maxIterations: Maximum number of iterations
+            tolerance: Relative change in the sum of squared residuals considered converged
+
+        Returns:
+            - A ``GaussianFit`` with one element per realization
+            - A boolean array that is true for realizations that converged
+        """
+
+        wave = np.asarray(wave, dtype=float)
+        flux = np.atleast_2d(np.asarray(flux, dtype=float))
+        params = guess.params.T.copy()
+
+        def evaluate(p, y):
+            residual = y - CalcVelocity.gaussian(wave, *(p[:, i, None] for i in range(4)))
+            return residual, (residual ** 2).sum(axis=1)
+
+        def transposedJacobian(p):
+            # Equivalent to ``gaussianJacobian`` with shape (N, 4, len(wave)),
+            # filled in place to avoid stacking large intermediate arrays
+            depth, avg, std = p[:, 0, None], p[:, 1, None], p[:, 2, None]
+            delta = wave - avg
+            exponential = np.exp(-(delta ** 2) / (2 * std ** 2))
+            jacobianT = np.empty((len(p), 4, len(wave)))
+            jacobianT[:, 0] = -exponential
+            jacobianT[:, 1] = -depth * exponential * delta / std ** 2
+            jacobianT[:, 2] = jacobianT[:, 1] * delta / std
+            jacobianT[:, 3] = 1
+            return jacobianT
+
+        active = np.all(np.isfinite(params), axis=1)
+        converged = np.zeros(len(params), dtype=bool)
+        damping = np.full(len(params), 1e-3)
+        residuals, cost = evaluate(params, flux)
+
+        with np.errstate(all='ignore'):
+            for _ in range(maxIterations):
+                if not active.any():
+                    break
+
+                idx = np.flatnonzero(active)
+                jacobianT = transposedJacobian(params[idx])
+                normalMatrix = jacobianT @ np.swapaxes(jacobianT, 1, 2)
+                gradient = (jacobianT @ residuals[idx, :, None])[..., 0]
+
+                diagonal = np.einsum('nii->ni', normalMatrix)
+                damped = normalMatrix + (damping[idx, None] * diagonal)[..., None] * np.eye(4)
+                try:
+                    step = np.linalg.solve(damped, gradient[..., None])[..., 0]
+
+                except np.linalg.LinAlgError:
+                    break
+
+                trialParams = params[idx] + step
+                trialResiduals, trialCost = evaluate(trialParams, flux[idx])
+                improved = np.isfinite(trialCost) & (trialCost <= cost[idx])
+
+                better = idx[improved]
+                done = better[(cost[better] - trialCost[improved]) <= tolerance * cost[better]]
+                params[better] = trialParams[improved]
+                residuals[better] = trialResiduals[improved]
+                cost[better] = trialCost[improved]
+                damping[better] /= 10
+                damping[idx[~improved]] *= 10
+
+                converged[done] = True
+                active[done] = False
+                active[damping > 1e10] = False
+
+            jacobianT = transposedJacobian(params)
+            normalMatrix = jacobianT @ np.swapaxes(jacobianT, 1, 2)
+            singular = ~converged | (np.linalg.cond(normalMatrix) > 1 / np.finfo(float).eps)
+            normalMatrix[singular] = np.eye(4)
+            dof = max(len(wave) - 4, 1)
+            cov = np.linalg.inv(normalMatrix) * (cost / dof)[:, None, None]
+
+        cov[singular] = np.nan
+        return GaussianFit(*params.T, cov), converged & ~singular
+
+    @staticmethod
+    def fitGaussianLinearized(
+            wave: np.array, flux: np.array, mask: Optional[np.array] = None, iterations: int = 3
+    ) -> GaussianFit:
+        """Fit negative gaussians to one or more samples in closed form
+
+        The offset of each gaussian is estimated as the maximum flux of the
+        sample. The logarithm of the inverted, offset-subtracted flux is then
+        fit with a parabola using weighted linear least squares (Caruana's
+        algorithm). Following Guo, the first iteration is weighted by the
+        squared data and later iterations by the squared model. Every
+        iteration is solved in closed form for all samples at once. Fits
+        with a non-negative curvature return ``np.nan`` values, so callers
+        should fall back to ``refineGaussian`` for fits that are not
+        plausible.
+
+        Args:
+            wave: 1D array of wavelength values
+            flux: Flux values with shape ``(len(wave),)`` or ``(N, len(wave))``
+            mask: Optional boolean array of shape ``(N, len(wave))`` selecting the pixels of each sample
+            iterations: Number of weighted least squares iterations
+
+        Returns:
+            A ``GaussianFit`` with one element per sample
+        """
+
+        wave = np.asarray(wave, dtype=float)
+        flux = np.atleast_2d(np.asarray(flux, dtype=float))
+        mask = np.ones(flux.shape, dtype=bool) if mask is None else np.atleast_2d(mask)
+        flux = np.broadcast_to(flux, mask.shape)
+
+        # Normalize wavelengths of each sample to [-1, 1] for numerical stability
+        maskedWave = np.where(mask, wave, np.nan)
+        waveMin, waveMax = np.nanmin(maskedWave, axis=1), np.nanmax(maskedWave, axis=1)
+        center, scale = (waveMax + waveMin) / 2, (waveMax - waveMin) / 2
+        t = (wave - center[:, None]) / scale[:, None]
+
+        # Invert the flux about the estimated offset
+        offset = np.max(np.where(mask, flux, -np.inf), axis=1)
+        y = offset[:, None] - flux
+        valid = mask & (y > 0)
+        logY = np.log(np.where(valid, y, 1))
+        weight = np.where(valid, y ** 2, 0)
+
+        # Solve the weighted normal equations for ln(y) = a + b * t + c * t^2
+        # Following Guo, later iterations are weighted by the fitted model
+        basis = np.stack([np.ones_like(t), t, t ** 2], axis=-1)
+        for _ in range(iterations):
+            fitWeight = weight
+            weightedBasisT = np.swapaxes(fitWeight[..., None] * basis, 1, 2)
+            normalMatrix = weightedBasisT @ basis
+            normalVector = (weightedBasisT @ logY[..., None])[..., 0]
+
+            singular = np.linalg.cond(normalMatrix) > 1 / np.finfo(float).eps
+            normalMatrix[singular] = np.eye(3)
+            inverse = np.linalg.inv(normalMatrix)
+            coeffs = np.einsum('nij,nj->ni', inverse, normalVector)
+            logModel = (basis @ coeffs[..., None])[..., 0]
+            with np.errstate(over='ignore'):
+                weight = np.where(valid, np.exp(2 * logModel), 0)
+
+        nSamples = len(coeffs)
+        a, b, c = coeffs.T
+
+        # Covariance of the parabola coefficients from the weighted residuals
+        residuals = logY - logModel
+        dof = np.maximum(valid.sum(axis=1) - 3, 1)
+        variance = (fitWeight * residuals ** 2).sum(axis=1) / dof
+        coeffCov = variance[:, None, None] * inverse
+
+        # Convert the parabola coefficients into gaussian parameters
+        with np.errstate(invalid='ignore', divide='ignore'):
+            failed = singular | (c >= 0)
+            c = np.where(failed, np.nan, c)
+            avg = center - scale * b / (2 * c)
+            stdDev = scale * np.sqrt(-1 / (2 * c))
+            amplitude = np.exp(a - b ** 2 / (4 * c))
+
+            # Propagate the coefficient covariance to the gaussian parameters
+            jacobian = np.zeros((nSamples, 4, 3))
+            jacobian[:, 0] = np.stack([amplitude, -amplitude * b / (2 * c), amplitude * b ** 2 / (4 * c ** 2)], axis=-1)
+            jacobian[:, 1, 1] = -scale / (2 * c)
+            jacobian[:, 1, 2] = scale * b / (2 * c ** 2)
+            jacobian[:, 2, 2] = scale * (-2 * c) ** -1.5
+
+        cov = np.einsum('nik,nkl,njl->nij', jacobian, coeffCov, jacobian)
+        cov[failed] = np.nan
+        return GaussianFit(amplitude, avg, stdDev, np.where(failed, np.nan, offset), cov)
+
+    @staticmethod
+    def dopplerVelocity(restFrame: float, avg: Union[float, np.array]) -> Union[float, np.array]:
+        """Convert an observed feature wavelength into a velocity
+
+        Args:
+            restFrame: The rest frame wavelength of the feature
+            avg: The observed wavelength(s) of the feature
+
+        Returns:
+            The velocity in km / s
+        """
+
+        return SPEED_OF_LIGHT * (
+                ((((restFrame - avg) / restFrame) + 1) ** 2 - 1) /
+                ((((restFrame - avg) / restFrame) + 1) ** 2 + 1)
+        )
+
+    @staticmethod
+    def dopplerVelocityDerivative(restFrame: float, avg: Union[float, np.array]) -> Union[float, np.array]:
+        """Derivative of ``dopplerVelocity`` with respect to the observed wavelength
+
+        Args:
+            restFrame: The rest frame wavelength of the feature
+            avg: The observed wavelength(s) of the feature
+
+        Returns:
+            The derivative in km / s per unit wavelength
+        """
+
+        ratio = ((restFrame - avg) / restFrame) + 1
+        return -4 * SPEED_OF_LIGHT * ratio / (restFrame * (ratio ** 2 + 1) ** 2)
+
+    def _fitGaussian(self, method: str = 'exact') -> GaussianFit:
+        """Fitted an negative gaussian to the binned flux
+
+        Args:
+            method: Either 'exact' (``curve_fit``), 'fast' (closed form), or 'refine' (fast then exact)
+
+        Returns:
+            A list of fitted parameters
+
+        Raises:
+            ValueError: For an unknown fitting method
+        """
+
+        if method == 'exact':
+            return self.fitGaussian(self.wave, self.flux)
+
+        elif method in ('fast', 'refine'):
+            fastFit = self.fitGaussianLinearized(self.wave, self.flux)[0]
+            if method == 'fast' and fastFit.isPlausible(self.wave[0], self.wave[-1]):
+                return fastFit
+
+            return self.refineGaussian(self.wave, self.flux, fastFit)
+
+        raise ValueError(f'Unknown method {method}')
+
+    def velocity(self, restFrame: float, method: str = 'exact') -> float:
         """Calculate the velocity of a feature
 
         Fit a feature with a negative gaussian and determine the feature's
@@ -85,17 +428,11 @@ class CalcVelocity(Base):
         
         Args:
             restFrame: The rest frame wavelength of the feature
+            method: Either 'exact' (``curve_fit``), 'fast' (closed form), or 'refine' (fast then exact)
 
         Returns:
             The velocity of the feature in km / s
         """
 
-        gaussFit = self._fitGaussian()
-
-        # Calculate velocity
-        unit = units.km / units.s
-        speedOfLight = c.to(unit).value
-        return speedOfLight * (
-                ((((restFrame - gaussFit.avg) / restFrame) + 1) ** 2 - 1) /
-                ((((restFrame - gaussFit.avg) / restFrame) + 1) ** 2 + 1)
-        )
+        gaussFit = self._fitGaussian(method)
+        return self.dopplerVelocity(restFrame, gaussFit.avg)
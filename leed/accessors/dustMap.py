@@ -0,0 +1,256 @@
+"""Lazily loaded Schlegel, Finkbeiner & Davis (1998) dust map.
+
+The map is stored as a pair of Lambert azimuthal equal-area projections,
+one for each galactic hemisphere. Each hemisphere is memory mapped from
+its FITS file the first time it is needed, so only the pixels touched by a
+lookup are read from disk.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Hashable, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.array]
+
+
+def _rotationMatrix(axis: int, angle: float) -> np.array:
+    """Passive rotation matrix about the x (0), y (1), or z (2) axis"""
+
+    s, c = np.sin(angle), np.cos(angle)
+    i, j = [k for k in range(3) if k != axis]
+    matrix = np.eye(3)
+    matrix[i, i] = matrix[j, j] = c
+    matrix[i, j], matrix[j, i] = (s, -s) if axis != 1 else (-s, s)
+    return matrix
+
+
+# Rotation from FK5 (J2000) to galactic coordinates using the galactic pole and
+# longitude zero point adopted by ``astropy.coordinates``
+_NGP_RA = np.deg2rad(192.8594812065348)
+_NGP_DEC = np.deg2rad(27.12825118085622)
+_LON0 = np.deg2rad(122.9319185680026)
+FK5J2000_TO_GAL = _rotationMatrix(2, np.pi - _LON0) @ _rotationMatrix(1, np.pi / 2 - _NGP_DEC) @ _rotationMatrix(2, _NGP_RA)
+
+# Rotation from ICRS to FK5 (J2000) (See USNO Circular 179, section 3.5)
+ICRS_TO_FK5J2000 = (
+        _rotationMatrix(0, -np.deg2rad(-19.9 / 3.6e6))
+        @ _rotationMatrix(1, np.deg2rad(9.1 / 3.6e6))
+        @ _rotationMatrix(2, np.deg2rad(-22.9 / 3.6e6))
+)
+
+ROTATIONS = {
+    'fk5j2000': FK5J2000_TO_GAL,
+    'j2000': FK5J2000_TO_GAL,
+    'icrs': FK5J2000_TO_GAL @ ICRS_TO_FK5J2000,
+    'galactic': np.eye(3)
+}
+
+
+def toGalactic(lon: np.array, lat: np.array, frame: str = 'fk5j2000') -> Tuple[np.array, np.array]:
+    """Convert celestial coordinates in radians to galactic coordinates
+
+    Args:
+        lon: Longitude (e.g., RA) in radians
+        lat: Latitude (e.g., Dec) in radians
+        frame: Either 'fk5j2000', 'icrs', or 'galactic'
+
+    Returns:
+        The galactic longitude and latitude in radians
+
+    Raises:
+        ValueError: For an unknown coordinate frame
+    """
+
+    if frame not in ROTATIONS:
+        raise ValueError(f'Unknown coordinate frame {frame}')
+
+    cosLat = np.cos(lat)
+    x, y, z = ROTATIONS[frame] @ np.array([cosLat * np.cos(lon), cosLat * np.sin(lon), np.sin(lat)])
+    return np.arctan2(y, x), np.arctan2(z, np.hypot(x, y))
+
+
+class _Hemisphere:
+    """Memory mapped map of a single galactic hemisphere"""
+
+    def __init__(self, path: Path) -> None:
+        """Memory map the hemisphere from a FITS file
+
+        Args:
+            path: Path of the FITS file
+        """
+
+        from astropy.io import fits
+
+        self._hdul = fits.open(path, memmap=True)
+        header = self._hdul[0].header
+        self.data = self._hdul[0].data
+        self.crpix1 = header['CRPIX1']
+        self.crpix2 = header['CRPIX2']
+        self.lamScale = header['LAM_SCAL']
+        self.sign = header['LAM_NSGP']  # North = 1, South = -1
+
+    def pixels(self, l: np.array, b: np.array) -> Tuple[np.array, np.array]:
+        """Project galactic coordinates onto (zero indexed) Lambert pixel coordinates
+
+        Args:
+            l: Galactic longitude in radians
+            b: Galactic latitude in radians
+
+        Returns:
+            The x and y pixel coordinates
+        """
+
+        radius = self.lamScale * np.sqrt(1 - self.sign * np.sin(b))
+        x = self.crpix1 - 1 + radius * np.cos(l)
+        y = self.crpix2 - 1 - self.sign * radius * np.sin(l)
+        return x, y
+
+    def values(self, l: np.array, b: np.array, interpolate: bool = True) -> np.array:
+        """Map values at the given galactic coordinates
+
+        Args:
+            l: Galactic longitude in radians
+            b: Galactic latitude in radians
+            interpolate: Use bilinear interpolation between pixels
+
+        Returns:
+            The unscaled map value at each coordinate
+        """
+
+        x, y = self.pixels(l, b)
+        ny, nx = self.data.shape
+        if not interpolate:
+            xi = np.clip(np.round(x).astype(int), 0, nx - 1)
+            yi = np.clip(np.round(y).astype(int), 0, ny - 1)
+            return self.data[yi, xi].astype(float)
+
+        x0, y0 = np.floor(x), np.floor(y)
+        xw, yw = x - x0, y - y0
+        x0, y0 = x0.astype(int), y0.astype(int)
+        x1, y1 = np.minimum(x0 + 1, nx - 1), np.minimum(y0 + 1, ny - 1)
+        x0, y0 = np.maximum(x0, 0), np.maximum(y0, 0)
+
+        data = self.data
+        return ((1 - xw) * (1 - yw) * data[y0, x0] + xw * (1 - yw) * data[y0, x1]
+                + (1 - xw) * yw * data[y1, x0] + xw * yw * data[y1, x1])
+
+
+class DustMap:
+    """E(B-V) values from the Schlegel, Finkbeiner & Davis (1998) dust map
+
+    Map files are not opened until the first lookup in their hemisphere.
+    Results are memoized per coordinate so repeated lookups for the same
+    object do not touch the map. Lookups are safe to make from multiple
+    threads.
+    """
+
+    def __init__(
+            self,
+            mapDir: Union[str, Path],
+            north: str = 'SFD_dust_4096_ngp.fits',
+            south: str = 'SFD_dust_4096_sgp.fits',
+            scaling: float = 0.86,
+            memoSize: int = 4096
+    ) -> None:
+        """Define the location of the dust map files
+
+        Args:
+            mapDir: Directory containing the map files
+            north: File name of the northern galactic hemisphere
+            south: File name of the southern galactic hemisphere
+            scaling: Factor applied to map values (0.86 corresponds to Schlafly & Finkbeiner 2011)
+            memoSize: Maximum number of coordinates to memoize
+        """
+
+        self.mapDir = Path(mapDir)
+        self.fileNames = {1: north, -1: south}
+        self.scaling = scaling
+        self.memoSize = memoSize
+        self._hemispheres: Dict[int, _Hemisphere] = dict()
+        self._memo: OrderedDict[Hashable, float] = OrderedDict()
+        self._hemisphereLock = Lock()
+        self._memoLock = Lock()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(mapDir={str(self.mapDir)!r}, scaling={self.scaling})'
+
+    def _hemisphere(self, sign: int) -> _Hemisphere:
+        """Return a hemisphere of the map, memory mapping it on first use"""
+
+        with self._hemisphereLock:
+            if sign not in self._hemispheres:
+                self._hemispheres[sign] = _Hemisphere(self.mapDir / self.fileNames[sign])
+
+            return self._hemispheres[sign]
+
+    def _lookup(self, l: np.array, b: np.array, interpolate: bool) -> np.array:
+        """Scaled map values at arrays of galactic coordinates"""
+
+        values = np.empty(len(l))
+        for sign, mask in ((1, b >= 0), (-1, b < 0)):
+            if np.any(mask):
+                values[mask] = self._hemisphere(sign).values(l[mask], b[mask], interpolate)
+
+        return values * self.scaling
+
+    def ebv(
+            self, ra: ArrayLike, dec: ArrayLike, frame: str = 'fk5j2000', unit: str = 'degree', interpolate: bool = True
+    ) -> ArrayLike:
+        """Return E(B-V) values at one or more coordinates
+
+        All coordinates that are not already memoized are looked up in a
+        single vectorized pass over the map.
+
+        Args:
+            ra: Right Ascension (or galactic longitude)
+            dec: Declination (or galactic latitude)
+            frame: Either 'fk5j2000', 'icrs', or 'galactic'
+            unit: Either 'degree' or 'radian'
+            interpolate: Use bilinear interpolation between map pixels
+
+        Returns:
+            A float for scalar coordinates, otherwise an array of E(B-V) values
+
+        Raises:
+            ValueError: For an unknown unit or coordinate frame
+        """
+
+        if unit not in ('deg', 'degree', 'rad', 'radian'):
+            raise ValueError(f'Unknown unit {unit}')
+
+        if frame not in ROTATIONS:
+            raise ValueError(f'Unknown coordinate frame {frame}')
+
+        scalar = np.ndim(ra) == 0 and np.ndim(dec) == 0
+        ra, dec = np.broadcast_arrays(np.atleast_1d(np.asarray(ra, dtype=float)), np.atleast_1d(np.asarray(dec, dtype=float)))
+        keys = [(r, d, frame, unit, interpolate) for r, d in zip(ra.tolist(), dec.tolist())]
+        values = np.empty(len(keys))
+        missing = []
+        with self._memoLock:
+            for i, key in enumerate(keys):
+                if key in self._memo:
+                    values[i] = self._memo[key]
+                    self._memo.move_to_end(key)
+
+                else:
+                    missing.append(i)
+
+        if missing:
+            lon, lat = ra[missing], dec[missing]
+            if unit in ('deg', 'degree'):
+                lon, lat = np.deg2rad(lon), np.deg2rad(lat)
+
+            l, b = toGalactic(lon, lat, frame)
+            values[missing] = self._lookup(l, b, interpolate)
+            with self._memoLock:
+                for i in missing:
+                    self._memo[keys[i]] = float(values[i])
+                    self._memo.move_to_end(keys[i])
+
+                while len(self._memo) > self.memoSize:
+                    self._memo.popitem(last=False)
+
+        return values[0] if scalar else values
@@ -0,0 +1,164 @@
+"""Cached Fitzpatrick (1999) extinction curves.
+
+For a fixed wavelength grid and Rv, the extinction in magnitudes scales
+linearly with A_V. Curves are therefore evaluated once per grid and Rv for
+A_V = 1 and rescaled for each spectrum, so correcting many spectra observed
+on the same grid only evaluates the extinction law once.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Hashable, NamedTuple, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.array]
+
+
+class CurveCacheInfo(NamedTuple):
+    """Usage statistics for a cache of extinction curves"""
+
+    hits: int
+    misses: int
+    entries: int
+
+
+def gridFingerprint(wave: np.array) -> Tuple[int, str]:
+    """Return a hashable fingerprint of a wavelength grid
+
+    Args:
+        wave: Wavelength values
+
+    Returns:
+        The length of the grid and a digest of its values
+    """
+
+    wave = np.ascontiguousarray(wave, dtype=float)
+    return len(wave), blake2b(wave.tobytes(), digest_size=16).hexdigest()
+
+
+class ExtinctionCurveCache:
+    """Least recently used cache of unit extinction curves keyed on wavelength grid and Rv"""
+
+    def __init__(self, maxEntries: int = 32) -> None:
+        """Create an empty cache
+
+        Args:
+            maxEntries: Maximum number of curves to keep in memory
+        """
+
+        if maxEntries < 1:
+            raise ValueError('Cache must hold at least one curve')
+
+        self.maxEntries = maxEntries
+        self._curves: OrderedDict[Hashable, np.array] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def cacheInfo(self) -> CurveCacheInfo:
+        """Usage statistics for the cache"""
+
+        return CurveCacheInfo(self._hits, self._misses, len(self._curves))
+
+    def clear(self) -> None:
+        """Remove all cached curves and reset usage statistics"""
+
+        with self._lock:
+            self._curves.clear()
+            self._hits = self._misses = 0
+
+    def unitCurve(self, wave: np.array, rv: float = 3.1) -> np.array:
+        """Return the extinction in magnitudes for A_V = 1
+
+        Args:
+            wave: Wavelength values in angstroms
+            rv: Rv value of the extinction law
+
+        Returns:
+            A read-only array of extinction values for each wavelength
+        """
+
+        key = (gridFingerprint(wave), float(rv))
+        with self._lock:
+            curve = self._curves.get(key)
+            if curve is not None:
+                self._hits += 1
+                self._curves.move_to_end(key)
+                return curve
+
+            self._misses += 1
+
+        import extinction
+
+        curve = extinction.fitzpatrick99(np.asarray(wave, dtype=float), 1.0, rv)
+        curve.flags.writeable = False
+        with self._lock:
+            self._curves[key] = curve
+            self._curves.move_to_end(key)
+            while len(self._curves) > self.maxEntries:
+                self._curves.popitem(last=False)
+
+        return curve
+
+    def transmission(self, wave: np.array, ebv: ArrayLike, rv: float = 3.1) -> np.array:
+        """Return the fraction of flux transmitted at each wavelength
+
+        Args:
+            wave: Wavelength values in angstroms
+            ebv: A single E(B-V) value or one value per spectrum
+            rv: Rv value of the extinction law
+
+        Returns:
+            A 1d array for a single E(B-V) value, otherwise an array with one row per value
+        """
+
+        av = rv * np.asarray(ebv, dtype=float)
+        return 10 ** (-0.4 * np.multiply.outer(av, self.unitCurve(wave, rv)))
+
+    def correct(self, wave: np.array, flux: np.array, ebv: float, rv: float = 3.1) -> np.array:
+        """Correct a single spectrum for extinction
+
+        Flux values are scaled by ``10 ** (-0.4 * A)``, consistent with
+        ``SpectrumAccessor.correctExtinction``.
+
+        Args:
+            wave: Wavelength values in angstroms
+            flux: Flux values
+            ebv: E(B-V) value of the spectrum
+            rv: Rv value of the extinction law
+
+        Returns:
+            The corrected flux values
+        """
+
+        return flux * self.transmission(wave, float(ebv), rv)
+
+    def correctStack(self, wave: np.array, fluxes: np.array, ebv: ArrayLike, rv: float = 3.1) -> np.array:
+        """Correct a stack of spectra sharing the same wavelength grid
+
+        Flux values are scaled by ``10 ** (-0.4 * A)``, consistent with
+        ``SpectrumAccessor.correctExtinction``.
+
+        Args:
+            wave: Wavelength values shared by all spectra
+            fluxes: 2d array of flux values with one spectrum per row
+            ebv: A single E(B-V) value or one value per spectrum
+            rv: Rv value of the extinction law
+
+        Returns:
+            A 2d array of corrected flux values
+        """
+
+        fluxes = np.asarray(fluxes)
+        if fluxes.ndim != 2 or fluxes.shape[1] != len(wave):
+            raise ValueError('Flux values must be a 2d array with one column per wavelength')
+
+        ebv = np.broadcast_to(np.asarray(ebv, dtype=float), (fluxes.shape[0],))
+        return fluxes * self.transmission(wave, ebv, rv)
+
+
+# Curves shared by all spectrum accessors
+EXTINCTION_CURVES = ExtinctionCurveCache()
@@ -1,8 +1,9 @@
-from typing import Tuple, final
+from typing import Sequence, Tuple, final
 
 import numpy as np
 import pandas as pd
 
+from .base import Base
 from .calcArea import CalcArea
 from .calcPEW import CalcPEW
 from .calcPseudoContinuum import calcPseudoContinuum
@@ -13,8 +14,67 @@ from ..exceptions import FeatureNotObserved
 
 @final
 @pd.api.extensions.register_series_accessor('feature')
-class FeatureAccessor(CalcArea, CalcPEW, CalcVelocity, calcPseudoContinuum):
-    """Pandas accessor for calculating the properties of spectroscopic SN features"""
+class FeatureAccessor(Base, CalcArea, CalcPEW, CalcVelocity, calcPseudoContinuum):
+    """Pandas accessor for calculating the properties of spectroscopic SN features
+
+    Calculations are inherited from the same mixins used by the array backed
+    ``Spectrum`` class and run directly on the underlying arrays of the series.
+    """
+
+    @staticmethod
+    def _windowIndices(
+            wave: np.array, lowerBounds: np.array, upperBounds: np.array
+    ) -> Tuple[np.array, np.array, np.array]:
+        """Convert wavelength bounds into pixel windows
+
+        Args:
+            wave: Sorted wavelength values of the spectrum
+            lowerBounds: Lower wavelength boundary of each window
+            upperBounds: Upper wavelength boundary of each window
+
+        Returns:
+            - The first pixel index of each window (inclusive)
+            - The last pixel index of each window (exclusive)
+            - Whether any wavelength lies strictly between the bounds of each window
+        """
+
+        lowerBounds = np.asarray(lowerBounds, dtype=float)
+        upperBounds = np.asarray(upperBounds, dtype=float)
+
+        lo = np.searchsorted(wave, lowerBounds, side='left')
+        hi = np.searchsorted(wave, upperBounds, side='right')
+
+        # Exclude wavelengths equal to the bounds when checking for coverage
+        firstInside = np.searchsorted(wave, lowerBounds, side='right')
+        lastInside = np.searchsorted(wave, upperBounds, side='left')
+        observed = lastInside > firstInside
+        return lo, hi, observed
+
+    @staticmethod
+    def _peakIndex(flux: np.array, lo: int, hi: int, behavior: str) -> int:
+        """Return the index of the maximum flux within a pixel window
+
+        Args:
+            flux: Flux values of the spectrum
+            lo: The first pixel index of the window (inclusive)
+            hi: The last pixel index of the window (exclusive)
+            behavior: Return the 'min' or 'max' index when multiple maxima are found
+
+        Returns:
+            The index of the peak flux value
+
+        Raises:
+            ValueError: For an unknown behavior
+        """
+
+        windowFlux = flux[lo:hi]
+        if behavior == 'min':
+            return lo + np.argmax(windowFlux)
+
+        elif behavior == 'max':
+            return hi - 1 - np.argmax(windowFlux[::-1])
+
+        raise ValueError(f'Unknown behavior {behavior}')
 
     def findPeakWavelength(self, lowerBound: float, upperBound: float, behavior: str = 'min') -> float:
         """Return wavelength of the maximum flux within given wavelength bounds
@@ -30,21 +90,18 @@ class FeatureAccessor(CalcArea, CalcPEW, CalcVelocity, calcPseudoContinuum):
 
         Returns:
             The wavelength for the maximum flux value
+
+        Raises:
+            ValueError: If the wavelengths are not sorted
         """
 
         # Make sure the given spectrum spans the given wavelength bounds
-        if not any((self.wave > lowerBound) & (self.wave < upperBound)):
+        spectrum = self.core
+        lo, hi, observed = self._windowIndices(spectrum.wave, lowerBound, upperBound)
+        if not observed:
             raise FeatureNotObserved('Feature not in spectral wavelength range.')
 
-        # Select the portion of the spectrum within the given bounds
-        featureIndices = (lowerBound <= self.wave) & (self.wave <= upperBound)
-        featureFlux = self.flux[featureIndices]
-        featureWavelength = self.wave[featureIndices]
-
-        # Get peak according to specified behavior
-        peakIndices = np.argwhere(featureFlux == np.max(featureFlux))
-        behaviorFunc = getattr(np, behavior)
-        return behaviorFunc(featureWavelength[peakIndices])
+        return spectrum.wave[self._peakIndex(spectrum.flux, lo, hi, behavior)]
 
     def guessBounds(self, feature: FeatureDefinition) -> Tuple[float, float]:
         """Guess the observed start and end wavelengths for a given feature
@@ -60,3 +117,39 @@ class FeatureAccessor(CalcArea, CalcPEW, CalcVelocity, calcPseudoContinuum):
         featStart = self.findPeakWavelength(feature.lower_blue, feature.upper_blue, 'min')
         featEnd = self.findPeakWavelength(feature.lower_red, feature.upper_red, 'max')
         return featStart, featEnd
+
+    def guessAllBounds(self, features: Sequence[FeatureDefinition]) -> pd.DataFrame:
+        """Guess the observed start and end wavelengths for multiple features
+
+        Unlike ``guessBounds``, features that are not observed do not raise
+        an error. Their boundaries are instead returned as ``np.nan`` and
+        they are flagged in the ``observed`` column.
+
+        Args:
+            features: Feature definitions to use when guessing bounds
+
+        Returns:
+            A DataFrame indexed by feature Id with columns 'feat_start', 'feat_end', and 'observed'
+
+        Raises:
+            ValueError: If the wavelengths are not sorted
+        """
+
+        # The wavelengths are checked and the arrays built once for all features
+        spectrum = self.core
+        wave, flux = spectrum.wave, spectrum.flux
+
+        lower = [[f.lower_blue for f in features], [f.lower_red for f in features]]
+        upper = [[f.upper_blue for f in features], [f.upper_red for f in features]]
+        lo, hi, observed = self._windowIndices(wave, lower, upper)
+
+        featStart = np.full(len(features), np.nan)
+        featEnd = np.full(len(features), np.nan)
+        isObserved = observed.all(axis=0)
+        for i in np.flatnonzero(isObserved):
+            featStart[i] = wave[self._peakIndex(flux, lo[0, i], hi[0, i], 'min')]
+            featEnd[i] = wave[self._peakIndex(flux, lo[1, i], hi[1, i], 'max')]
+
+        return pd.DataFrame(
+            {'feat_start': featStart, 'feat_end': featEnd, 'observed': isObserved},
+            index=pd.Index([f.feature_id for f in features], name='feat_name'))
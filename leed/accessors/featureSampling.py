@@ -0,0 +1,539 @@
+"""Batched calculation of feature properties over a grid of resampled
+feature boundaries.
+
+Functions in this module operate directly on wavelength and flux arrays and
+evaluate every (start, end) index pair in a single pass. Each pair describes
+the half-open pixel range ``[start, end)`` of a resampled feature, matching
+the slicing behavior of the ``feature`` accessor.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calcVelocity import CalcVelocity, FIT_METHODS
+from .integralIndex import IntegralIndex
+from ..executors import Executor
+from ..sharedMemory import resolve, shareArrays
+
+
+@dataclass
+class SampledProperties:
+    """Feature properties measured for each pair of resampled boundaries"""
+
+    starts: np.array
+    ends: np.array
+    velocity: np.array
+    velocityErr: np.array
+    pew: np.array
+    pewErr: np.array
+    area: np.array
+    areaErr: np.array
+
+    @classmethod
+    def concatenate(cls, parts: Sequence[SampledProperties]) -> SampledProperties:
+        """Combine properties measured for consecutive blocks of samples
+
+        Args:
+            parts: Properties measured for each block, in order
+
+        Returns:
+            The properties of all samples
+        """
+
+        return cls(**{f.name: np.concatenate([getattr(p, f.name) for p in parts]) for f in fields(cls)})
+
+
+@dataclass
+class DrawnProperties:
+    """Feature properties measured for each random realization of the flux"""
+
+    velocity: np.array
+    pew: np.array
+    area: np.array
+
+
+def sampleIndices(idxStart: int, idxEnd: int, nstep: int) -> Tuple[np.array, np.array]:
+    """Return start and end indices for every offset in the resampling grid
+
+    Samples are ordered by increasing start offset and then by decreasing
+    end offset.
+
+    Args:
+        idxStart: Index of the nominal feature start
+        idxEnd: Index of the nominal feature end
+        nstep: Number of samples taken in each direction
+
+    Returns:
+        - Array of starting indices
+        - Array of ending indices
+    """
+
+    startOffsets = np.arange(-nstep, nstep + 1)
+    endOffsets = np.arange(nstep, -nstep - 1, -1)
+    starts = np.repeat(idxStart + startOffsets, len(endOffsets))
+    ends = np.tile(idxEnd + endOffsets, len(startOffsets))
+    return starts, ends
+
+
+def estimateNoise(flux: np.array) -> float:
+    """Estimate the per-pixel noise of a spectrum from the flux alone
+
+    Uses the DER_SNR estimator (Stoehr et al. 2008), which is insensitive
+    to smooth spectral features.
+
+    Args:
+        flux: Flux values of the spectrum
+
+    Returns:
+        The estimated standard deviation of the flux noise
+    """
+
+    flux = np.asarray(flux, dtype=float)
+    if len(flux) < 5:
+        return 0.
+
+    return 1.482602 / np.sqrt(6) * np.median(np.abs(2 * flux[2:-2] - flux[:-4] - flux[4:]))
+
+
+def pseudoContinuum(
+        wave: np.array, flux: np.array, starts: np.array, ends: np.array
+) -> Tuple[np.array, np.array]:
+    """Fit a straight line pseudo continuum to the end points of each sample
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+
+    Returns:
+        - The slope of each continuum
+        - The y-intercept of each continuum
+    """
+
+    x0, x1 = wave[starts], wave[ends - 1]
+    y0, y1 = flux[starts], flux[ends - 1]
+    slope = (y0 - y1) / (x0 - x1)
+    intercept = - slope * x0 + y0
+    return slope, intercept
+
+
+def _segmentMask(starts: np.array, ends: np.array) -> Tuple[int, int, np.array]:
+    """Identify the trapezoid segments belonging to each sample
+
+    Segment ``k`` spans pixels ``k`` and ``k + 1``. Segments are indexed
+    relative to the smallest starting index of all samples.
+
+    Args:
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+
+    Returns:
+        - The first pixel index spanned by any sample
+        - The last pixel index (exclusive) spanned by any sample
+        - A 2D boolean array with one row per sample and one column per segment
+    """
+
+    lo, hi = starts.min(), ends.max()
+    segments = np.arange(lo, hi - 1)
+    mask = (starts[:, None] <= segments) & (segments < (ends - 1)[:, None])
+    return lo, hi, mask
+
+
+def _trapezoidWeights(wave: np.array, starts: np.array, ends: np.array) -> Tuple[int, int, np.array]:
+    """Weight of each pixel when integrating a sample with the trapezoid rule
+
+    Args:
+        wave: Wavelength values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+
+    Returns:
+        - The first pixel index spanned by any sample
+        - The last pixel index (exclusive) spanned by any sample
+        - A 2D array with one row per sample and one column per pixel
+    """
+
+    lo, hi, mask = _segmentMask(starts, ends)
+    segmentWeight = np.where(mask, np.diff(wave[lo:hi]) / 2, 0)
+    weights = np.zeros((len(starts), hi - lo))
+    weights[:, :-1] += segmentWeight
+    weights[:, 1:] += segmentWeight
+    return lo, hi, weights
+
+
+def pew(
+        wave: np.array,
+        flux: np.array,
+        starts: np.array,
+        ends: np.array,
+        slope: np.array,
+        intercept: np.array
+) -> np.array:
+    """Calculate the pseudo equivalent-width of each sample
+
+    The integrand is the flux divided by the pseudo continuum of each
+    sample, so it differs between samples and cannot be read from an
+    ``IntegralIndex``. Every sample is integrated over its own pixels,
+    taking ``O(N * width)`` time for ``N`` samples.
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+        slope: Slope of the pseudo continuum for each sample
+        intercept: Y-intercept of the pseudo continuum for each sample
+
+    Returns:
+        The pseudo equivalent-width of each sample
+    """
+
+    lo, hi, mask = _segmentMask(starts, ends)
+    x = wave[lo:hi]
+    normFlux = flux[lo:hi] / (slope[:, None] * x + intercept[:, None])
+    segmentArea = np.diff(x) * (normFlux[:, 1:] + normFlux[:, :-1]) / 2.0
+    return (wave[ends - 1] - wave[starts]) - np.where(mask, segmentArea, 0).sum(axis=1)
+
+
+def area(
+        wave: np.array,
+        flux: np.array,
+        starts: np.array,
+        ends: np.array,
+        slope: np.array,
+        intercept: np.array,
+        index: Optional[IntegralIndex] = None
+) -> np.array:
+    """Calculate the area between the pseudo continuum and flux of each sample
+
+    If an integral index is given, the flux area of each sample is
+    determined in constant time from the index.
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+        slope: Slope of the pseudo continuum for each sample
+        intercept: Y-intercept of the pseudo continuum for each sample
+        index: Optional integral index built from the same spectrum
+
+    Returns:
+        The area of each sample in units of wavelength squared
+    """
+
+    x0, x1 = wave[starts], wave[ends - 1]
+    continuumArea = (x1 - x0) * ((slope * x0 + intercept) + (slope * x1 + intercept)) / 2
+
+    if index is not None:
+        return continuumArea - index.flux(starts, ends)
+
+    lo, hi, mask = _segmentMask(starts, ends)
+    segmentArea = np.diff(wave[lo:hi]) * (flux[lo + 1:hi] + flux[lo:hi - 1]) / 2.0
+    fluxArea = np.where(mask, segmentArea, 0).sum(axis=1)
+    return continuumArea - fluxArea
+
+
+def pewError(
+        wave: np.array,
+        flux: np.array,
+        error: np.array,
+        starts: np.array,
+        ends: np.array,
+        slope: np.array,
+        intercept: np.array
+) -> np.array:
+    """Formal error in the pseudo equivalent-width of each sample
+
+    Flux errors are propagated linearly, including their contribution
+    through the end points of the pseudo continuum.
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        error: Flux errors of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+        slope: Slope of the pseudo continuum for each sample
+        intercept: Y-intercept of the pseudo continuum for each sample
+
+    Returns:
+        The formal error of each sample
+    """
+
+    lo, hi, weights = _trapezoidWeights(wave, starts, ends)
+    pixels = np.arange(lo, hi)
+    interior = (starts[:, None] < pixels) & (pixels < (ends - 1)[:, None])
+
+    x = wave[lo:hi]
+    x0, x1 = wave[starts][:, None], wave[ends - 1][:, None]
+    continuum = slope[:, None] * x + intercept[:, None]
+    normWeight = np.where(interior, weights / continuum, 0)
+
+    # The continuum is a linear interpolation between the sample end points
+    fluxTerm = normWeight * flux[lo:hi] / continuum
+    startDerivative = (fluxTerm * (x1 - x) / (x1 - x0)).sum(axis=1)
+    endDerivative = (fluxTerm * (x - x0) / (x1 - x0)).sum(axis=1)
+
+    variance = (normWeight ** 2 * error[lo:hi] ** 2).sum(axis=1)
+    variance += (startDerivative * error[starts]) ** 2 + (endDerivative * error[ends - 1]) ** 2
+    return np.sqrt(variance)
+
+
+def areaError(wave: np.array, error: np.array, starts: np.array, ends: np.array) -> np.array:
+    """Formal error in the area of each sample
+
+    Flux errors are propagated linearly, including their contribution
+    through the end points of the pseudo continuum.
+
+    Args:
+        wave: Wavelength values of the spectrum
+        error: Flux errors of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+
+    Returns:
+        The formal error of each sample
+    """
+
+    lo, hi, weights = _trapezoidWeights(wave, starts, ends)
+    pixels = np.arange(lo, hi)
+    interior = (starts[:, None] < pixels) & (pixels < (ends - 1)[:, None])
+
+    halfWidth = (wave[ends - 1] - wave[starts]) / 2
+    startDerivative = halfWidth - weights[np.arange(len(starts)), starts - lo]
+    endDerivative = halfWidth - weights[np.arange(len(starts)), ends - 1 - lo]
+
+    variance = (np.where(interior, weights, 0) ** 2 * error[lo:hi] ** 2).sum(axis=1)
+    variance += (startDerivative * error[starts]) ** 2 + (endDerivative * error[ends - 1]) ** 2
+    return np.sqrt(variance)
+
+
+def _pixelMask(starts: np.array, ends: np.array) -> Tuple[int, int, np.array]:
+    """Identify the pixels belonging to each sample
+
+    Args:
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+
+    Returns:
+        - The first pixel index spanned by any sample
+        - The last pixel index (exclusive) spanned by any sample
+        - A 2D boolean array with one row per sample and one column per pixel
+    """
+
+    lo, hi = starts.min(), ends.max()
+    pixels = np.arange(lo, hi)
+    mask = (starts[:, None] <= pixels) & (pixels < ends[:, None])
+    return lo, hi, mask
+
+
+def velocity(
+        wave: np.array,
+        flux: np.array,
+        starts: np.array,
+        ends: np.array,
+        restFrame: float,
+        method: str = 'exact'
+) -> Tuple[np.array, np.array]:
+    """Calculate the velocity of each sample
+
+    The 'fast' and 'refine' methods fall back to ``curve_fit`` with the
+    default initial guess for samples where the closed form fit is not
+    plausible (see ``GaussianFit.isPlausible``).
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+        restFrame: Rest frame wavelength of the feature
+        method: Either 'exact' (``curve_fit``), 'fast' (closed form), or 'refine' (fast then exact)
+
+    Returns:
+        - The velocity of each sample in km / s
+        - The formal error of each velocity, propagated from the fit covariance
+
+    Raises:
+        ValueError: For an unknown fitting method
+    """
+
+    if method not in FIT_METHODS:
+        raise ValueError(f'Unknown method {method}')
+
+    if method == 'exact':
+        # Every fit starts from the same initial guess. Seeding fits with the
+        # result of a neighboring sample lets poorly constrained fits drift
+        # toward ever wider and deeper gaussians.
+        fits = [CalcVelocity.fitGaussian(wave[s:e], flux[s:e]) for s, e in zip(starts, ends)]
+        avg = np.array([fit.avg for fit in fits])
+        avgErr = np.array([fit.avgErr for fit in fits])
+
+    else:
+        lo, hi, mask = _pixelMask(starts, ends)
+        fastFit = CalcVelocity.fitGaussianLinearized(wave[lo:hi], flux[lo:hi], mask)
+        avg, avgErr = fastFit.avg.copy(), fastFit.avgErr.copy()
+
+        # Samples the closed form fit cannot describe are fit with ``curve_fit``
+        refit = np.ones(len(starts), dtype=bool)
+        if method == 'fast':
+            refit = ~fastFit.isPlausible(wave[starts], wave[ends - 1])
+
+        for i in np.flatnonzero(refit):
+            fit = CalcVelocity.refineGaussian(wave[starts[i]:ends[i]], flux[starts[i]:ends[i]], fastFit[i])
+            avg[i], avgErr[i] = fit.avg, fit.avgErr
+
+    velocityErr = np.abs(CalcVelocity.dopplerVelocityDerivative(restFrame, avg)) * avgErr
+    return CalcVelocity.dopplerVelocity(restFrame, avg), velocityErr
+
+
+def sampleProperties(
+        wave: np.array,
+        flux: np.array,
+        starts: np.array,
+        ends: np.array,
+        restFrame: float,
+        index: Optional[IntegralIndex] = None,
+        method: str = 'exact',
+        error: Optional[np.array] = None,
+        executor: Optional[Executor] = None
+) -> SampledProperties:
+    """Measure the velocity, pEW, and area for every pair of sample boundaries
+
+    If flux errors are not given, a constant error is estimated from the
+    flux using ``estimateNoise``.
+
+    When an executor is given, the samples are split into consecutive
+    blocks of ``executor.chunksize`` samples that are measured as separate
+    tasks.
+
+    Args:
+        wave: Wavelength values of the spectrum
+        flux: Flux values of the spectrum
+        starts: Starting index of each sample
+        ends: Ending index (exclusive) of each sample
+        restFrame: Rest frame wavelength of the feature
+        index: Optional integral index built from the same spectrum (used for the area only)
+        method: Method used to fit velocities (see ``velocity``)
+        error: Optional flux errors of the spectrum
+        executor: Optional executor used to measure blocks of samples in parallel
+
+    Returns:
+        The measured properties of each sample
+    """
+
+    if error is None:
+        error = np.full(len(flux), estimateNoise(flux))
+
+    if executor is not None:
+        # Spectral arrays are sent to worker processes through shared memory.
+        # The integral index is only reused by executors sharing this process.
+        size = executor.chunksize
+        blockIndex = None if executor.usesProcesses else index
+        with shareArrays(executor.usesProcesses, wave, flux, error) as (sharedWave, sharedFlux, sharedError):
+            blocks = (
+                (sharedWave, sharedFlux, starts[i: i + size], ends[i: i + size],
+                 restFrame, blockIndex, method, sharedError)
+                for i in range(0, len(starts), size)
+            )
+            return SampledProperties.concatenate(executor.map(_sampleBlock, blocks, chunksize=1))
+
+    slope, intercept = pseudoContinuum(wave, flux, starts, ends)
+    velocities, velocityErr = velocity(wave, flux, starts, ends, restFrame, method)
+    return SampledProperties(
+        starts=starts,
+        ends=ends,
+        velocity=velocities,
+        velocityErr=velocityErr,
+        pew=pew(wave, flux, starts, ends, slope, intercept),
+        pewErr=pewError(wave, flux, error, starts, ends, slope, intercept),
+        area=area(wave, flux, starts, ends, slope, intercept, index),
+        areaErr=areaError(wave, error, starts, ends)
+    )
+
+
+def _sampleBlock(args: tuple) -> SampledProperties:
+    """Call ``sampleProperties`` with a tuple of arguments
+
+    Defined at the module level so blocks of samples can be sent to worker
+    processes. Arrays passed by shared memory reference are rebuilt first.
+    """
+
+    return sampleProperties(*(resolve(arg) for arg in args))
+
+
+def drawFlux(flux: np.array, error: np.array, ndraws: int, seed: Optional[int] = None) -> np.array:
+    """Perturb flux values with normally distributed noise
+
+    Args:
+        flux: Flux values to perturb
+        error: Standard deviation of the noise for each flux value
+        ndraws: Number of random realizations
+        seed: Seed for the random number generator
+
+    Returns:
+        An array of shape ``(ndraws, len(flux))``
+    """
+
+    rng = np.random.default_rng(seed)
+    return flux + rng.standard_normal((ndraws, len(flux))) * error
+
+
+def measureDraws(wave: np.array, fluxDraws: np.array, restFrame: float, method: str = 'refine') -> DrawnProperties:
+    """Measure the velocity, pEW, and area of a feature for many realizations of its flux
+
+    Velocities are fit for all realizations at once. The 'fast' method uses
+    the closed form gaussian fit, while the default 'refine' method refines
+    the closed form fits of all realizations together with
+    ``CalcVelocity.refineGaussianBatch``. Either way, ``curve_fit`` is only
+    called for realizations where the batched fit is not plausible. The
+    'exact' method fits every realization separately with ``curve_fit``
+    and is much slower.
+
+    Args:
+        wave: Wavelength values of the feature
+        fluxDraws: Flux values of shape ``(ndraws, len(wave))``
+        restFrame: Rest frame wavelength of the feature
+        method: Method used to fit velocities (see ``velocity``)
+
+    Returns:
+        The measured properties of each realization
+
+    Raises:
+        ValueError: For an unknown fitting method
+    """
+
+    if method not in FIT_METHODS:
+        raise ValueError(f'Unknown method {method}')
+
+    x0, x1 = wave[0], wave[-1]
+    y0, y1 = fluxDraws[:, :1], fluxDraws[:, -1:]
+    slope = (y0 - y1) / (x0 - x1)
+    continuum = slope * wave + (- slope * x0 + y0)
+
+    pews = (x1 - x0) - np.trapz(y=fluxDraws / continuum, x=wave, axis=1)
+    areas = (x1 - x0) * (continuum[:, 0] + continuum[:, -1]) / 2 - np.trapz(y=fluxDraws, x=wave, axis=1)
+
+    if method == 'exact':
+        avg = np.array([CalcVelocity.fitGaussian(wave, flux).avg for flux in fluxDraws])
+
+    else:
+        fastFit = CalcVelocity.fitGaussianLinearized(wave, fluxDraws)
+        avg = fastFit.avg.copy()
+        plausible = fastFit.isPlausible(wave[0], wave[-1])
+
+        if method == 'refine' and plausible.any():
+            refined, converged = CalcVelocity.refineGaussianBatch(wave, fluxDraws[plausible], fastFit[plausible])
+            avg[plausible] = refined.avg
+            plausible[plausible] = converged & refined.isPlausible(wave[0], wave[-1])
+
+        # Realizations the batched fit cannot describe are fit with ``curve_fit``
+        for i in np.flatnonzero(~plausible):
+            avg[i] = CalcVelocity.refineGaussian(wave, fluxDraws[i], fastFit[i]).avg
+
+    return DrawnProperties(CalcVelocity.dopplerVelocity(restFrame, avg), pews, areas)
@@ -0,0 +1,78 @@
+from typing import Union
+
+import numpy as np
+
+IndexLike = Union[int, np.array]
+
+
+class IntegralIndex:
+    """Cumulative trapezoid integrals of a spectrum
+
+    The index is built once per spectrum and allows the trapezoid integral
+    of the flux over any pixel range ``[start, end)`` to be determined in
+    constant time. Integrals are evaluated between the wavelengths
+    ``wave[start]`` and ``wave[end - 1]``, matching ``np.trapz`` applied to
+    the same slice of the spectrum.
+
+    Only the flux itself is indexed. Integrands that depend on each range,
+    such as the continuum normalized flux used for the pEW, cannot be
+    determined from the index.
+    """
+
+    def __init__(self, wave: np.array, flux: np.array) -> None:
+        """Build the cumulative integrals for a given spectrum
+
+        Args:
+            wave: Wavelength values of the spectrum
+            flux: Flux values of the spectrum
+        """
+
+        wave = np.asarray(wave, dtype=float)
+        flux = np.asarray(flux, dtype=float)
+        dx = np.diff(wave)
+        self._wave = wave
+        self._flux = flux
+
+        self._fluxIntegral = np.concatenate([[0], np.cumsum(dx * (flux[1:] + flux[:-1]) / 2)])
+
+    def __len__(self) -> int:
+        return len(self._fluxIntegral)
+
+    def flux(self, start: IndexLike, end: IndexLike) -> IndexLike:
+        """Integral of the flux over a pixel range
+
+        Args:
+            start: Starting index of the range
+            end: Ending index (exclusive) of the range
+
+        Returns:
+            The integrated flux
+        """
+
+        end = np.asarray(end) - 1
+        return self._fluxIntegral[end] - self._fluxIntegral[start]
+
+    def cumulative(self, wavelengths: Union[float, np.array]) -> Union[float, np.array]:
+        """Integral of the linearly interpolated flux up to arbitrary wavelengths
+
+        Integrals start at the first wavelength of the spectrum. Wavelengths
+        falling on a pixel return the same values as ``flux``.
+
+        Args:
+            wavelengths: Wavelengths to integrate up to
+
+        Returns:
+            The integrated flux, or NaN for wavelengths outside the spectrum
+        """
+
+        wavelengths = np.asarray(wavelengths, dtype=float)
+        pixel = np.clip(np.searchsorted(self._wave, wavelengths, side='right') - 1, 0, len(self._wave) - 2)
+        x0, x1 = self._wave[pixel], self._wave[pixel + 1]
+        y0, y1 = self._flux[pixel], self._flux[pixel + 1]
+
+        dx = wavelengths - x0
+        interpolated = y0 + (y1 - y0) * dx / (x1 - x0)
+        integral = self._fluxIntegral[pixel] + dx * (y0 + interpolated) / 2
+
+        outside = (wavelengths < self._wave[0]) | (wavelengths > self._wave[-1])
+        return np.where(outside, np.nan, integral)
@@ -0,0 +1,140 @@
+"""Running-window kernels used when binning spectra.
+
+All kernels treat the edges of the input array the same way as the
+``scipy.ndimage`` filters (``mode='reflect'``), so they can be used as drop-in
+replacements for ``generic_filter`` and ``median_filter``.
+"""
+
+import numpy as np
+
+
+def _reflectPad(values: np.array, size: int) -> np.array:
+    """Pad an array for a centered window using ``scipy.ndimage`` reflect mode
+
+    Windows longer than the array are reflected repeatedly, so the padded
+    values repeat with a period of twice the array length.
+
+    Args:
+        values: The array to pad
+        size: The size of the window
+
+    Returns:
+        The padded array, where output ``i`` uses the window ``padded[i: i + size]``
+    """
+
+    n = len(values)
+    before = size // 2
+    indices = np.arange(-before, n + size - 1 - before) % (2 * n)
+    indices = np.where(indices < n, indices, 2 * n - 1 - indices)
+    return values[indices]
+
+
+def runningSum(values: np.array, size: int) -> np.array:
+    """Sum of the values within a centered window of a given size
+
+    Uses a cumulative sum, so the run time is independent of the window
+    size. Integer arrays are summed exactly.
+
+    Args:
+        values: 1D array of values
+        size: The size of the window
+
+    Returns:
+        An array with the same shape and dtype as the input
+    """
+
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.integer) else float
+    cumulative = np.concatenate([[0], np.cumsum(_reflectPad(values, size), dtype=dtype)])
+    return (cumulative[size:] - cumulative[:-size]).astype(values.dtype)
+
+
+def runningAverage(values: np.array, size: int) -> np.array:
+    """Average of the values within a centered window of a given size
+
+    Args:
+        values: 1D array of values
+        size: The size of the window
+
+    Returns:
+        An array with the same shape and dtype as the input
+    """
+
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.integer) else float
+    cumulative = np.concatenate([[0], np.cumsum(_reflectPad(values, size), dtype=dtype)])
+    return ((cumulative[size:] - cumulative[:-size]) / size).astype(values.dtype)
+
+
+# Number of windows whose medians are selected together in ``runningMedian``
+_MEDIAN_BLOCK = 2 ** 15
+
+
+def _windowMedians(segment: np.array, size: int) -> np.array:
+    """Median of every window of a given size within a segment of an array
+
+    The values are replaced by their ranks and stored as a wavelet matrix,
+    which is traversed one rank bit at a time for all windows at once.
+
+    Args:
+        segment: 1D array of values
+        size: The size of the window
+
+    Returns:
+        The median of ``segment[i: i + size]`` for every complete window
+    """
+
+    order = np.argsort(segment, kind='stable')
+    ranks = np.empty(len(segment), dtype=np.intp)
+    ranks[order] = np.arange(len(segment))
+
+    # Position of each window within the current level and the rank of its median within that range
+    numWindows = len(segment) - size + 1
+    start = np.arange(numWindows)
+    end = start + size
+    target = np.full(numWindows, size // 2)
+    median = np.zeros(numWindows, dtype=np.intp)
+
+    for bit in reversed(range((len(segment) - 1).bit_length())):
+        isOne = ((ranks >> bit) & 1).astype(bool)
+        zeros = np.concatenate([[0], np.cumsum(~isOne)])
+        zerosStart, zerosEnd = zeros[start], zeros[end]
+        windowZeros = zerosEnd - zerosStart
+
+        # Values with a zero bit are moved to the front of the next level
+        isUpper = target >= windowZeros
+        target = np.where(isUpper, target - windowZeros, target)
+        start = np.where(isUpper, zeros[-1] + start - zerosStart, zerosStart)
+        end = np.where(isUpper, zeros[-1] + end - zerosEnd, zerosEnd)
+        median |= isUpper.astype(np.intp) << bit
+        ranks = np.concatenate([ranks[~isOne], ranks[isOne]])
+
+    return segment[order[median]]
+
+
+def runningMedian(values: np.array, size: int) -> np.array:
+    """Median of the values within a centered window of a given size
+
+    Returns the same values as ``scipy.ndimage.median_filter``, including
+    the upper median for even window sizes. Windows are processed in
+    blocks so that the run time scales as ``O(n log size)`` for wide
+    windows, where ``median_filter`` scales as ``O(n size)``.
+
+    Args:
+        values: 1D array of values
+        size: The size of the window
+
+    Returns:
+        An array with the same shape and dtype as the input
+    """
+
+    values = np.asarray(values)
+    padded = _reflectPad(values, size)
+    blockSize = max(size, _MEDIAN_BLOCK)
+
+    out = np.empty_like(values)
+    for first in range(0, len(values), blockSize):
+        last = min(first + blockSize, len(values))
+        out[first: last] = _windowMedians(padded[first: last + size - 1], size)
+
+    return out
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .calcArea import CalcArea
+from .calcPEW import CalcPEW
+from .calcPseudoContinuum import calcPseudoContinuum
+from .calcVelocity import CalcVelocity
+
+
+class Spectrum(CalcArea, CalcPEW, CalcVelocity, calcPseudoContinuum):
+    """Lightweight array backed representation of a spectrum
+
+    Wavelength, flux, and (optional) error values are stored as contiguous
+    arrays. Wavelengths are checked to be sorted once at construction, so
+    slices of an existing spectrum are returned as views without any
+    further validation. Calculation mixins run directly on instances of
+    this class without constructing or aligning pandas objects.
+    """
+
+    __slots__ = ('wave', 'flux', 'error')
+
+    def __init__(
+            self, wave: np.array, flux: np.array, error: Optional[np.array] = None, validate: bool = True
+    ) -> None:
+        """Store spectral data as contiguous arrays
+
+        Args:
+            wave: Wavelength values
+            flux: Flux values
+            error: Optional flux errors
+            validate: Check the wavelengths are sorted
+
+        Raises:
+            ValueError: If array lengths do not match or wavelengths are not sorted
+        """
+
+        self.wave = np.ascontiguousarray(wave)
+        self.flux = np.ascontiguousarray(flux)
+        self.error = None if error is None else np.ascontiguousarray(error)
+
+        if len(self.wave) != len(self.flux) or (self.error is not None and len(self.error) != len(self.wave)):
+            raise ValueError('Wavelength, flux, and error arrays must have the same length')
+
+        if validate and np.any(self.wave[1:] < self.wave[:-1]):
+            raise ValueError('Wavelengths must be sorted')
+
+    @classmethod
+    def fromSeries(cls, series: pd.Series, error: Optional[pd.Series] = None) -> Spectrum:
+        """Create a spectrum from a ``Series`` indexed by wavelength
+
+        Args:
+            series: Flux values indexed by wavelength
+            error: Optional flux errors with the same index
+
+        Returns:
+            A spectrum sharing memory with the given series where possible
+        """
+
+        return cls(series.index.values, series.values, None if error is None else error.values)
+
+    def toSeries(self) -> pd.Series:
+        """Return the flux values as a ``Series`` indexed by wavelength"""
+
+        return pd.Series(self.flux, index=self.wave)
+
+    def __len__(self) -> int:
+        return len(self.wave)
+
+    def __getitem__(self, item: slice) -> Spectrum:
+        """Return a view of the spectrum over a range of pixels
+
+        Args:
+            item: A slice of pixel indices
+
+        Returns:
+            A new ``Spectrum`` sharing memory with the current one
+        """
+
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError('Spectra can only be indexed by contiguous slices')
+
+        error = None if self.error is None else self.error[item]
+        return Spectrum(self.wave[item], self.flux[item], error, validate=False)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(npix={len(self)})'
+
+    def _like(self, flux: np.array) -> Spectrum:
+        """Wrap flux values sampled on the current wavelengths in a ``Spectrum``"""
+
+        return Spectrum(self.wave, flux, validate=False)
@@ -1,18 +1,22 @@
-from typing import List, final
+from typing import List, Optional, Sequence, Tuple, final
 
-import extinction
 import numpy as np
 import pandas as pd
-import sfdmap
-import uncertainties as unc
-from scipy.ndimage.filters import gaussian_filter, generic_filter, median_filter
-from uncertainties.unumpy import nominal_values
 
+from . import featureSampling, kernels
 from .base import Base
+from .dustMap import DustMap
+from .extinctionCurves import EXTINCTION_CURVES
+from .integralIndex import IntegralIndex
 from ..app.settings import RESOURCES_DIR
 from ..exceptions import SamplingRangeError
+from ..executors import Executor
 
-DUSTMAP = sfdmap.SFDMap(RESOURCES_DIR / 'schlegel98_dust_map')
+# Map files are only opened the first time E(B-V) is looked up
+DUSTMAP = DustMap(RESOURCES_DIR / 'schlegel98_dust_map')
+
+# Median bins at least this wide use the O(n log size) running median
+RUNNING_MEDIAN_MIN_SIZE = 64
 
 
 @final
@@ -23,6 +27,10 @@ class SpectrumAccessor(Base):
     def bin(self, size: float, method: str) -> pd.Series:
         """Bin a spectrum to a given resolution
 
+        The 'sum' and 'average' methods use cumulative sums and run in linear
+        time regardless of the bin size. Wide 'median' bins use a running
+        median that scales as ``O(n log size)`` instead of ``O(n size)``.
+
         Args:
             size: The width of the bins
             method: Either 'median', 'average', 'sum', or 'gauss'
@@ -35,19 +43,83 @@ class SpectrumAccessor(Base):
         """
 
         if method == 'sum':
-            return pd.Series(generic_filter(self.flux, sum, size), index=self.wave)
+            return pd.Series(kernels.runningSum(self.flux, size), index=self.wave)
 
         elif method == 'average':
-            return pd.Series(generic_filter(self.flux, np.average, size), index=self.wave)
+            return pd.Series(kernels.runningAverage(self.flux, size), index=self.wave)
 
         elif method == 'gauss':
+            from scipy.ndimage import gaussian_filter
             return pd.Series(gaussian_filter(self.flux, size), index=self.wave)
 
         elif method == 'median':
+            if size >= RUNNING_MEDIAN_MIN_SIZE:
+                return pd.Series(kernels.runningMedian(self.flux, size), index=self.wave)
+
+            from scipy.ndimage import median_filter
             return pd.Series(median_filter(self.flux, size), index=self.wave)
 
         raise ValueError(f'Unknown method {method}')
 
+    def rebin(self, binWidth: Optional[float] = None, grid: Optional[np.array] = None) -> pd.Series:
+        """Rebin a spectrum onto a coarser wavelength grid while conserving flux
+
+        Each bin is assigned the average flux density of the linearly
+        interpolated spectrum across the bin, so the integrated flux over
+        any set of bins is unchanged. Bins are either given a fixed width in
+        wavelength, with edges at integer multiples of that width, or are
+        centered on the values of a user supplied grid with edges halfway
+        between neighboring grid points.
+
+        Args:
+            binWidth: The width of the bins in wavelength units
+            grid: Sorted central wavelengths of the bins
+
+        Returns:
+            The rebinned flux indexed by the central wavelength of each bin.
+            Bins not fully covered by the spectrum are NaN.
+
+        Raises:
+            ValueError: If not exactly one of ``binWidth`` or ``grid`` is given
+        """
+
+        if (binWidth is None) == (grid is None):
+            raise ValueError('Specify exactly one of ``binWidth`` or ``grid``')
+
+        if binWidth is not None:
+            if binWidth <= 0:
+                raise ValueError('Bin width must be positive')
+
+            first = np.ceil(self.core.wave[0] / binWidth)
+            last = np.floor(self.core.wave[-1] / binWidth)
+            edges = np.arange(first, last + 1) * binWidth
+            centers = (edges[1:] + edges[:-1]) / 2
+
+        else:
+            centers = np.asarray(grid, dtype=float)
+            if len(centers) < 2 or np.any(np.diff(centers) <= 0):
+                raise ValueError('Grid must contain at least two strictly increasing wavelengths')
+
+            midpoints = (centers[1:] + centers[:-1]) / 2
+            edges = np.concatenate([
+                [centers[0] - (midpoints[0] - centers[0])],
+                midpoints,
+                [centers[-1] + (centers[-1] - midpoints[-1])]
+            ])
+
+        cumulative = self.integralIndex.cumulative(edges)
+        return pd.Series(np.diff(cumulative) / np.diff(edges), index=centers)
+
+    @property
+    def integralIndex(self) -> IntegralIndex:
+        """Cumulative trapezoid integrals of the spectrum
+
+        The index is built from the current flux values on every access, so
+        changes made to the series in place are always reflected.
+        """
+
+        return IntegralIndex(self.wave, self.flux)
+
     def restFrame(self, z: float) -> pd.Series:
         """Convert spectrum wavelengths into the restframe
 
@@ -62,44 +134,103 @@ class SpectrumAccessor(Base):
         out.index /= (1 + z)
         return out
 
-    def correctExtinction(self, ra: float, dec: float, rv: float = 3.1) -> pd.Series:
+    def correctExtinction(
+            self, ra: Optional[float] = None, dec: Optional[float] = None, rv: float = 3.1, ebv: Optional[float] = None
+    ) -> pd.Series:
         """Rest frame spectra and correct for MW extinction
 
         Spectra are corrected for MW extinction using the
         Schlegel et al. 98 dust map and the Fitzpatrick et al. 99 extinction
-        law. If rv is not given, a value of 3.1 is used.
+        law. If rv is not given, a value of 3.1 is used. A precomputed
+        E(B-V) value can be given instead of coordinates to skip the dust map
+        lookup (see ``DUSTMAP.ebv`` for looking up many objects at once).
+        Extinction curves are cached per wavelength grid and Rv, so spectra
+        sharing a grid only evaluate the extinction law once.
 
         Args:
-            ra: Right Ascension of the object
-            dec: Declination of the object
+            ra: Right Ascension of the object in degrees
+            dec: Declination of the object in degrees
             rv: Rv value to use for extinction
+            ebv: Optional precomputed MW E(B-V) value
+
+        Raises:
+            ValueError: If neither coordinates nor an E(B-V) value are given
         """
 
         # Determine extinction
-        mwebv = DUSTMAP.ebv(ra, dec, frame='fk5j2000', unit='degree')
-        magExt = extinction.fitzpatrick99(self.wave, rv * mwebv, rv)
+        if ebv is not None:
+            mwebv = ebv
+
+        elif ra is not None and dec is not None:
+            mwebv = DUSTMAP.ebv(ra, dec, frame='fk5j2000', unit='degree')
+
+        else:
+            raise ValueError('Either coordinates or an E(B-V) value must be given')
 
         # Correct flux to rest-frame
         out = self._obj.copy()
-        out /= 10 ** (0.4 * magExt)
+        out *= EXTINCTION_CURVES.transmission(self.wave, mwebv, rv)
         return out
 
+    def _featureIndices(self, featStart: float, featEnd: float) -> Tuple[int, int]:
+        """Return the indices of the given feature boundaries
+
+        Args:
+            featStart: Starting wavelength of the feature
+            featEnd: Ending wavelength of the feature
+
+        Returns:
+            - The index of the starting wavelength
+            - The index of the ending wavelength
+
+        Raises:
+            ValueError: When the start and end position of the feature are too close together
+        """
+
+        idxStart = np.where(self.wave == featStart)[0][0]
+        idxEnd = np.where(self.wave == featEnd)[0][0]
+        if idxEnd - idxStart <= 10:
+            raise ValueError('Range too small. Please select a wider range')
+
+        return idxStart, idxEnd
+
     def sampleFeatureProperties(
-            self, featStart: float, featEnd: float, restFrame: float, nstep: int = 0, callback: callable = None
+            self,
+            featStart: float,
+            featEnd: float,
+            restFrame: float,
+            nstep: int = 0,
+            callback: callable = None,
+            useIndex: bool = True,
+            fitMethod: str = 'exact',
+            error: Optional[pd.Series] = None,
+            executor: Optional[Executor] = None
     ) -> List[float]:
         """Calculate the properties of a single feature in a spectrum
 
         Velocity values are returned in km / s. Error values are determined
-        both formally (summed in quadrature) and by re-sampling the feature
-        boundaries ``nstep`` flux measurements in either direction.
+        both formally and by re-sampling the feature boundaries ``nstep``
+        flux measurements in either direction.
+
+        Formal velocity errors are propagated from the covariance of each
+        gaussian fit. Formal pEW and area errors are propagated from the flux
+        errors, including the end points of the pseudo continuum. If flux
+        errors are not given they are estimated from the flux. The reported
+        formal errors are averaged over all samples, since resampled
+        features share almost all of their pixels.
 
         Args:
             featStart: Starting wavelength of the feature
             featEnd: Ending wavelength of the feature
             restFrame: Rest frame location of the specified feature
             nstep: Number of samples taken in each direction
-            callback: Call a function after every iteration.
+            callback: Call a function for every sample once all samples are measured.
                 Function is passed the sampled feature.
+            useIndex: Integrate the flux area using an ``integralIndex`` built once for all samples
+                (the pEW is always integrated separately for each sample)
+            fitMethod: Either 'exact' (``curve_fit``), 'fast' (closed form), or 'refine' (fast then exact)
+            error: Optional flux errors with the same index as the spectrum
+            executor: Optional executor used to measure the resampled features in parallel
 
         Returns:
             - The line velocity
@@ -114,50 +245,109 @@ class SpectrumAccessor(Base):
 
         Raises:
             ValueError: When the start and end position of the feature are too close together
+            ValueError: For an unknown fitting method
             SamplingRangeError: When the width of the feature is less than the number of samples
         """
 
         # Get indices for beginning and end of the feature
-        idxStart = np.where(self.wave == featStart)[0][0]
-        idxEnd = np.where(self.wave == featEnd)[0][0]
-        if idxEnd - idxStart <= 10:
-            raise ValueError('Range too small. Please select a wider range')
-        print(idxStart, idxEnd)
+        idxStart, idxEnd = self._featureIndices(featStart, featEnd)
 
         # We vary the beginning and end of the feature to estimate the error
-        velocity, pEquivWidth, area = [], [], []
-        for i in np.arange(-nstep, nstep + 1):
-            for j in np.arange(nstep, -nstep - 1, -1):
-
-                # Get sub-sampled wavelength/flux
-                idxSampleStart = idxStart + i
-                idxSampleEnd = idxEnd + j
-
-                if idxSampleStart < 0 or idxSampleEnd >= len(self._obj):
-                    raise SamplingRangeError
-
-                # Determine feature properties
-                sample = self._obj[idxSampleStart: idxSampleEnd]
-                continuum = sample.feature.fitPseudoContinuum()
-                velocity.append(sample.feature.velocity(restFrame))
-                pEquivWidth.append(sample.feature.pew(continuum))
-                area.append(sample.feature.area(continuum))
-
-                if callback:
-                    callback(sample)
-
-        avgVelocity = np.mean(velocity)
-        avgEw = np.mean(pEquivWidth)
-        avgArea = np.mean(area)
-
-        return [
-            unc.nominal_value(avgVelocity),
-            unc.std_dev(avgVelocity),
-            np.std(nominal_values(velocity)),
-            unc.nominal_value(avgEw),
-            unc.std_dev(avgEw),
-            np.std(nominal_values(pEquivWidth)),
-            unc.nominal_value(avgArea),
-            unc.std_dev(avgArea),
-            np.std(nominal_values(area))
-        ]
+        starts, ends = featureSampling.sampleIndices(idxStart, idxEnd, nstep)
+        if starts.min() < 0 or ends.max() >= len(self._obj):
+            raise SamplingRangeError
+
+        spectrum = self.core
+        index = self.integralIndex if useIndex else None
+        fluxErr = None if error is None else np.asarray(error, dtype=float)
+        samples = featureSampling.sampleProperties(
+            spectrum.wave, spectrum.flux, starts, ends, restFrame, index, fitMethod, fluxErr, executor)
+        if callback:
+            for idxSampleStart, idxSampleEnd in zip(starts, ends):
+                callback(self._obj.iloc[idxSampleStart: idxSampleEnd])
+
+        # Resampled features share almost all of their pixels, so formal errors
+        # are averaged instead of combined like a standard error of the mean
+        out = []
+        for values, errors in (
+                (samples.velocity, samples.velocityErr),
+                (samples.pew, samples.pewErr),
+                (samples.area, samples.areaErr)):
+            out.extend((np.mean(values), np.mean(errors), np.std(values)))
+
+        return out
+
+    def monteCarloFeatureProperties(
+            self,
+            featStart: float,
+            featEnd: float,
+            restFrame: float,
+            ndraws: int = 1000,
+            seed: Optional[int] = None,
+            error: Optional[pd.Series] = None,
+            fitMethod: str = 'refine',
+            percentiles: Sequence[float] = (16, 50, 84)
+    ) -> Tuple[List[float], pd.DataFrame]:
+        """Calculate the properties of a single feature using Monte Carlo flux perturbations
+
+        The flux of the feature is perturbed ``ndraws`` times using normally
+        distributed noise and the feature is measured for every realization.
+        Values and formal errors are measured from the unperturbed flux,
+        while sampling errors are the standard deviation over all
+        realizations. If flux errors are not given they are estimated from
+        the flux.
+
+        By default velocities are fit for all realizations at once (see
+        ``featureSampling.measureDraws``). Pass ``fitMethod='exact'`` to fit
+        every realization separately with ``curve_fit``.
+
+        Args:
+            featStart: Starting wavelength of the feature
+            featEnd: Ending wavelength of the feature
+            restFrame: Rest frame location of the specified feature
+            ndraws: Number of random realizations of the flux
+            seed: Seed for the random number generator
+            error: Optional flux errors with the same index as the spectrum
+            fitMethod: Either 'exact' (``curve_fit``), 'fast' (closed form), or 'refine' (fast then exact)
+            percentiles: Percentiles to report for each measured property
+
+        Returns:
+            - The nine values returned by ``sampleFeatureProperties``
+            - A DataFrame of percentiles indexed by 'vel', 'pew', and 'area'
+
+        Raises:
+            ValueError: When the start and end position of the feature are too close together
+            ValueError: For an unknown fitting method
+        """
+
+        idxStart, idxEnd = self._featureIndices(featStart, featEnd)
+        spectrum = self.core
+        if error is None:
+            fluxErr = np.full(len(spectrum), featureSampling.estimateNoise(spectrum.flux))
+
+        else:
+            fluxErr = np.asarray(error, dtype=float)
+
+        # Measure the unperturbed feature
+        starts, ends = np.array([idxStart]), np.array([idxEnd])
+        nominal = featureSampling.sampleProperties(
+            spectrum.wave, spectrum.flux, starts, ends, restFrame, self.integralIndex, fitMethod, fluxErr)
+
+        # Measure all realizations of the feature at once
+        feature = spectrum[idxStart:idxEnd]
+        fluxDraws = featureSampling.drawFlux(feature.flux, fluxErr[idxStart:idxEnd], ndraws, seed)
+        draws = featureSampling.measureDraws(feature.wave, fluxDraws, restFrame, fitMethod)
+
+        out = []
+        for value, formalErr, drawn in (
+                (nominal.velocity, nominal.velocityErr, draws.velocity),
+                (nominal.pew, nominal.pewErr, draws.pew),
+                (nominal.area, nominal.areaErr, draws.area)):
+            out.extend((value[0], formalErr[0], np.nanstd(drawn)))
+
+        percentileTable = pd.DataFrame(
+            [np.nanpercentile(drawn, percentiles) for drawn in (draws.velocity, draws.pew, draws.area)],
+            index=['vel', 'pew', 'area'],
+            columns=list(percentiles))
+
+        return out, percentileTable
@@ -14,4 +14,6 @@ def run(dataAccess: SpectralAccessor, out_path: str) -> None:
     app = QApplication([])
     x = MainWindow(dataAccess, out_path)
     x.show()
-    sys.exit(app.exec_())
+    exitCode = app.exec_()
+    dataAccess.close()
+    sys.exit(exitCode)
@@ -0,0 +1,439 @@
+"""Indexed storage for feature measurements saved by the GUI.
+
+Results are stored in a SQLite database with one row per
+``(obj_id, time, feat_name)``. Saving a measurement that already exists
+replaces the previous row, so results can be saved repeatedly without
+creating duplicates. Results can be exported to (and imported from) CSV
+files using the same columns as ``get_results_dataframe``.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+INDEX_COLUMNS = ('obj_id', 'time', 'feat_name')
+VALUE_COLUMNS = (
+    'feat_start', 'feat_end',
+    'vel', 'vel_err', 'vel_samperr',
+    'pew', 'pew_err', 'pew_samperr',
+    'area', 'area_err', 'area_samperr',
+    'spec_flag', 'feat_flag', 'notes'
+)
+TEXT_COLUMNS = ('obj_id', 'feat_name', 'notes')
+STORE_SUFFIXES = ('.db', '.sqlite')
+
+
+def emptyResults() -> pd.DataFrame:
+    """Return an empty results table indexed by ``['obj_id', 'time', 'feat_name']``"""
+
+    return pd.DataFrame(columns=INDEX_COLUMNS + VALUE_COLUMNS).set_index(list(INDEX_COLUMNS))
+
+
+def _sqlType(column: str) -> str:
+    """Return the SQLite column type used to store a results column"""
+
+    if column == 'time':
+        return ''  # No type affinity so spectrum Ids keep their original type
+
+    return 'TEXT' if column in TEXT_COLUMNS else 'REAL'
+
+
+def toRecords(data: pd.DataFrame) -> List[Tuple]:
+    """Convert a results table to a list of records with native Python values
+
+    Args:
+        data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+
+    Returns:
+        One tuple per row ordered as ``INDEX_COLUMNS + VALUE_COLUMNS``
+    """
+
+    data = data.reset_index().reindex(columns=INDEX_COLUMNS + VALUE_COLUMNS)
+    data['obj_id'] = data['obj_id'].astype(str)
+    columns = [[None if pd.isna(value) else value for value in data[col].tolist()] for col in data.columns]
+    return list(zip(*columns))
+
+
+def fromRecords(records: Iterable[Tuple]) -> pd.DataFrame:
+    """Convert records to a results table, keeping the last record saved for each key
+
+    Args:
+        records: Rows ordered as ``INDEX_COLUMNS + VALUE_COLUMNS``
+
+    Returns:
+        Results indexed by ``['obj_id', 'time', 'feat_name']``
+    """
+
+    data = pd.DataFrame.from_records(list(records), columns=INDEX_COLUMNS + VALUE_COLUMNS)
+    if data.empty:
+        return emptyResults()
+
+    for col in VALUE_COLUMNS:
+        if col not in TEXT_COLUMNS:
+            data[col] = pd.to_numeric(data[col])
+
+    data = data.drop_duplicates(subset=list(INDEX_COLUMNS), keep='last')
+    return data.set_index(list(INDEX_COLUMNS))
+
+
+def readCsv(path: Union[str, Path]) -> pd.DataFrame:
+    """Read results from a CSV file
+
+    Header lines repeated inside the file (as written by earlier versions
+    of the GUI) are ignored. If a key appears more than once, the last
+    row is kept.
+
+    Args:
+        path: CSV file to read
+
+    Returns:
+        Results indexed by ``['obj_id', 'time', 'feat_name']``
+    """
+
+    data = pd.read_csv(path, dtype={'obj_id': str, 'notes': str})
+    data = data[data['obj_id'] != 'obj_id']
+    for col in VALUE_COLUMNS:
+        if col in data and col not in TEXT_COLUMNS:
+            data[col] = pd.to_numeric(data[col], errors='coerce')
+
+    try:
+        data['time'] = pd.to_numeric(data['time'])
+
+    except (ValueError, TypeError):
+        pass  # Spectrum Ids are not always numeric
+
+    data = data.drop_duplicates(subset=list(INDEX_COLUMNS), keep='last')
+    return data.set_index(list(INDEX_COLUMNS))
+
+
+class ResultsStore:
+    """SQLite backed table of feature measurements keyed by ``(obj_id, time, feat_name)``"""
+
+    def __init__(self, path: Union[str, Path], readOnly: bool = False) -> None:
+        """Open a results database, creating it if necessary
+
+        Args:
+            path: Path of the SQLite database
+            readOnly: Open an existing database without creating or modifying any files
+        """
+
+        self.path = Path(path)
+        if readOnly:
+            self._connection = sqlite3.connect(f'{self.path.resolve().as_uri()}?mode=ro', uri=True)
+            return
+
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self._connection = sqlite3.connect(self.path)
+
+        columns = ', '.join(f'{col} {_sqlType(col)}'.strip() for col in INDEX_COLUMNS + VALUE_COLUMNS)
+        with self._connection:
+            self._connection.execute(
+                f'CREATE TABLE IF NOT EXISTS results ({columns}, '
+                f'PRIMARY KEY ({", ".join(INDEX_COLUMNS)})) WITHOUT ROWID'
+            )
+            self._connection.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value)')
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def upsert(self, data: pd.DataFrame) -> None:
+        """Save results, replacing any existing rows with the same key
+
+        Args:
+            data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+        """
+
+        self.upsertRecords(toRecords(data))
+
+    def upsertRecords(self, records: Iterable[Tuple]) -> None:
+        """Save records ordered as ``INDEX_COLUMNS + VALUE_COLUMNS`` in a single transaction
+
+        Args:
+            records: Rows to save, replacing any existing rows with the same key
+        """
+
+        with self._connection:
+            self._insert(records)
+
+    def _insert(self, records: Iterable[Tuple]) -> None:
+        """Insert or replace records within the current transaction"""
+
+        columns = INDEX_COLUMNS + VALUE_COLUMNS
+        placeholders = ', '.join('?' * len(columns))
+        self._connection.executemany(
+            f'INSERT OR REPLACE INTO results ({", ".join(columns)}) VALUES ({placeholders})', records
+        )
+
+    def _query(self, where: str = '', params: Tuple = ()) -> pd.DataFrame:
+        """Read rows matching an optional SQL condition as an indexed DataFrame"""
+
+        data = pd.read_sql_query(f'SELECT * FROM results {where}', self._connection, params=params)
+        for col in VALUE_COLUMNS:
+            if col not in TEXT_COLUMNS:
+                data[col] = pd.to_numeric(data[col])
+
+        return data.set_index(list(INDEX_COLUMNS))
+
+    def get(self, obj_id: str, time: Union[str, float], feat_name: str) -> Optional[pd.Series]:
+        """Return the saved measurement of a single feature
+
+        Args:
+            obj_id: Object Id of the measured spectrum
+            time: Time (or Id) of the measured spectrum
+            feat_name: Name of the measured feature
+
+        Returns:
+            The saved values or ``None`` if the feature has not been saved
+        """
+
+        data = self._query('WHERE obj_id = ? AND time = ? AND feat_name = ?', (str(obj_id), time, feat_name))
+        return None if data.empty else data.iloc[0]
+
+    def read(self, obj_id: Optional[str] = None) -> pd.DataFrame:
+        """Return all saved results, or the results for a single object
+
+        Args:
+            obj_id: Optionally only return results for the given object Id
+
+        Returns:
+            Results indexed by ``['obj_id', 'time', 'feat_name']``
+        """
+
+        if obj_id is None:
+            return self._query()
+
+        return self._query('WHERE obj_id = ?', (str(obj_id),))
+
+    def _csvState(self, path: Path) -> Tuple[int, int]:
+        """Return the modification time and size of a CSV file"""
+
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _recordCsvState(self, path: Path) -> None:
+        """Remember the state of a CSV file that matches the store contents"""
+
+        mtime, size = self._csvState(path)
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
+                [('csv_path', str(path.resolve())), ('csv_mtime_ns', mtime), ('csv_size', size)]
+            )
+
+    def _recordedCsvState(self) -> Tuple:
+        """Return the path, modification time, and size of the last synchronized CSV file"""
+
+        rows = dict(self._connection.execute('SELECT key, value FROM metadata').fetchall())
+        return rows.get('csv_path'), rows.get('csv_mtime_ns'), rows.get('csv_size')
+
+    def csvChanged(self, path: Union[str, Path]) -> bool:
+        """Return whether a CSV file exists and changed since it was last synchronized
+
+        Args:
+            path: CSV file to check
+        """
+
+        path = Path(path)
+        return path.exists() and (str(path.resolve()), *self._csvState(path)) != self._recordedCsvState()
+
+    def importCsv(self, path: Union[str, Path], replace: bool = False) -> None:
+        """Load results from a CSV file (see ``readCsv``)
+
+        Args:
+            path: CSV file to read
+            replace: Discard all existing results before importing
+        """
+
+        path = Path(path)
+        records = toRecords(readCsv(path))
+        with self._connection:
+            if replace:
+                self._connection.execute('DELETE FROM results')
+
+            self._insert(records)
+
+        self._recordCsvState(path)
+
+    def exportCsv(self, path: Union[str, Path]) -> None:
+        """Write all results to a CSV file
+
+        Args:
+            path: CSV file to write
+        """
+
+        path = Path(path)
+        self.read().to_csv(path)
+        self._recordCsvState(path)
+
+    def syncCsv(self, path: Union[str, Path]) -> None:
+        """Import a CSV file if it changed since it was last synchronized
+
+        Rows from the CSV file replace stored rows with the same key. Stored
+        rows missing from the CSV file are kept, since they may not have been
+        exported yet (e.g., after a crash).
+
+        Args:
+            path: CSV file to synchronize with
+        """
+
+        if self.csvChanged(path):
+            self.importCsv(path)
+
+    def close(self) -> None:
+        """Close the database connection"""
+
+        self._connection.close()
+
+    def __enter__(self) -> ResultsStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def storePath(path: Union[str, Path]) -> Path:
+    """Return the database path used to store results for a given output file
+
+    Args:
+        path: Path of a results database or CSV file
+
+    Returns:
+        The path itself for databases, otherwise a ``.sqlite`` file next to it
+    """
+
+    path = Path(path)
+    return path if path.suffix in STORE_SUFFIXES else path.with_suffix('.sqlite')
+
+
+def journalPath(path: Union[str, Path]) -> Path:
+    """Return the path of the journal holding results not yet written to the store
+
+    Args:
+        path: Path of a results database or CSV file
+
+    Returns:
+        A ``.journal`` file next to the results database
+    """
+
+    return storePath(path).with_suffix('.journal')
+
+
+def appendJournal(path: Path, records: Iterable[Tuple]) -> None:
+    """Append records to a journal file, one JSON encoded record per line
+
+    Args:
+        path: Path of the journal file
+        records: Records ordered as ``INDEX_COLUMNS + VALUE_COLUMNS``
+    """
+
+    with path.open('a') as journal:
+        journal.writelines(json.dumps(record) + '\n' for record in records)
+        journal.flush()
+
+
+def readJournal(path: Path) -> List[Tuple]:
+    """Read the records saved in a journal file
+
+    A partially written final line (e.g., from a crash while writing) is
+    ignored.
+
+    Args:
+        path: Path of the journal file
+
+    Returns:
+        Records ordered as ``INDEX_COLUMNS + VALUE_COLUMNS``, or an empty list if there is no journal
+    """
+
+    if not path.exists():
+        return []
+
+    records = []
+    with path.open() as journal:
+        for line in journal:
+            try:
+                records.append(tuple(json.loads(line)))
+
+            except json.JSONDecodeError:
+                continue
+
+    return records
+
+
+def replayJournal(store: ResultsStore, path: Path) -> int:
+    """Save records from a journal file to a store and remove the journal
+
+    Args:
+        store: The store to save records to
+        path: Path of the journal file
+
+    Returns:
+        The number of records replayed
+    """
+
+    if not path.exists():
+        return 0
+
+    records = readJournal(path)
+    store.upsertRecords(records)
+    path.unlink()
+    return len(records)
+
+
+def openResults(path: Union[str, Path]) -> ResultsStore:
+    """Open the results store for a given output file
+
+    When given a CSV file, results are kept in a database next to the file.
+    The CSV file is imported if it was changed outside of the store (e.g.,
+    by ``leed.batch``) since the store last read or wrote it (see
+    ``ResultsStore.syncCsv``). Any results
+    left in the journal by an interrupted ``ResultsWriter`` are then saved to
+    the store.
+
+    Args:
+        path: Path of a results database or CSV file
+
+    Returns:
+        The opened results store
+    """
+
+    path = Path(path)
+    store = ResultsStore(storePath(path))
+    if path.suffix not in STORE_SUFFIXES:
+        store.syncCsv(path)
+
+    replayJournal(store, journalPath(path))
+    return store
+
+
+def readResults(path: Union[str, Path]) -> pd.DataFrame:
+    """Read the results for a given output file without modifying any files
+
+    Returns the same results as ``openResults(path).read()``, but the store,
+    CSV file, and journal are only read. Nothing is created on disk, so it
+    is safe to call for output files that do not exist yet.
+
+    Args:
+        path: Path of a results database or CSV file
+
+    Returns:
+        Results indexed by ``['obj_id', 'time', 'feat_name']``
+    """
+
+    path = Path(path)
+    isCsv = path.suffix not in STORE_SUFFIXES
+    records = []
+    if storePath(path).exists():
+        with ResultsStore(storePath(path), readOnly=True) as store:
+            records = toRecords(store.read())
+            if isCsv and store.csvChanged(path):
+                records += toRecords(readCsv(path))
+
+    elif isCsv and path.exists():
+        records = toRecords(readCsv(path))
+
+    return fromRecords(records + readJournal(journalPath(path)))
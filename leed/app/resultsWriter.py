@@ -0,0 +1,182 @@
+"""Write-behind saving of results so the GUI never waits on the disk.
+
+Results passed to a ``ResultsWriter`` are appended to a small journal file
+and queued for a background thread, which saves them to the results store
+in batches. The journal is cleared once its contents are safely in the
+store. If the application exits before the queue is drained, the journal
+is replayed the next time the store is opened (see ``openResults``).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .resultsStore import appendJournal, journalPath, openResults, toRecords
+
+
+class _Flush:
+    """Queue item requesting that all previously queued records be saved"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()  # Queue item stopping the writer thread
+
+
+class ResultsWriter:
+    """Save results to a results store from a background thread"""
+
+    def __init__(
+            self,
+            path: Union[str, Path],
+            maxQueue: int = 1000,
+            batchSize: int = 500,
+            flushInterval: float = 2.
+    ) -> None:
+        """Start a writer thread for the results store of a given output file
+
+        Args:
+            path: Path of a results database or CSV file (see ``openResults``)
+            maxQueue: Maximum number of saves waiting to be written before ``write`` blocks
+            batchSize: Number of records written to the store in a single transaction
+            flushInterval: Maximum number of seconds queued records wait before being written
+        """
+
+        self.path = Path(path)
+        self.journal = journalPath(self.path)
+        self.batchSize = batchSize
+        self.flushInterval = flushInterval
+
+        self._queue = queue.Queue(maxsize=maxQueue)
+        self._journalLock = threading.Lock()
+        self._unsaved = 0  # Number of journaled writes not yet saved to the store
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        # The store is opened before starting the thread so any errors are raised here
+        openResults(self.path).close()
+        self._thread = threading.Thread(target=self._run, name='ResultsWriter', daemon=True)
+        self._thread.start()
+
+    def _raiseError(self) -> None:
+        """Re-raise any error encountered by the writer thread"""
+
+        if self._error is not None:
+            raise RuntimeError('Results could not be written to the results store') from self._error
+
+    def write(self, data: pd.DataFrame) -> None:
+        """Queue results to be saved
+
+        Results are appended to the journal before returning, so they are
+        not lost if the application exits before they reach the store.
+
+        Args:
+            data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+        """
+
+        if self._closed:
+            raise RuntimeError('Cannot write to a closed ResultsWriter')
+
+        self._raiseError()
+        records = toRecords(data)
+        if not records:
+            return
+
+        with self._journalLock:
+            appendJournal(self.journal, records)
+            self._unsaved += 1
+
+        self._queue.put(records)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until all queued results have been saved to the store
+
+        Args:
+            timeout: Optional maximum number of seconds to wait
+
+        Raises:
+            TimeoutError: If the results are not saved within the timeout
+        """
+
+        request = _Flush()
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError('Timed out waiting for results to be written')
+
+        self._raiseError()
+
+    def close(self) -> None:
+        """Save all queued results and stop the writer thread"""
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raiseError()
+
+    def __enter__(self) -> ResultsWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Save queued records in batches until stopped"""
+
+        store = openResults(self.path)
+        pending: List[Tuple] = []
+        pendingWrites = 0
+        deadline = None
+
+        def commit() -> None:
+            nonlocal pending, pendingWrites, deadline
+            if pending and self._error is None:
+                try:
+                    store.upsertRecords(pending)
+
+                except Exception as excep:  # Records stay in the journal
+                    self._error = excep
+
+            with self._journalLock:
+                self._unsaved -= pendingWrites
+                if self._error is None and self._unsaved == 0 and self.journal.exists():
+                    self.journal.unlink()
+
+            pending, pendingWrites, deadline = [], 0, None
+
+        try:
+            while True:
+                timeout = None if deadline is None else max(0., deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+
+                except queue.Empty:
+                    commit()
+                    continue
+
+                if item is _STOP:
+                    commit()
+                    return
+
+                if isinstance(item, _Flush):
+                    commit()
+                    item.done.set()
+                    continue
+
+                pending.extend(item)
+                pendingWrites += 1
+                deadline = deadline or time.monotonic() + self.flushInterval
+                if len(pending) >= self.batchSize:
+                    commit()
+
+        finally:
+            store.close()
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import copy
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Optional, List, Tuple, TYPE_CHECKING
 
 import yaml
-from PyQt5.QtGui import QBrush, QColor, QPen
+
+if TYPE_CHECKING:  # Qt is only imported when settings are converted to Qt objects
+    from PyQt5.QtGui import QBrush, QColor, QPen
 
 RESOURCES_DIR: Path = Path(__file__).resolve().parent.parent / 'resources'
 SETTINGS_PATH = RESOURCES_DIR / 'settings.yml'
@@ -58,12 +62,13 @@ class FeatureDefinition(Settings):
 
 @dataclass
 class SpectralProcessingSettings(Settings):
-    """Settings used when correcting for extinction and binning the spectra"""
+    """Settings used when correcting for extinction, binning, and measuring the spectra"""
 
     nstep: int = 5
     rv: float = 3.1
     bin_size: float = 10
     bin_method: str = 'median'
+    fit_method: str = 'exact'
 
 
 @dataclass
@@ -76,6 +81,7 @@ class ColorSettings(Settings):
     def asColor(self) -> QColor:
         """Use settings values to instantiate a ``QColor``  object"""
 
+        from PyQt5.QtGui import QColor
         return QColor(self.r, self.g, self.b, self.a)
 
     def toCSS(self) -> str:
@@ -93,6 +99,7 @@ class BrushSettings(Settings):
     def asBrush(self) -> QBrush:
         """Use settings values to instantiate a ``QBrush`` object"""
 
+        from PyQt5.QtGui import QBrush
         return QBrush(self.color.asColor())
 
 
@@ -105,8 +112,9 @@ class PenSettings(BrushSettings):
     def asPen(self) -> QPen:
         """Use settings values to instantiate a ``QPen``  object"""
 
+        from PyQt5.QtGui import QPen
         pen = QPen(self.color.asColor())
-        pen.setWidth(self.width)
+        pen.setWidthF(self.width)
         return pen
 
 
@@ -149,7 +157,7 @@ class ApplicationSettings(Settings):
         path = path or SETTINGS_PATH
         if not path.exists():
             settings = SettingsLoader(defaults=True)
-            settings.saveToDisk()
+            settings.saveToDisk(path)
             return settings
 
         with path.open() as infile:
@@ -186,6 +194,8 @@ class ApplicationSettings(Settings):
         with path.open('w') as ofile:
             yaml.dump(data, ofile)
 
+        _cache.update(path, self)
+
     @property
     def layout_dir(self) -> Path:
         """Return file path of the UI layout for the current window"""
@@ -206,12 +216,144 @@ class ApplicationSettings(Settings):
         return RESOURCES_DIR / f'{map_name}_dust_map'
 
 
+SettingsListener = Callable[[ApplicationSettings], None]
+
+
+class _SettingsCache:
+    """Process wide cache of parsed settings files
+
+    Files are only parsed again when their modification time or size
+    changes. Callers are given deep copies so changes to returned settings
+    are not shared until they are saved.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache"""
+
+        self._lock = threading.RLock()
+        self._entries: Dict[Path, Tuple[Tuple[int, int], ApplicationSettings]] = dict()
+        self._listeners: Dict[Path, List[SettingsListener]] = dict()
+
+    @staticmethod
+    def _stamp(path: Path) -> Tuple[int, int]:
+        """Return the modification time and size of a file"""
+
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self, path: Path) -> ApplicationSettings:
+        """Return settings for a file, parsing it only if it changed since last read"""
+
+        path = path.resolve()
+        if not path.exists():  # New files are written with default settings and cached by ``saveToDisk``
+            ApplicationSettings._load_from_disk(path)
+
+        listeners = []
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != self._stamp(path):
+                self._entries[path] = (self._stamp(path), ApplicationSettings._load_from_disk(path))
+                if entry is not None:
+                    listeners = list(self._listeners.get(path, ()))
+
+            settings = copy.deepcopy(self._entries[path][1])
+
+        self._notify(listeners, settings)
+        return settings
+
+    def update(self, path: Path, settings: ApplicationSettings) -> None:
+        """Cache settings that were just written to a file and notify listeners"""
+
+        path = path.resolve()
+        with self._lock:
+            self._entries[path] = (self._stamp(path), copy.deepcopy(settings))
+            listeners = list(self._listeners.get(path, ()))
+
+        self._notify(listeners, settings)
+
+    @staticmethod
+    def _notify(listeners: List[SettingsListener], settings: ApplicationSettings) -> None:
+        """Call listeners with copies of new settings
+
+        Listeners are called without holding the cache lock, so slow
+        listeners or listeners reading settings from other threads do not
+        block other callers.
+        """
+
+        for listener in listeners:
+            listener(copy.deepcopy(settings))
+
+    def addListener(self, callback: SettingsListener, path: Path) -> None:
+        """Call a function with the new settings whenever a file changes"""
+
+        with self._lock:
+            self._listeners.setdefault(path.resolve(), []).append(callback)
+
+    def removeListener(self, callback: SettingsListener, path: Path) -> None:
+        """Stop calling a function when a file changes"""
+
+        with self._lock:
+            listeners = self._listeners.get(path.resolve(), [])
+            if callback in listeners:
+                listeners.remove(callback)
+
+    def clear(self) -> None:
+        """Discard all cached settings"""
+
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _SettingsCache()
+
+
+def loadSettings(path: Optional[Path] = None) -> ApplicationSettings:
+    """Load application settings, reusing the parsed file if it has not changed
+
+    Args:
+        path: The settings file to load (defaults to internal package path)
+
+    Returns:
+        A copy of the settings that can be modified by the caller
+    """
+
+    return _cache.load(Path(path or SETTINGS_PATH))
+
+
+def addSettingsListener(callback: SettingsListener, path: Optional[Path] = None) -> None:
+    """Register a function to call with the new settings whenever a settings file changes
+
+    Changes are detected when settings are saved with ``saveToDisk`` or when
+    a modified file is loaded again.
+
+    Args:
+        callback: Function called with a copy of the new settings
+        path: The settings file to follow (defaults to internal package path)
+    """
+
+    _cache.addListener(callback, Path(path or SETTINGS_PATH))
+
+
+def removeSettingsListener(callback: SettingsListener, path: Optional[Path] = None) -> None:
+    """Stop calling a function registered with ``addSettingsListener``
+
+    Args:
+        callback: The registered function
+        path: The settings file the function was registered for
+    """
+
+    _cache.removeListener(callback, Path(path or SETTINGS_PATH))
+
+
 class SettingsLoader:
     """Class for loading saved application settings"""
 
     def __new__(cls, defaults: bool = False) -> ApplicationSettings:
         """Load application settings
 
+        Settings saved on disk are cached and only parsed again when the file
+        changes (see ``loadSettings``).
+
         Args:
             defaults: Load default application settings instead of using settings saved on disk
         """
@@ -219,7 +361,7 @@ class SettingsLoader:
         if defaults:
             return ApplicationSettings(
                 # ALL default application settings are defined here
-                prepare=SpectralProcessingSettings(5, 3.1, 10, 'median'),
+                prepare=SpectralProcessingSettings(5, 3.1, 10, 'median', 'exact'),
                 features=[
                     FeatureDefinition('Ca II H & K', 3500.0, 3900.0, 3945.02, 3800.0, 4100.0, 2),
                     FeatureDefinition('Si II λ4130', 3900.0, 4000.0, 4129.78, 4000.0, 4150.0, 2),
@@ -243,4 +385,4 @@ class SettingsLoader:
             )
 
         else:
-            return ApplicationSettings._load_from_disk()
+            return loadSettings()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+from PyQt5 import QtCore
+
+from .settings import ApplicationSettings, SETTINGS_PATH, addSettingsListener, loadSettings, removeSettingsListener
+
+
+class SettingsService(QtCore.QObject):
+    """Shared access to application settings with change notifications
+
+    Settings are read through the process wide settings cache. The
+    ``settingsChanged`` signal is emitted when settings are saved from the
+    application or the settings file is modified outside of it.
+
+    Signals:
+        settingsChanged: Emitted with the new ``ApplicationSettings`` when settings change
+    """
+
+    settingsChanged = QtCore.pyqtSignal(object)
+    _instance: Optional[SettingsService] = None
+
+    def __init__(self, path: Optional[Path] = None, parent: QtCore.QObject = None) -> None:
+        """Follow changes to a settings file
+
+        Args:
+            path: The settings file to follow (defaults to internal package path)
+            parent: Optional parent object
+        """
+
+        super().__init__(parent)
+        self.path = Path(path or SETTINGS_PATH)
+
+        # Make sure the file exists before watching it
+        loadSettings(self.path)
+        addSettingsListener(self._notify, self.path)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.addPath(str(self.path))
+        self._watcher.addPath(str(self.path.parent))
+        self._watcher.fileChanged.connect(self.reload)
+        self._watcher.directoryChanged.connect(self.reload)
+
+    @classmethod
+    def instance(cls) -> SettingsService:
+        """Return the settings service for the default settings file"""
+
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def settings(self) -> ApplicationSettings:
+        """Return a copy of the current application settings"""
+
+        return loadSettings(self.path)
+
+    def _notify(self, settings: ApplicationSettings) -> None:
+        """Forward changes from the settings cache to connected slots"""
+
+        # noinspection PyUnresolvedReferences
+        self.settingsChanged.emit(settings)
+
+    def reload(self, *args) -> None:
+        """Check the settings file for changes made outside the application
+
+        Editors often replace files instead of modifying them, which stops
+        them from being watched, so the file is watched again if needed.
+        """
+
+        if self.path.exists():
+            if str(self.path) not in self._watcher.files():
+                self._watcher.addPath(str(self.path))
+
+            loadSettings(self.path)
+
+    def close(self) -> None:
+        """Stop following changes to the settings file"""
+
+        removeSettingsListener(self._notify, self.path)
+        self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
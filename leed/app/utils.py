@@ -1,12 +1,20 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, List, Optional, Sequence, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
+from .resultsStore import emptyResults, readResults
+
 
 def get_results_dataframe(fpath: Path = None) -> pd.DataFrame:
     """Load any existing results from a given file path
 
+    Results are read from the indexed store kept for the given file without
+    creating or modifying any files (see ``leed.app.resultsStore.readResults``).
+
      Args:
          fpath: Path to load data from
 
@@ -14,27 +22,10 @@ def get_results_dataframe(fpath: Path = None) -> pd.DataFrame:
         A pandas DataFrame indexed by ['obj_id', 'time', 'feat_name']
     """
 
-    # Read existing results if they exist and make sure objectIds are strings
     if fpath is not None:
-        if fpath.exists():
-            data = pd.read_csv(fpath)
-            data['obj_id'] = data['obj_id'].astype(str)
-            return data.set_index(['obj_id', 'time', 'feat_name'])
-
-        else:
-            fpath.parent.mkdir(exist_ok=True, parents=True)
-
-    col_names = ['obj_id', 'time', 'feat_name', 'feat_start', 'feat_end']
-    for value in ('vel', 'pew', 'area'):
-        col_names.append(value)
-        col_names.append(value + '_err')
-        col_names.append(value + '_samperr')
+        return readResults(fpath)
 
-    col_names.append('spec_flag')
-    col_names.append('feat_flag')
-    col_names.append('notes')
-    df = pd.DataFrame(columns=col_names)
-    return df.set_index(['obj_id', 'time', 'feat_name'])
+    return emptyResults()
 
 
 class BlockSignals:
@@ -64,26 +55,70 @@ class BlockSignals:
         self.attr.blockSignals(self.original_state)
 
 
+class CacheInfo(NamedTuple):
+    """Usage statistics for the cache of loaded supernova data"""
+
+    hits: int
+    misses: int
+    entries: int
+    nbytes: int
+
+
 class SpectralAccessor:
-    def __init__(self, accessFunc: callable, objectIds: Sequence[str], groupBy: str = None) -> None:
+    def __init__(
+            self,
+            accessFunc: callable,
+            objectIds: Sequence[str],
+            groupBy: str = None,
+            prefetch: int = 1,
+            maxCacheEntries: Optional[int] = 10,
+            maxCacheBytes: Optional[int] = None
+    ) -> None:
         """Data Access Object for spectroscopic observations of Type Ia Supernovae
 
+        Data for neighboring supernovae is loaded ahead of time on a background
+        thread. All calls to ``accessFunc`` are made from that thread, one at
+        a time. Loaded data is kept in a least recently used cache bounded by
+        the number of entries and / or the memory usage of the cached data.
+
         Args:
             accessFunc: Callable object that returns supernova data for a given object Id
             objectIds: List of object Ids to provide access to
             groupBy: Group supernova data into individual spectra by the given column
+            prefetch: Number of supernovae to load ahead of time in each direction
+            maxCacheEntries: Maximum number of supernovae to cache (``None`` for no limit)
+            maxCacheBytes: Maximum memory used by cached data in bytes (``None`` for no limit)
         """
 
         if len(objectIds) == 0:
             raise ValueError('Object Id list cannot be empty')
 
+        if prefetch < 0:
+            raise ValueError('Prefetch depth cannot be negative')
+
+        if (maxCacheEntries is not None and maxCacheEntries < 0) or (maxCacheBytes is not None and maxCacheBytes < 0):
+            raise ValueError('Cache limits cannot be negative')
+
         self._func = accessFunc
         self._objIds = objectIds
         self._groupBy = groupBy
 
+        self._prefetch = prefetch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='leed-prefetch') if prefetch else None
+        self._futures: Dict[str, Future] = dict()
+
+        self._maxCacheEntries = maxCacheEntries
+        self._maxCacheBytes = maxCacheBytes
+        self._cache: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self._cacheBytes: Dict[str, int] = dict()
+        self._hits = 0
+        self._misses = 0
+
         self._currentObjectIndex = -1
         self._currentSpectrumIndex = 0
         self._snData: Optional[pd.DataFrame] = None
+        self._specIds: List[Union[str, float, int]] = []
+        self._specSlices: Dict[Union[str, float, int], slice] = dict()
         self.loadNextSN()
 
     @property
@@ -102,10 +137,7 @@ class SpectralAccessor:
     def availableSpecIds(self) -> List[Union[str, float, int]]:
         """List of available spectra for the current supernova"""
 
-        if self._groupBy:
-            return sorted(set(self._snData[self._groupBy]))
-
-        return []
+        return list(self._specIds)
 
     def specForSN(self, objId: Optional[str] = None) -> List[Union[str, float, int]]:
         """Return a list of available spectra for a given supernova id
@@ -118,22 +150,170 @@ class SpectralAccessor:
         """
 
         if objId:
-            return sorted(set(self._func(self.currentSN)[self._groupBy]))
+            return sorted(set(self._fetch(objId)[self._groupBy]))
 
     @property
     def currentSpecId(self) -> Union[str, float, int]:
         """Identifier for the current spectrum being accessed"""
 
-        return self.availableSpecIds[self._currentSpectrumIndex]
+        return self._specIds[self._currentSpectrumIndex]
+
+    def _setData(self, data: pd.DataFrame) -> None:
+        """Set the data for the current supernova and index its individual spectra
+
+        Rows are stably sorted by the ``groupBy`` column so each spectrum
+        occupies a contiguous block of rows that can be sliced without copying.
+
+        Args:
+            data: Data for the current supernova
+        """
+
+        self._specIds, self._specSlices = [], dict()
+        if self._groupBy is None or data.empty:
+            self._snData = data
+            return
+
+        order = np.argsort(data[self._groupBy].values, kind='stable')
+        if np.any(order[1:] < order[:-1]):
+            data = data.iloc[order]
+
+        specIds, starts = np.unique(data[self._groupBy].values, return_index=True)
+        ends = np.append(starts[1:], len(data))
+        self._snData = data
+        self._specIds = specIds.tolist()
+        self._specSlices = {specId: slice(start, end) for specId, start, end in zip(self._specIds, starts, ends)}
+
+    @property
+    def cacheInfo(self) -> CacheInfo:
+        """Hit / miss counts and the current size of the data cache"""
+
+        return CacheInfo(self._hits, self._misses, len(self._cache), sum(self._cacheBytes.values()))
+
+    def _cacheStore(self, objId: str, data: pd.DataFrame) -> None:
+        """Add data to the cache and evict the least recently used entries over the cache limits
+
+        The most recently stored entry is never evicted by the memory limit.
+
+        Args:
+            objId: Id of the supernova
+            data: The supernova data
+        """
+
+        if self._maxCacheEntries == 0:
+            return
+
+        self._cache[objId] = data
+        self._cache.move_to_end(objId)
+        self._cacheBytes[objId] = int(data.memory_usage(deep=True).sum())
+
+        while self._cache:
+            tooMany = self._maxCacheEntries is not None and len(self._cache) > self._maxCacheEntries
+            tooLarge = self._maxCacheBytes is not None and sum(self._cacheBytes.values()) > self._maxCacheBytes
+            if not (tooMany or (tooLarge and len(self._cache) > 1)):
+                break
+
+            evicted, _ = self._cache.popitem(last=False)
+            del self._cacheBytes[evicted]
+
+    def invalidate(self, objId: Optional[str] = None) -> None:
+        """Discard cached and prefetched data so it is reloaded on next access
+
+        Data for the currently loaded supernova remains in use until the
+        supernova is loaded again.
+
+        Args:
+            objId: Id of the supernova to discard (Default: all supernovae)
+        """
+
+        objIds = list(set(self._cache) | set(self._futures)) if objId is None else [objId]
+        for obj in objIds:
+            self._cache.pop(obj, None)
+            self._cacheBytes.pop(obj, None)
+            if obj in self._futures:
+                self._futures.pop(obj).cancel()
+
+    def _fetch(self, objId: str) -> pd.DataFrame:
+        """Return data for a given supernova from the cache, a pending prefetch, or ``accessFunc``
+
+        Args:
+            objId: Id of the supernova
+
+        Returns:
+            The data returned by ``accessFunc``
+        """
+
+        if objId in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(objId)
+            return self._cache[objId]
+
+        self._misses += 1
+        if self._executor is None:
+            data = self._func(objId)
+
+        else:
+            future = self._futures.pop(objId, None) or self._executor.submit(self._func, objId)
+            data = future.result()
+
+        self._cacheStore(objId, data)
+        return data
+
+    def _load(self, index: int) -> pd.DataFrame:
+        """Return data for the supernova at a given index and prefetch its neighbors
+
+        Pending prefetches for the requested supernova are waited on rather
+        than loading the data a second time. Finished prefetches are moved
+        into the cache, and prefetches that have not started are cancelled
+        once they are no longer adjacent to the requested supernova.
+
+        Args:
+            index: Index of the supernova in the list of object Ids
+
+        Returns:
+            The data returned by ``accessFunc``
+        """
+
+        if self._executor is not None:
+            indices = range(max(0, index - self._prefetch), min(len(self._objIds), index + self._prefetch + 1))
+            window = [self._objIds[i] for i in sorted(indices, key=lambda i: abs(i - index))]
+
+            # Move finished prefetches into the cache so they count against the cache limits
+            # and cancel pending prefetches that are no longer adjacent to the requested supernova
+            for objId in sorted(self._futures, key=lambda obj: obj in window):
+                future = self._futures[objId]
+                if future.done() and self._maxCacheEntries != 0:
+                    del self._futures[objId]
+                    if not future.cancelled() and future.exception() is None:
+                        self._cacheStore(objId, future.result())
+
+                elif objId not in window and (future.done() or future.cancel()):
+                    del self._futures[objId]
+
+            # Queue the requested supernova ahead of its neighbors
+            for objId in window:
+                if objId not in self._cache and objId not in self._futures:
+                    self._futures[objId] = self._executor.submit(self._func, objId)
+
+        return self._fetch(self._objIds[index])
+
+    def close(self) -> None:
+        """Cancel any pending prefetches and stop the background thread"""
+
+        for future in self._futures.values():
+            future.cancel()
+
+        self._futures.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
 
     def loadNextSN(self) -> None:
         """Iterate to the next available supernova"""
 
-        if self._currentObjectIndex >= len(self._objIds):
+        if self._currentObjectIndex >= len(self._objIds) - 1:
             raise StopIteration
 
         self._currentObjectIndex += 1
-        self._snData = self._func(self.currentSN)
+        self._setData(self._load(self._currentObjectIndex))
         if self._snData.empty:
             self.loadNextSN()
 
@@ -146,7 +326,7 @@ class SpectralAccessor:
             raise StopIteration
 
         self._currentObjectIndex -= 1
-        self._snData = self._func(self.currentSN)
+        self._setData(self._load(self._currentObjectIndex))
         if self._snData.empty:
             self.loadPreviousSN()
 
@@ -174,7 +354,7 @@ class SpectralAccessor:
         """Data for the current supernova spectrum"""
 
         if self._groupBy is not None:
-            return self._snData[self._snData[self._groupBy] == self.currentSpecId].flux
+            return self._snData.flux.iloc[self._specSlices[self.currentSpecId]]
 
         return self._snData.flux
 
@@ -195,7 +375,7 @@ class SpectralAccessor:
         except ValueError:
             raise ValueError(f'Invalid object Id: {objId}')
 
-        self._snData = self._func(self.currentSN)
+        self._setData(self._load(self._currentObjectIndex))
 
         try:
             self._currentSpectrumIndex = self.availableSpecIds.index(specId)
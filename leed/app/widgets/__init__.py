@@ -1,3 +1,4 @@
 from .featureTableWidget import FeatureTableWidget
 from .inspectionPlotWidget import InspectionPlotWidget
 from .pandasTableModel import PandasTableModel
+from .resultsModel import ResultsModel
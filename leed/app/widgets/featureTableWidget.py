@@ -4,6 +4,7 @@ from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtCore import Qt
 
 from ..settings import FeatureDefinition, SettingsLoader
+from ..settingsService import SettingsService
 from ..utils import BlockSignals
 
 
@@ -84,7 +85,7 @@ class FeatureTableWidget(QtWidgets.QTableWidget):
             defaults: Restore the table to default values instead of currently saved settings
         """
 
-        settings = SettingsLoader(defaults)
+        settings = SettingsLoader(defaults=True) if defaults else SettingsService.instance().settings()
 
         # Clear the table so we can repopulate it row by row
         self.setRowCount(0)
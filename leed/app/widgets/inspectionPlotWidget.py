@@ -2,7 +2,8 @@ import pandas as pd
 import pyqtgraph
 
 from leed.accessors.calcVelocity import GaussianFit
-from leed.app.settings import ApplicationSettings, SettingsLoader
+from leed.app.settings import ApplicationSettings
+from leed.app.settingsService import SettingsService
 
 # Enable anti-aliasing for prettier plots
 pyqtgraph.setConfigOptions(antialias=True)
@@ -53,7 +54,7 @@ class InspectionPlotWidget(pyqtgraph.PlotWidget):
     def updateStyleFromDisk(self):
         """Update the plot style to reflect application settings currently saved to disk"""
 
-        self.updateStyleFromSettings(SettingsLoader())
+        self.updateStyleFromSettings(SettingsService.instance().settings())
 
     def updateStyleFromSettings(self, settings: ApplicationSettings) -> None:
         """Update the plot style to reflect application settings from memory
@@ -1,32 +1,285 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from PyQt5 import QtCore
 
 
 class PandasTableModel(QtCore.QAbstractTableModel):
-    """Populate a table view from the contents of a pandas dataframe."""
+    """Populate a table view from the contents of a pandas dataframe.
 
-    def __init__(self, data: pd.DataFrame) -> None:
+    Values are stored in one array per column and converted to strings
+    only when a cell is displayed. Column arrays grow geometrically, so
+    appending rows takes amortized time proportional to the number of new
+    rows. A ``DataFrame`` is only rebuilt from the arrays when requested.
+    Rows are exposed to the view in batches using ``canFetchMore`` /
+    ``fetchMore``. Sorting and filtering reorder a permutation of the row
+    numbers instead of copying the data.
+    """
+
+    def __init__(self, data: pd.DataFrame, batchSize: int = 1000) -> None:
         """A table view that populates from a ``pandas.DataFrame`` object.
 
         Args:
             data: The ``DataFrame`` to populate from
+            batchSize: Number of rows made available to the view at a time
         """
 
         QtCore.QAbstractTableModel.__init__(self)
-        self._data = data
+        self.batchSize = batchSize
+        self._filterText = ''
+        self._filterColumn: Optional[int] = None
+        self._sortColumn: Optional[int] = None
+        self._sortOrder = QtCore.Qt.AscendingOrder
+        self._setData(data)
+
+    ###########################################################################
+    # Internal state
+    ###########################################################################
+
+    @staticmethod
+    def _toArrays(data: pd.DataFrame) -> List[np.array]:
+        """Convert each column of a ``DataFrame`` to a numpy array
+
+        Numeric extension types (e.g., ``Int8``) are stored as floats with
+        missing values as ``np.nan``. Other extension types (e.g., categoricals)
+        are stored as object arrays.
+        """
+
+        arrays = []
+        for i in range(data.columns.size):
+            column = data.iloc[:, i]
+            if not isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+                arrays.append(column.to_numpy())
+
+            elif pd.api.types.is_numeric_dtype(column.dtype):
+                arrays.append(column.to_numpy(dtype=float, na_value=np.nan))
+
+            else:
+                arrays.append(column.to_numpy(dtype=object))
+
+        return arrays
+
+    def _setData(self, data: pd.DataFrame) -> None:
+        """Replace the table data and rebuild all cached values"""
+
+        self._frame: Optional[pd.DataFrame] = data
+        self._columns = data.columns
+        self._dtypes = list(data.dtypes)
+        self._index: Optional[pd.Index] = data.index
+        self._arrays: List[np.array] = self._toArrays(data)
+        self._size = len(data)
+        self._clearCaches()
+        self._order = self._visibleRows()
+        self._loaded = min(len(self._order), self.batchSize)
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """The table data as a ``DataFrame``, rebuilt from the column arrays after any changes"""
+
+        if self._frame is None:
+            index = pd.RangeIndex(self._size) if self._index is None else self._index
+            columns = []
+            for dtype, array in zip(self._dtypes, self._arrays):
+                values = pd.Series(array[:self._size], index=index)
+                columns.append(values.astype('category' if isinstance(dtype, pd.CategoricalDtype) else dtype))
+
+            self._frame = pd.concat(columns, axis=1) if columns else pd.DataFrame(index=index)
+            self._frame.columns = self._columns
+
+        return self._frame
+
+    def _dataChanged(self) -> None:
+        """Discard the cached ``DataFrame`` and any values derived from the whole table"""
+
+        self._frame = None
+        self._strings.clear()
+        self._permutations.clear()
+
+    def _clearCaches(self) -> None:
+        """Discard formatted values and sort permutations"""
+
+        self._display: List[Dict[int, str]] = [dict() for _ in self._arrays]
+        self._strings: Dict[int, np.array] = dict()
+        self._permutations: Dict[Tuple[int, int], np.array] = dict()
+
+    def _format(self, row: int, col: int) -> str:
+        """Return the memoized string representation of a cell using its row in the data"""
+
+        memo = self._display[col]
+        if row not in memo:
+            memo[row] = str(self._arrays[col][row])
+
+        return memo[row]
+
+    def _columnStrings(self, col: int) -> np.array:
+        """Return the string representation of every value in a column"""
+
+        if col not in self._strings:
+            self._strings[col] = np.array([self._format(row, col) for row in range(self._size)], dtype=object)
+
+        return self._strings[col]
+
+    def _permutation(self, col: int, order: QtCore.Qt.SortOrder) -> np.array:
+        """Return the row order sorting the data by a given column
+
+        Permutations are computed once per column and order. Missing values
+        are always placed last.
+        """
+
+        key = (col, int(order))
+        if key not in self._permutations:
+            values = pd.Series(self._arrays[col][:self._size])
+            ascending = order == QtCore.Qt.AscendingOrder
+            try:
+                ordered = values.sort_values(ascending=ascending, kind='mergesort', na_position='last')
+
+            except TypeError:  # Mixed types that cannot be compared
+                ordered = pd.Series(self._columnStrings(col)).sort_values(ascending=ascending, kind='mergesort')
+
+            self._permutations[key] = ordered.index.to_numpy()
+
+        return self._permutations[key]
+
+    def _filterMask(self, rows: np.array) -> np.array:
+        """Return which of the given data rows match the current filter"""
+
+        if not self._filterText:
+            return np.ones(len(rows), dtype=bool)
+
+        columns = range(len(self._arrays)) if self._filterColumn is None else [self._filterColumn]
+        text = self._filterText.lower()
+        mask = np.zeros(len(rows), dtype=bool)
+        for col in columns:
+            strings = pd.Series(self._columnStrings(col)[rows])
+            mask |= strings.str.lower().str.contains(text, regex=False).to_numpy()
+
+        return mask
+
+    def _visibleRows(self) -> np.array:
+        """Return the data rows shown in the view after sorting and filtering"""
+
+        if self._sortColumn is None:
+            rows = np.arange(self._size)
+
+        else:
+            rows = self._permutation(self._sortColumn, self._sortOrder)
+
+        return rows[self._filterMask(rows)]
+
+    def _resetOrder(self) -> None:
+        """Recompute the visible rows and reset attached views"""
 
-    def rowCount(self, parent: QtCore.QObject = None) -> int:
-        """Return the number of rows in the table."""
+        self.beginResetModel()
+        self._order = self._visibleRows()
+        self._loaded = min(len(self._order), max(self._loaded, self.batchSize))
+        self.endResetModel()
 
-        # noinspection PyTypeChecker
-        return len(self._data.values)
+    def _appendRows(self, data: pd.DataFrame) -> None:
+        """Add rows to the end of the table
 
-    def columnCount(self, parent: QtCore.QObject = None) -> int:
+        New rows matching the current filter are appended to the end of
+        the view, even if the view is sorted. They are moved into place the
+        next time the table is sorted.
+
+        Args:
+            data: Rows with the same columns as the existing data
+        """
+
+        if data.empty:
+            return
+
+        first, last = self._size, self._size + len(data)
+        for col, values in enumerate(self._toArrays(data)):
+            array = self._arrays[col]
+            dtype = np.result_type(array, values) if array.dtype != object else array.dtype
+            if last > len(array) or dtype != array.dtype:
+                grown = np.empty(max(last, 2 * len(array)), dtype=dtype)
+                grown[:first] = array[:first]
+                self._arrays[col] = array = grown
+
+            array[first:last] = values
+
+        self._size = last
+        self._index = None
+        self._dataChanged()
+
+        newRows = np.arange(first, last)
+        newRows = newRows[self._filterMask(newRows)]
+        if not len(newRows):
+            return
+
+        if self._loaded < len(self._order):  # New rows are exposed by ``fetchMore``
+            self._order = np.concatenate([self._order, newRows])
+            return
+
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + len(newRows) - 1)
+        self._order = np.concatenate([self._order, newRows])
+        self._loaded += len(newRows)
+        self.endInsertRows()
+
+    def _setRows(self, rows: np.array, data: pd.DataFrame) -> None:
+        """Replace the values of existing rows
+
+        Args:
+            rows: Position of each row in the data
+            data: New values with the same columns as the existing data
+        """
+
+        rows = np.asarray(rows, dtype=int)
+        if not len(rows):
+            return
+
+        for col, values in enumerate(self._toArrays(data)):
+            array = self._arrays[col]
+            if array.dtype != object and np.result_type(array, values) != array.dtype:
+                self._arrays[col] = array = array.astype(np.result_type(array, values))
+
+            array[rows] = values
+            for row in rows:
+                self._display[col].pop(row, None)
+
+        self._dataChanged()
+
+        viewRows = np.flatnonzero(np.isin(self._order[:self._loaded], rows))
+        if len(viewRows):
+            self.dataChanged.emit(self.index(viewRows[0], 0), self.index(viewRows[-1], self.columnCount() - 1))
+
+    ###########################################################################
+    # Qt model interface
+    ###########################################################################
+
+    def rowCount(self, parent: QtCore.QModelIndex = None) -> int:
+        """Return the number of rows currently available to the view."""
+
+        if parent is not None and parent.isValid():
+            return 0
+
+        return self._loaded
+
+    def columnCount(self, parent: QtCore.QModelIndex = None) -> int:
         """Return the number of columns in the table."""
 
-        return self._data.columns.size
+        if parent is not None and parent.isValid():
+            return 0
+
+        return self._columns.size
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """Return whether there are rows not yet made available to the view."""
+
+        return not parent.isValid() and self._loaded < len(self._order)
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """Make the next batch of rows available to the view."""
+
+        if not self.canFetchMore(parent):
+            return
+
+        last = min(len(self._order), self._loaded + self.batchSize)
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, last - 1)
+        self._loaded = last
+        self.endInsertRows()
 
     def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Optional[str]:
         """Return the contents of a cell at a given index.
@@ -41,7 +294,7 @@ class PandasTableModel(QtCore.QAbstractTableModel):
 
         if index.isValid():
             if role == QtCore.Qt.DisplayRole:
-                return str(self._data.values[index.row()][index.column()])
+                return self._format(self._order[index.row()], index.column())
 
     def headerData(self, col: int, orientation: QtCore.Qt.Orientation, role: int) -> Optional[str]:
         """Return the name of a given column.
@@ -56,10 +309,33 @@ class PandasTableModel(QtCore.QAbstractTableModel):
         """
 
         if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
-            return self._data.columns[col]
+            return str(self._columns[col])
+
+    def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.AscendingOrder) -> None:
+        """Sort the table by a given column.
+
+        Args:
+            column: Index of the column to sort by, or -1 to restore the original order
+            order: The sort order
+        """
+
+        self._sortColumn = None if column < 0 else column
+        self._sortOrder = order
+        self._resetOrder()
+
+    def setFilter(self, text: str, column: Optional[int] = None) -> None:
+        """Only show rows containing the given text (case insensitive).
+
+        Args:
+            text: Text to search for. An empty string removes the filter.
+            column: Optionally only search the given column
+        """
+
+        self._filterText = text
+        self._filterColumn = column
+        self._resetOrder()
 
     def toPandas(self) -> pd.DataFrame:
         """Return data from the table view as a ``pandas.DataFrame`` object."""
 
         return self._data.copy()
-
@@ -0,0 +1,90 @@
+from typing import Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .pandasTableModel import PandasTableModel
+from ..resultsStore import INDEX_COLUMNS, emptyResults
+
+CATEGORICAL_COLUMNS = ('obj_id', 'feat_name')
+FLAG_COLUMNS = ('spec_flag', 'feat_flag')
+
+
+def compactResults(data: pd.DataFrame) -> pd.DataFrame:
+    """Return a flat copy of a results table using compact column types
+
+    Object Ids and feature names are stored as categoricals and flags as
+    nullable 8 bit integers. All other numeric columns are stored as floats.
+
+    Args:
+        data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+
+    Returns:
+        A copy of the results with the index reset to columns
+    """
+
+    data = data.reset_index().reindex(columns=list(emptyResults().reset_index().columns))
+    data['obj_id'] = data['obj_id'].astype(str)
+    for col in data.columns:
+        if col in CATEGORICAL_COLUMNS:
+            data[col] = data[col].astype('category')
+
+        elif col in FLAG_COLUMNS:
+            data[col] = pd.to_numeric(data[col]).round().astype('Int8')
+
+        elif col == 'time':
+            try:
+                data[col] = pd.to_numeric(data[col])
+
+            except (ValueError, TypeError):
+                pass  # Spectrum Ids are not always numeric
+
+        elif col != 'notes':
+            data[col] = pd.to_numeric(data[col]).astype(float)
+
+    return data
+
+
+class ResultsModel(PandasTableModel):
+    """In-memory table of saved results that can be updated incrementally
+
+    New results are appended using ``beginInsertRows`` / ``endInsertRows``
+    and existing results are updated in place with ``dataChanged``, so any
+    attached views update without reloading the full table.
+    """
+
+    def __init__(self, data: pd.DataFrame = None) -> None:
+        """Populate the model from a table of saved results
+
+        Args:
+            data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+        """
+
+        super().__init__(compactResults(emptyResults() if data is None else data))
+        indexArrays = [self._arrays[self._columns.get_loc(col)][:self._size] for col in INDEX_COLUMNS]
+        self._rows: Dict[Tuple[Hashable, ...], int] = {key: row for row, key in enumerate(zip(*indexArrays))}
+
+    def upsert(self, data: pd.DataFrame) -> None:
+        """Add new results to the model and replace existing results with the same key
+
+        Args:
+            data: Results indexed by ``['obj_id', 'time', 'feat_name']``
+        """
+
+        new = compactResults(data).drop_duplicates(subset=list(INDEX_COLUMNS), keep='last')
+        keys = list(zip(*(new[col] for col in INDEX_COLUMNS)))
+        isNew = np.array([key not in self._rows for key in keys], dtype=bool)
+
+        self._setRows([self._rows[key] for key, keep in zip(keys, isNew) if not keep], new[~isNew])
+
+        first = self._size
+        for offset, key in enumerate(key for key, keep in zip(keys, isNew) if keep):
+            self._rows[key] = first + offset
+
+        self._appendRows(new[isNew])
+
+    def toPandas(self) -> pd.DataFrame:
+        """Return the results as a ``pandas.DataFrame`` indexed by ``['obj_id', 'time', 'feat_name']``"""
+
+        data = self._data.astype({col: str for col in CATEGORICAL_COLUMNS})
+        return data.set_index(list(INDEX_COLUMNS))
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -6,6 +7,24 @@ from PyQt5 import QtCore, QtWidgets, uic
 LAYOUT_DIR = Path(__file__).resolve().parent.parent.parent / 'resources' / 'layouts'
 
 
+@lru_cache(maxsize=None)
+def loadFormClass(path: Path) -> type:
+    """Compile a UI layout file into a form class
+
+    Layouts are only parsed and compiled the first time they are requested.
+    Later calls return the same class.
+
+    Args:
+        path: Path of the ``.ui`` layout file
+
+    Returns:
+        The generated form class with a ``setupUi`` method
+    """
+
+    formClass, _ = uic.loadUiType(str(path))
+    return formClass
+
+
 class BaseWindow(QtWidgets.QMainWindow):
     """Base class for creating GUI windows
 
@@ -29,9 +48,14 @@ class BaseWindow(QtWidgets.QMainWindow):
 
         super().__init__(parent)
 
-        # Automatically load the style file
+        # Automatically build the layout using the (cached) compiled design file
         if dp := self.designPath():
-            uic.loadUi(dp, self)
+            self.ui = loadFormClass(dp)()
+            self.ui.setupUi(self)
+
+            # Expose widgets as window attributes (e.g. ``self.tableView``)
+            for name, value in vars(self.ui).items():
+                setattr(self, name, value)
 
     def designPath(self) -> Optional[Path]:
         """Path of the design file for the current window"""
@@ -3,7 +3,8 @@ from functools import partial
 from PyQt5 import QtWidgets
 
 from .baseWindow import BaseWindow
-from ..settings import SettingsLoader
+from ..settings import ApplicationSettings
+from ..settingsService import SettingsService
 
 
 class FeatureDefinitionsWindow(BaseWindow):
@@ -24,6 +25,8 @@ class FeatureDefinitionsWindow(BaseWindow):
         """
 
         super().__init__(parent)
+        self._settingsService = SettingsService.instance()
+        self._savedFeatures = self._settingsService.settings().features
 
         # Connect signals and slots for class widgets
         self.pushButtonAdd.clicked.connect(self.tableWidget.addEmptyRow)
@@ -46,6 +49,20 @@ class FeatureDefinitionsWindow(BaseWindow):
         for i in range(self.tableWidget.columnCount()):
             self.tableWidget.horizontalHeader().setSectionResizeMode(i, QtWidgets.QHeaderView.Fixed)
 
+        # Show feature definitions saved outside of this window
+        self._settingsService.settingsChanged.connect(self._updateSavedFeatures)
+
+    def _updateSavedFeatures(self, settings: ApplicationSettings) -> None:
+        """Repopulate the table if feature definitions were saved outside of this window
+
+        Args:
+            settings: The newly saved application settings
+        """
+
+        if settings.features != self._savedFeatures:
+            self._savedFeatures = settings.features
+            self.tableWidget.populateTable()
+
     def apply(self) -> bool:
         """Save changes without exiting the window.
 
@@ -54,9 +71,9 @@ class FeatureDefinitionsWindow(BaseWindow):
         """
 
         if self.tableWidget.validateTable():
-            settings = SettingsLoader()
-            settings.features = self.tableWidget.contentsToList()
-            settings.saveToDisk()
+            settings = self._settingsService.settings()
+            settings.features = self._savedFeatures = self.tableWidget.contentsToList()
+            settings.saveToDisk(self._settingsService.path)
             return True
 
         return False
@@ -71,3 +88,14 @@ class FeatureDefinitionsWindow(BaseWindow):
         """Exit the window without saving changes."""
 
         self.close()
+
+    def closeEvent(self, event) -> None:
+        """Stop following saved settings when the window closes"""
+
+        try:
+            self._settingsService.settingsChanged.disconnect(self._updateSavedFeatures)
+
+        except TypeError:  # Already disconnected by an earlier close
+            pass
+
+        super().closeEvent(event)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 
 from PyQt5.QtCore import QRegExp, Qt
 from PyQt5.QtGui import QRegExpValidator
@@ -9,8 +10,12 @@ from .featureDefinitionsWindow import FeatureDefinitionsWindow
 from .plotSettingsWindow import PlotSettingsWindow
 from .savedResultsWindow import SavedResultsWindow
 from .spectrumSelection import SpectrumSelection
-from ..settings import SettingsLoader
-from ..utils import SpectralAccessor, get_results_dataframe
+from ..resultsStore import STORE_SUFFIXES, emptyResults, openResults
+from ..resultsWriter import ResultsWriter
+from ..settings import ApplicationSettings
+from ..settingsService import SettingsService
+from ..utils import SpectralAccessor
+from ..widgets import ResultsModel
 
 
 class MainWindow(BaseWindow):
@@ -29,6 +34,8 @@ class MainWindow(BaseWindow):
         # Store init arguments as attributes
         self.dataAccess = dataAccess
         self._out_path = Path(out_path)
+        self._results = openResults(self._out_path)
+        self._writer = ResultsWriter(self._out_path)
 
         super().__init__()
         self.graphWidget.updateStyleFromDisk()
@@ -37,18 +44,27 @@ class MainWindow(BaseWindow):
         self._initFeatureTable()
         self._connectSignals()
 
-        self.current_spec_results = get_results_dataframe(self._out_path)
+        # Follow changes to settings made in other windows or on disk
+        settingsService = SettingsService.instance()
+        settingsService.settingsChanged.connect(self.graphWidget.updateStyleFromSettings)
+        settingsService.settingsChanged.connect(self._initFeatureTable)
+
+        self.results = ResultsModel(self._results.read())
+        self.current_spec_results = emptyResults()
         self.current_feat_results = None
 
         # # Plot the first spectrum / feature combination for user inspection
         self.updateGui()
 
-    def _initFeatureTable(self):
+    def _initFeatureTable(self, settings: Optional[ApplicationSettings] = None):
         """Populate the ``feature_bounds_table`` table with feature boundaries
         from the application config.
+
+        Args:
+            settings: Settings to use instead of the currently saved settings
         """
 
-        settings = SettingsLoader()
+        settings = settings or SettingsService.instance().settings()
         self.tableFeatureBounds.setRowCount(len(settings.features))
 
         col_order = ('lower_blue', 'upper_blue', 'lower_red', 'upper_red')
@@ -138,7 +154,7 @@ class MainWindow(BaseWindow):
     def openResultsWindow(self):
         """Open a window for previewing results"""
 
-        SavedResultsWindow(get_results_dataframe(self._out_path), self).show()
+        SavedResultsWindow(self.results, self).show()
 
     def openPlotSettings(self):
         """Open a window for editing plot settings"""
@@ -225,10 +241,23 @@ class MainWindow(BaseWindow):
     def save(self):
         """Logic for the ``save`` button
 
-        Save current feature measurements to internal DataFrame.
+        Save current feature measurements to the in-memory ``results`` model
+        and queue them to be written to the results store in the background.
+        Previously saved measurements of the same features are replaced.
         """
 
-        self.current_spec_results.to_csv(self._out_path, mode='a')
+        self._writer.write(self.current_spec_results)
+        self.results.upsert(self.current_spec_results)
+
+    def closeEvent(self, event) -> None:
+        """Write any queued results, export them to the output CSV file, and close the results store"""
+
+        self._writer.close()
+        if self._out_path.suffix not in STORE_SUFFIXES:
+            self._results.exportCsv(self._out_path)
+
+        self._results.close()
+        super().closeEvent(event)
 
     def next_feat(self):
         """Logic for the ``next feature`` button
@@ -1,15 +1,23 @@
-from functools import partial
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Optional, Tuple
 
+import pandas as pd
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QColorDialog, QMainWindow
-from astropy.table import Table
 
 from .baseWindow import BaseWindow
-from ..settings import ColorSettings, RESOURCES_DIR, SettingsLoader
+from ..settings import ApplicationSettings, ColorSettings, RESOURCES_DIR, SettingsLoader
+from ..settingsService import SettingsService
 
-exampleSpectrum = Table.read(RESOURCES_DIR / 'sn2005kc.ecsv').to_pandas(index='wavelength').flux
-exampleBinnedSpectrum = exampleSpectrum.spectrum.bin(10, 'median')
+
+@lru_cache
+def exampleSpectra() -> Tuple[pd.Series, pd.Series]:
+    """Return the observed and binned flux of the spectrum used to preview plot settings"""
+
+    from astropy.table import Table
+
+    exampleSpectrum = Table.read(RESOURCES_DIR / 'sn2005kc.ecsv').to_pandas(index='wavelength').flux
+    return exampleSpectrum, exampleSpectrum.spectrum.bin(10, 'median')
 
 
 class PlotSettingsWindow(BaseWindow):
@@ -29,9 +37,11 @@ class PlotSettingsWindow(BaseWindow):
         """
 
         super().__init__(parent)
-        self.settings = SettingsLoader()
+        self._settingsService = SettingsService.instance()
+        self.settings = self._settingsService.settings()
 
         # Plot demo data and update states of window widgets
+        exampleSpectrum, exampleBinnedSpectrum = exampleSpectra()
         self.graphWidget.plotObservedSpectrum(exampleSpectrum)
         self.graphWidget.plotBinnedSpectrum(exampleBinnedSpectrum)
         self.checkBoxObservedFlux.setCheckState(self.settings.plotting.show_observed_flux)
@@ -70,6 +80,19 @@ class PlotSettingsWindow(BaseWindow):
 
         self.checkBoxObservedFlux.stateChanged.connect(self._processCheckBoxChange)
 
+        # Follow settings saved from other windows so they are not overwritten when saving
+        self._settingsService.settingsChanged.connect(self._updateSavedSettings)
+
+    def _updateSavedSettings(self, settings: ApplicationSettings) -> None:
+        """Adopt newly saved settings while keeping the plot settings being edited
+
+        Args:
+            settings: The newly saved application settings
+        """
+
+        settings.plotting = self.settings.plotting
+        self.settings = settings
+
     def _updateWidgetStates(self) -> None:
         """Restore displayed settings to currently saved values"""
 
@@ -125,22 +148,33 @@ class PlotSettingsWindow(BaseWindow):
     def reset(self):
         """Reset displayed settings values to reflect package defaults"""
 
-        self.settings = SettingsLoader()
+        self.settings = self._settingsService.settings()
         self._updateWidgetStates()
 
     def restoreDefaults(self) -> None:
-        """Restore displayed settings to default values"""
+        """Restore displayed plot settings to default values"""
 
-        self.settings = SettingsLoader(True)
+        self.settings.plotting = SettingsLoader(defaults=True).plotting
         self._updateWidgetStates()
 
     def apply(self) -> None:
         """Save application settings to disk"""
 
-        self.settings.saveToDisk()
+        self.settings.saveToDisk(self._settingsService.path)
 
     def save(self) -> None:
         """Save application settings to disk and exit"""
 
         self.apply()
         self.close()
+
+    def closeEvent(self, event) -> None:
+        """Stop following saved settings when the window closes"""
+
+        try:
+            self._settingsService.settingsChanged.disconnect(self._updateSavedSettings)
+
+        except TypeError:  # Already disconnected by an earlier close
+            pass
+
+        super().closeEvent(event)
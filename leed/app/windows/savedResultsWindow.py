@@ -1,10 +1,11 @@
 from datetime import datetime
+from typing import Optional, Union
 
 import pandas as pd
 from PyQt5.QtWidgets import QMainWindow
 
 from .baseWindow import BaseWindow
-from ..widgets import PandasTableModel
+from ..widgets import PandasTableModel, ResultsModel
 
 
 class SavedResultsWindow(BaseWindow):
@@ -12,15 +13,23 @@ class SavedResultsWindow(BaseWindow):
 
     designFile = 'ResultsWindow.ui'
 
-    def __init__(self, dataframe: pd.DataFrame, parent: QMainWindow = None) -> None:
+    def __init__(self, dataframe: Union[pd.DataFrame, ResultsModel], parent: QMainWindow = None) -> None:
         """Populate window with tabular data from a ``pandas.DataFrame`` object
 
+        If given a ``ResultsModel``, the window is updated as new results are
+        added to the model.
+
         Args:
-            dataframe: ``Dataframe`` to load data from
+            dataframe: ``Dataframe`` or ``ResultsModel`` to load data from
         """
 
         super().__init__(parent)
-        self.updateTableView(dataframe)
+        self._resultsModel: Optional[ResultsModel] = None
+        if isinstance(dataframe, ResultsModel):
+            self.setModel(dataframe)
+
+        else:
+            self.updateTableView(dataframe)
 
     def updateTableView(self, data: pd.DataFrame) -> None:
         """Update contents of the table widget to reflect contents of a ``DataFrame``
@@ -29,7 +38,49 @@ class SavedResultsWindow(BaseWindow):
             data: The new table data
         """
 
+        self._disconnectModel()
         self.tableView.setModel(PandasTableModel(data))
+        self.tableView.setSortingEnabled(True)
+        self.tableView.resizeColumnsToContents()
+        self._showTimestamp('loaded')
+
+    def setModel(self, model: ResultsModel) -> None:
+        """Display results from a model and follow any results added to it
+
+        Args:
+            model: The model to display
+        """
+
+        self._disconnectModel()
+        self._resultsModel = model
+        self.tableView.setModel(model)
+        self.tableView.setSortingEnabled(True)
         self.tableView.resizeColumnsToContents()
+        model.rowsInserted.connect(self._resultsUpdated)
+        model.dataChanged.connect(self._resultsUpdated)
+        self._showTimestamp('loaded')
+
+    def _disconnectModel(self) -> None:
+        """Stop following updates to the currently displayed ``ResultsModel``"""
+
+        if self._resultsModel is not None:
+            self._resultsModel.rowsInserted.disconnect(self._resultsUpdated)
+            self._resultsModel.dataChanged.disconnect(self._resultsUpdated)
+            self._resultsModel = None
+
+    def _resultsUpdated(self, *args) -> None:
+        """Show the time results were last updated"""
+
+        self._showTimestamp('updated')
+
+    def closeEvent(self, event) -> None:
+        """Stop following the displayed model when the window closes"""
+
+        self._disconnectModel()
+        super().closeEvent(event)
+
+    def _showTimestamp(self, action: str) -> None:
+        """Show the time results were last loaded or updated in the status bar"""
+
         now = datetime.now()
-        self.statusbar.showMessage(f'Results last loaded on {now: %b %d, %Y} at {now.hour}:{now.minute}')
+        self.statusbar.showMessage(f'Results last {action} on {now: %b %d, %Y} at {now.hour}:{now.minute}')
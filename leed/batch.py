@@ -0,0 +1,309 @@
+"""Measure spectral features for an entire data set without launching the GUI.
+
+Spectra are provided by a ``SpectralAccessor`` returned from a user supplied
+factory function. Feature measurements are distributed using one of the
+executors in ``leed.executors`` and written to a CSV file using the same
+columns as results saved by the GUI.
+
+Example:
+    python -m leed.batch leed.examples.csp:get_accessor results.csv --workers 8
+"""
+
+import argparse
+import importlib
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .app.settings import FeatureDefinition, SettingsLoader
+from .app.utils import SpectralAccessor, get_results_dataframe
+from .exceptions import FeatureNotObserved, SamplingRangeError
+from .executors import Executor, LocalClusterExecutor, ProcessExecutor, SerialExecutor, ThreadExecutor
+from .sharedMemory import SharedArrayStore, SpectrumRef, resolve
+
+SpectrumTask = Tuple[str, Union[str, float, int], Union[pd.Series, SpectrumRef], Sequence[FeatureDefinition], int, str]
+
+
+def loadFactory(path: str) -> callable:
+    """Import a callable from a dotted path
+
+    Args:
+        path: Path formatted as ``package.module:function`` or ``package.module.function``
+
+    Returns:
+        The imported callable
+    """
+
+    moduleName, _, attrName = path.rpartition(':') if ':' in path else path.rpartition('.')
+    if not moduleName:
+        raise ValueError(f'Invalid factory path: {path}')
+
+    return getattr(importlib.import_module(moduleName), attrName)
+
+
+def resultColumns() -> List[str]:
+    """Return the column names used when saving results"""
+
+    results = get_results_dataframe()
+    return list(results.index.names) + list(results.columns)
+
+
+def iterSpectra(accessor: SpectralAccessor) -> Iterator[Tuple[str, Union[str, float, int], pd.Series]]:
+    """Iterate over every spectrum made available by an accessor
+
+    Args:
+        accessor: The accessor to iterate over
+
+    Yields:
+        The object Id, spectrum Id, and flux of each spectrum
+    """
+
+    while True:
+        while True:
+            specId = accessor.currentSpecId if accessor.availableSpecIds else None
+            yield accessor.currentSN, specId, accessor.spectrum
+
+            try:
+                accessor.loadNextSpectrum()
+
+            except StopIteration:
+                break
+
+        try:
+            accessor.loadNextSN()
+
+        except StopIteration:
+            return
+
+
+def measureSpectrum(task: SpectrumTask) -> List[dict]:
+    """Measure all features in a single spectrum
+
+    Features that cannot be measured are included with NaN measurements, a
+    feature flag of 1, and the reason stored in the notes.
+
+    Args:
+        task: The object Id, spectrum Id, spectrum (or shared memory reference), features, ``nstep``, and fitting method
+
+    Returns:
+        One row of results for each feature
+    """
+
+    objId, specId, spectrum, features, nstep, fitMethod = task
+    spectrum = resolve(spectrum)
+
+    rows = []
+    for feature in features:
+        row = dict(obj_id=objId, time=specId, feat_name=feature.feature_id, spec_flag=0, feat_flag=0, notes='')
+        try:
+            featStart, featEnd = spectrum.feature.guessBounds(feature)
+            row.update(feat_start=featStart, feat_end=featEnd)
+            values = spectrum.spectrum.sampleFeatureProperties(
+                featStart, featEnd, feature.restframe, nstep=nstep, fitMethod=fitMethod)
+
+        except (FeatureNotObserved, SamplingRangeError, ValueError, RuntimeError) as excep:
+            values = [np.nan] * 9
+            row.update(feat_flag=1, notes=str(excep) or type(excep).__name__)
+
+        for name, value in zip(('vel', 'vel_err', 'vel_samperr', 'pew', 'pew_err', 'pew_samperr',
+                                'area', 'area_err', 'area_samperr'), values):
+            row[name] = value
+
+        rows.append(row)
+
+    return rows
+
+
+def _writeRows(results: Iterable[List[dict]], columns: List[str], outFile) -> Iterator[pd.DataFrame]:
+    """Append measured rows to an open CSV file
+
+    Args:
+        results: Rows measured for each spectrum
+        columns: Column order of the output file
+        outFile: Open file to append rows to
+
+    Yields:
+        The rows written for each spectrum as a DataFrame
+    """
+
+    for rows in results:
+        frame = pd.DataFrame(rows, columns=columns)
+        frame.to_csv(outFile, index=False, header=False)
+        outFile.flush()
+        yield frame
+
+
+def measureAll(
+        accessor: SpectralAccessor,
+        features: Sequence[FeatureDefinition],
+        outPath: Union[str, Path],
+        executor: Optional[Executor] = None,
+        nstep: int = 5,
+        fitMethod: str = 'exact'
+) -> pd.DataFrame:
+    """Measure features in every spectrum of an accessor and write results to file
+
+    Results are written as each spectrum is finished and do not depend on
+    the executor used to measure them. Executors running tasks in other
+    processes are sent spectra through shared memory, which is freed as
+    each spectrum is finished.
+
+    Args:
+        accessor: Accessor providing the spectra to measure
+        features: Feature definitions to measure
+        outPath: CSV file to write results to
+        executor: Executor used to measure spectra (defaults to a ``SerialExecutor``)
+        nstep: Number of samples taken in each direction when resampling feature bounds
+        fitMethod: Gaussian fitting method passed to ``sampleFeatureProperties``
+
+    Returns:
+        The measured results indexed by ``['obj_id', 'time', 'feat_name']``
+    """
+
+    outPath = Path(outPath)
+    outPath.parent.mkdir(exist_ok=True, parents=True)
+    columns = resultColumns()
+    features = list(features)
+
+    executor = executor or SerialExecutor()
+    store = SharedArrayStore() if executor.usesProcesses else None
+    inFlight = deque()
+
+    def tasks() -> Iterator[SpectrumTask]:
+        for objId, specId, spectrum in iterSpectra(accessor):
+            if store is not None:
+                spectrum = store.putSeries(spectrum)
+                inFlight.append(spectrum)
+
+            yield objId, specId, spectrum, features, nstep, fitMethod
+
+    def results() -> Iterator[List[dict]]:
+        for rows in executor.imap(measureSpectrum, tasks()):
+            if store is not None:
+                store.release(inFlight.popleft())
+
+            yield rows
+
+    try:
+        with outPath.open('w', newline='') as outFile:
+            pd.DataFrame(columns=columns).to_csv(outFile, index=False)
+            frames = list(_writeRows(results(), columns, outFile))
+
+    finally:
+        if store is not None:
+            store.close()
+
+    data = pd.concat(frames) if frames else pd.DataFrame(columns=columns)
+    return data.set_index(['obj_id', 'time', 'feat_name'])
+
+
+def _loadObject(args: Tuple[callable, str]) -> Tuple[str, pd.DataFrame]:
+    """Load data for a single object using an access function"""
+
+    accessFunc, objId = args
+    return objId, accessFunc(objId)
+
+
+def preprocessAll(
+        accessFunc: callable, objectIds: Iterable[str], executor: Optional[Executor] = None
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Load and pre-process data for many objects in parallel
+
+    Args:
+        accessFunc: Function returning pre-processed data for a given object Id
+        objectIds: Ids of the objects to load
+        executor: Executor used to load objects (defaults to a ``SerialExecutor``)
+
+    Yields:
+        The object Id and data of each object, in the same order as ``objectIds``
+    """
+
+    executor = executor or SerialExecutor()
+    yield from executor.imap(_loadObject, ((accessFunc, objId) for objId in objectIds))
+
+
+def buildExecutor(kind: str, workers: int = 1, chunksize: int = 1, nodes: int = 1) -> Executor:
+    """Create an executor by name
+
+    Args:
+        kind: Either 'serial', 'thread', 'process', or 'cluster'
+        workers: Number of workers (per node for 'cluster')
+        chunksize: Default number of inputs evaluated by each task
+        nodes: Number of nodes for 'cluster'
+
+    Returns:
+        A new executor instance
+
+    Raises:
+        ValueError: For an unknown executor type
+    """
+
+    if kind == 'serial':
+        return SerialExecutor(chunksize)
+
+    elif kind == 'thread':
+        return ThreadExecutor(workers, chunksize)
+
+    elif kind == 'process':
+        return ProcessExecutor(workers, chunksize)
+
+    elif kind == 'cluster':
+        return LocalClusterExecutor(nodes, workers, chunksize)
+
+    raise ValueError(f'Unknown executor {kind}')
+
+
+def enabledFeatures(featureIds: Optional[Sequence[str]] = None) -> List[FeatureDefinition]:
+    """Return feature definitions enabled in the application settings
+
+    Args:
+        featureIds: Optionally only return features with the given Ids
+
+    Returns:
+        A list of feature definitions
+    """
+
+    features = [f for f in SettingsLoader().features if f.enabled]
+    if featureIds:
+        unknown = set(featureIds) - {f.feature_id for f in features}
+        if unknown:
+            raise ValueError(f'Unknown or disabled features: {sorted(unknown)}')
+
+        features = [f for f in features if f.feature_id in featureIds]
+
+    return features
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse command line arguments and measure the requested data set"""
+
+    settings = SettingsLoader()
+    parser = argparse.ArgumentParser(prog='python -m leed.batch', description=__doc__.splitlines()[0])
+    parser.add_argument('factory', help='Callable returning a SpectralAccessor, e.g. leed.examples.csp:get_accessor')
+    parser.add_argument('out_path', type=Path, help='CSV file to write results to')
+    parser.add_argument('--workers', type=int, default=1, help='Number of workers (per node for a cluster)')
+    parser.add_argument('--executor', choices=('serial', 'thread', 'process', 'cluster'),
+                        help='How to distribute work (default: process if more than one worker, otherwise serial)')
+    parser.add_argument('--nodes', type=int, default=2, help='Number of nodes when using a cluster executor')
+    parser.add_argument('--chunksize', type=int, default=1, help='Number of spectra measured per task')
+    parser.add_argument('--features', nargs='+', help='Ids of enabled features to measure (default: all enabled)')
+    parser.add_argument('--nstep', type=int, default=settings.prepare.nstep, help='Resampling steps in each direction')
+    parser.add_argument('--fit-method', default=settings.prepare.fit_method, choices=('exact', 'fast', 'refine'))
+    args = parser.parse_args(argv)
+
+    kind = args.executor or ('process' if args.workers > 1 else 'serial')
+    accessor = loadFactory(args.factory)()
+    try:
+        with buildExecutor(kind, args.workers, args.chunksize, args.nodes) as executor:
+            features = enabledFeatures(args.features)
+            measureAll(accessor, features, args.out_path, executor, args.nstep, args.fit_method)
+
+    finally:
+        accessor.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 """Launch the LEED app for CSP DR1 spectra of confirmed SNe Ia."""
 
+from functools import lru_cache
 from typing import Dict, Tuple
 
 import numpy as np
@@ -9,6 +10,7 @@ from sndata.utils import convert_to_jd, hourangle_to_degrees
 
 from ..app.utils import SpectralAccessor
 from ..accessors import spectrumAccessor
+from ..accessors.spectrumAccessor import DUSTMAP
 
 # Make sure data is downloaded to the local machine
 dr1 = DR1()
@@ -25,6 +27,8 @@ csp_table_3 = dr3.load_table(3).to_pandas(index='SN')
 min_phase = -15
 max_phase = 15
 
+ra_dec_col_names = ['RAh', 'RAm', 'RAs', 'DE-', 'DEd', 'DEm', 'DEs']
+
 
 def get_csp_t0(obj_id: str) -> float:
     """Get the t0 value of a CSP observed SN
@@ -62,10 +66,23 @@ def get_csp_ra_dec(obj_id: str) -> Tuple[float, float]:
         The RA and Dec of the SN in degrees
     """
 
-    ra_dec_col_names = ['RAh', 'RAm', 'RAs', 'DE-', 'DEd', 'DEm', 'DEs']
     return hourangle_to_degrees(*csp_table_1.loc[obj_id][ra_dec_col_names])
 
 
+@lru_cache(maxsize=None)
+def get_csp_ebv() -> pd.Series:
+    """Get the Milky Way E(B-V) of every SN in the CSP coordinate table
+
+    Values are looked up from the dust map in a single vectorized pass.
+
+    Returns:
+        E(B-V) values indexed by object identifier
+    """
+
+    coords = np.array([hourangle_to_degrees(*row) for row in csp_table_1[ra_dec_col_names].itertuples(index=False)])
+    return pd.Series(DUSTMAP.ebv(coords[:, 0], coords[:, 1]), index=csp_table_1.index)
+
+
 def get_csp_meta(obj_id: str) -> Dict[str, float]:
     """Get object meta data published by CSP for a given SN
 
@@ -80,10 +97,10 @@ def get_csp_meta(obj_id: str) -> Dict[str, float]:
     """
 
     ra, dec = get_csp_ra_dec(obj_id)
-    return dict(t0=get_csp_t0(obj_id), ra=ra, dec=dec)
+    return dict(t0=get_csp_t0(obj_id), ra=ra, dec=dec, ebv=get_csp_ebv()[obj_id])
 
 
-def pre_process(spectral_data: pd.DataFrame, t0: float, ra: float, dec: float) -> pd.DataFrame:
+def pre_process(spectral_data: pd.DataFrame, t0: float, ra: float, dec: float, ebv: float = None) -> pd.DataFrame:
     """Format data tables for use with the LEED app
 
     Changes:
@@ -95,6 +112,7 @@ def pre_process(spectral_data: pd.DataFrame, t0: float, ra: float, dec: float) -
         t0: Time of the peak B-band maximum brightness for the given SN
         ra: Right ascension of the SN
         dec: Declination of the Sn
+        ebv: Optional precomputed Milky Way E(B-V) of the SN
 
     Returns:
         A modified copy of the input dataframe
@@ -102,7 +120,7 @@ def pre_process(spectral_data: pd.DataFrame, t0: float, ra: float, dec: float) -
 
     phase = spectral_data['time'] - t0
     spectral_data = spectral_data[(min_phase <= phase) & (phase <= max_phase)]
-    spectral_data.flux = spectral_data.flux.spectrum.correctExtinction(ra, dec)
+    spectral_data.flux = spectral_data.flux.spectrum.correctExtinction(ra, dec, ebv=ebv)
 
     return spectral_data
 
@@ -129,6 +147,16 @@ def get_data(obj_id: str) -> pd.DataFrame:
     return pre_process(dr1.get_data_for_id(obj_id).to_pandas('wavelength'), **object_meta_data)
 
 
+def get_accessor() -> SpectralAccessor:
+    """Return an accessor for all available spectra
+
+    Returns:
+        A ``SpectralAccessor`` instance grouping spectra by observation time
+    """
+
+    return SpectralAccessor(get_data, dr1.get_available_ids(), 'time')
+
+
 def run_csp_dr1(out_path: str) -> None:
     """Run the LEED application on CSP DR1 spectra
 
@@ -137,5 +165,4 @@ def run_csp_dr1(out_path: str) -> None:
     """
 
     from ..app import run
-    accessor = SpectralAccessor(get_data, dr1.get_available_ids(), 'time')
-    run(accessor, out_path)
+    run(get_accessor(), out_path)
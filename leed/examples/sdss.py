@@ -115,6 +115,16 @@ def get_data(obj_id: str) -> pd.DataFrame:
     return pre_process(sako_18_spec.get_data_for_id(obj_id).to_pandas(), **object_meta_data)
 
 
+def get_accessor() -> SpectralAccessor:
+    """Return an accessor for all available spectra
+
+    Returns:
+        A ``SpectralAccessor`` instance grouping spectra by observation time
+    """
+
+    return SpectralAccessor(get_data, sako_18_spec.get_available_ids(), 'time')
+
+
 def run_sdss(out_path: str) -> None:
     """Run the LEED application on SDSS spectra
 
@@ -123,5 +133,4 @@ def run_sdss(out_path: str) -> None:
     """
 
     from ..app import run
-    accessor = SpectralAccessor(get_data, sako_18_spec.get_available_ids(), 'time')
-    run(accessor, out_path)
+    run(get_accessor(), out_path)
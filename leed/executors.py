@@ -0,0 +1,251 @@
+"""Executors used to distribute embarrassingly parallel spectral computations.
+
+Every executor exposes the same ``map`` / ``imap`` interface. Inputs are
+grouped into chunks that are evaluated as individual tasks, and results are
+always returned in the same order as the inputs, regardless of the executor
+or the order in which tasks finish.
+"""
+
+from __future__ import annotations
+
+import abc
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+def _chunked(iterable: Iterable, chunksize: int) -> Iterator[List]:
+    """Split an iterable into lists of a given length
+
+    Args:
+        iterable: The iterable to split
+        chunksize: Number of elements per chunk (the last chunk may be shorter)
+
+    Yields:
+        Lists of consecutive elements
+    """
+
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def _applyChunk(func: callable, chunk: List) -> List:
+    """Apply a function to each element of a chunk
+
+    Defined at the module level so chunks can be sent to worker processes.
+    """
+
+    return [func(item) for item in chunk]
+
+
+class Executor(abc.ABC):
+    """Base class for executors evaluating functions over iterables
+
+    Attributes:
+        usesProcesses: Whether tasks run in other processes, in which case
+            large arrays should be sent using ``leed.sharedMemory``
+    """
+
+    usesProcesses = False
+
+    def __init__(self, workers: int = 1, chunksize: int = 1) -> None:
+        """Set the default degree of parallelism and chunk size
+
+        Args:
+            workers: Number of tasks that can run at the same time
+            chunksize: Default number of inputs evaluated by each task
+        """
+
+        if workers < 1 or chunksize < 1:
+            raise ValueError('Number of workers and chunk size must be positive')
+
+        self.workers = workers
+        self.chunksize = chunksize
+
+    @abc.abstractmethod
+    def submit(self, func: callable, *args: Any) -> Future:
+        """Schedule a function call and return a ``Future`` for its result"""
+
+    def shutdown(self) -> None:
+        """Release any resources held by the executor"""
+
+    def imap(self, func: callable, iterable: Iterable, chunksize: Optional[int] = None) -> Iterator:
+        """Lazily apply a function to every element of an iterable
+
+        Only a limited number of chunks are submitted ahead of the results
+        being consumed, so arbitrarily long iterables can be processed with
+        bounded memory.
+
+        Args:
+            func: Function to apply. Must be picklable for process based executors.
+            iterable: Inputs to the function
+            chunksize: Number of inputs evaluated per task (defaults to ``self.chunksize``)
+
+        Yields:
+            Results in the same order as the inputs
+        """
+
+        pending = deque()
+        for chunk in _chunked(iterable, chunksize or self.chunksize):
+            pending.append(self.submit(_applyChunk, func, chunk))
+            if len(pending) >= 2 * self.workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+    def map(self, func: callable, iterable: Iterable, chunksize: Optional[int] = None) -> List:
+        """Apply a function to every element of an iterable
+
+        Args:
+            func: Function to apply. Must be picklable for process based executors.
+            iterable: Inputs to the function
+            chunksize: Number of inputs evaluated per task (defaults to ``self.chunksize``)
+
+        Returns:
+            A list of results in the same order as the inputs
+        """
+
+        return list(self.imap(func, iterable, chunksize))
+
+    def __enter__(self) -> Executor:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+
+class SerialExecutor(Executor):
+    """Evaluate tasks one at a time in the calling thread"""
+
+    def __init__(self, chunksize: int = 1) -> None:
+        """Set the default chunk size
+
+        Args:
+            chunksize: Default number of inputs evaluated by each task
+        """
+
+        super().__init__(1, chunksize)
+
+    def submit(self, func: callable, *args: Any) -> Future:
+        """Evaluate a function call immediately and return a completed ``Future``"""
+
+        future = Future()
+        try:
+            future.set_result(func(*args))
+
+        except Exception as excep:
+            future.set_exception(excep)
+
+        return future
+
+
+class _PoolExecutor(Executor):
+    """Base class for executors wrapping a ``concurrent.futures`` pool"""
+
+    poolType = None
+
+    def __init__(self, workers: int = 1, chunksize: int = 1) -> None:
+        """Start a pool of workers
+
+        Args:
+            workers: Number of workers in the pool
+            chunksize: Default number of inputs evaluated by each task
+        """
+
+        super().__init__(workers, chunksize)
+        self._pool = self.poolType(max_workers=workers)
+
+    def submit(self, func: callable, *args: Any) -> Future:
+        """Submit a function call to the pool"""
+
+        return self._pool.submit(func, *args)
+
+    def shutdown(self) -> None:
+        """Wait for running tasks and stop the pool"""
+
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ThreadExecutor(_PoolExecutor):
+    """Evaluate tasks on a pool of threads in the current process"""
+
+    poolType = ThreadPoolExecutor
+
+
+class ProcessExecutor(_PoolExecutor):
+    """Evaluate tasks on a pool of worker processes"""
+
+    poolType = ProcessPoolExecutor
+    usesProcesses = True
+
+
+class LocalScheduler:
+    """Stand-in for a cluster scheduler that runs each node as a local process pool
+
+    Tasks are assigned to the node with the fewest unfinished tasks. The
+    scheduler only relies on ``submit`` and ``shutdown``, so a scheduler for
+    a real multi-node cluster can be substituted with the same interface.
+    """
+
+    def __init__(self, nodes: int = 2, workersPerNode: int = 1) -> None:
+        """Start a process pool for every node
+
+        Args:
+            nodes: Number of nodes
+            workersPerNode: Number of worker processes on each node
+        """
+
+        self.workersPerNode = workersPerNode
+        self.nodes = [ProcessPoolExecutor(max_workers=workersPerNode) for _ in range(nodes)]
+        self._pending = [set() for _ in range(nodes)]
+
+    def submit(self, func: callable, *args: Any) -> Future:
+        """Submit a function call to the least busy node"""
+
+        node = min(range(len(self.nodes)), key=lambda i: len(self._pending[i]))
+        future = self.nodes[node].submit(func, *args)
+        self._pending[node].add(future)
+        future.add_done_callback(self._pending[node].discard)
+        return future
+
+    def shutdown(self) -> None:
+        """Stop every node"""
+
+        for node in self.nodes:
+            node.shutdown(wait=True, cancel_futures=True)
+
+
+class LocalClusterExecutor(Executor):
+    """Evaluate tasks on multiple nodes managed by a scheduler"""
+
+    usesProcesses = True
+
+    def __init__(
+            self, nodes: int = 2, workersPerNode: int = 1, chunksize: int = 1, scheduler: Optional[LocalScheduler] = None
+    ) -> None:
+        """Connect to a scheduler
+
+        Args:
+            nodes: Number of nodes to start when no scheduler is given
+            workersPerNode: Number of workers per node when no scheduler is given
+            chunksize: Default number of inputs evaluated by each task
+            scheduler: An existing scheduler to submit tasks to
+        """
+
+        self._ownsScheduler = scheduler is None
+        self.scheduler = scheduler or LocalScheduler(nodes, workersPerNode)
+        super().__init__(len(self.scheduler.nodes) * self.scheduler.workersPerNode, chunksize)
+
+    def submit(self, func: callable, *args: Any) -> Future:
+        """Submit a function call to the scheduler"""
+
+        return self.scheduler.submit(func, *args)
+
+    def shutdown(self) -> None:
+        """Stop the scheduler if it was started by this executor"""
+
+        if self._ownsScheduler:
+            self.scheduler.shutdown()
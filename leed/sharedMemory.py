@@ -0,0 +1,277 @@
+"""Zero-copy transport of spectral arrays to worker processes.
+
+Arrays are packed into ``multiprocessing.shared_memory`` blocks owned by a
+``SharedArrayStore`` in the parent process. Only lightweight references
+(block name, byte offset, dtype, and length) are sent to workers, which map
+the same memory and rebuild the arrays without copying them.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALIGNMENT = 64  # Byte alignment of arrays within a block
+
+# Blocks mapped by the current process, keyed by name
+_attached: Dict[str, shared_memory.SharedMemory] = dict()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Map a shared memory block into the current process
+
+    Blocks stay mapped while any array built from them is alive, so
+    consecutive tasks using the same block only map it once. Blocks without
+    live arrays are unmapped when a new block is mapped.
+
+    Args:
+        name: Name of the shared memory block
+
+    Returns:
+        The mapped shared memory block
+    """
+
+    if name not in _attached:
+        for other in list(_attached):
+            try:
+                _attached[other].close()
+
+            except BufferError:  # Arrays backed by the block are still in use
+                continue
+
+            del _attached[other]
+
+        _attached[name] = shared_memory.SharedMemory(name=name)
+
+    return _attached[name]
+
+
+@dataclass(frozen=True)
+class ArrayRef:
+    """Location of a one dimensional array within a shared memory block"""
+
+    block: str
+    offset: int
+    dtype: str
+    length: int
+
+    def resolve(self) -> np.array:
+        """Return a read-only array backed by the shared memory block"""
+
+        if self.length == 0:
+            return np.empty(0, dtype=self.dtype)
+
+        buffer = _attach(self.block).buf
+        array = np.ndarray((self.length,), dtype=self.dtype, buffer=buffer, offset=self.offset)
+        array.flags.writeable = False
+        return array
+
+
+@dataclass(frozen=True)
+class SpectrumRef:
+    """References to the arrays of a spectrum held in shared memory"""
+
+    wave: ArrayRef
+    flux: ArrayRef
+    error: Optional[ArrayRef] = None
+
+    def toSpectrum(self) -> 'Spectrum':
+        """Rebuild the spectrum as a ``Spectrum`` without copying data"""
+
+        # Imported here to avoid a circular import with the accessors
+        from .accessors.spectrum import Spectrum
+
+        error = None if self.error is None else self.error.resolve()
+        return Spectrum(self.wave.resolve(), self.flux.resolve(), error, validate=False)
+
+    def toSeries(self) -> pd.Series:
+        """Rebuild the flux as a ``Series`` indexed by wavelength without copying data"""
+
+        return pd.Series(self.flux.resolve(), index=pd.Index(self.wave.resolve(), copy=False), copy=False)
+
+    def refs(self) -> Tuple[ArrayRef, ...]:
+        """Return the references to all arrays of the spectrum"""
+
+        return tuple(ref for ref in (self.wave, self.flux, self.error) if ref is not None)
+
+
+def resolve(value: Any) -> Any:
+    """Rebuild shared memory references, leaving other values unchanged
+
+    Args:
+        value: An ``ArrayRef``, ``SpectrumRef``, or any other object
+
+    Returns:
+        An array for an ``ArrayRef``, a ``Series`` for a ``SpectrumRef``, otherwise the value itself
+    """
+
+    if isinstance(value, ArrayRef):
+        return value.resolve()
+
+    if isinstance(value, SpectrumRef):
+        return value.toSeries()
+
+    return value
+
+
+class SharedArrayStore:
+    """Packs arrays into shared memory blocks owned by the current process
+
+    Arrays are appended to the current block until it is full, at which
+    point a new block is started. Arrays larger than the block size are given
+    a dedicated block. Each reference holds a count on its block, and full
+    blocks are freed once every reference to them has been released.
+    """
+
+    def __init__(self, blockSize: int = 16 * 2 ** 20) -> None:
+        """Create an empty store
+
+        Args:
+            blockSize: Size of each shared memory block in bytes
+        """
+
+        self.blockSize = blockSize
+        self._blocks: Dict[str, shared_memory.SharedMemory] = dict()
+        self._refCounts: Dict[str, int] = dict()
+        self._current: Optional[shared_memory.SharedMemory] = None
+        self._position = 0
+
+    @property
+    def blocks(self) -> List[str]:
+        """Names of the shared memory blocks currently owned by the store"""
+
+        return list(self._blocks)
+
+    def _newBlock(self, size: int) -> shared_memory.SharedMemory:
+        """Allocate a new shared memory block"""
+
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self._blocks[block.name] = block
+        self._refCounts[block.name] = 0
+        return block
+
+    def put(self, array: np.array) -> ArrayRef:
+        """Copy a one dimensional array into shared memory
+
+        Args:
+            array: The array to share
+
+        Returns:
+            A reference that can be resolved in other processes
+        """
+
+        array = np.ascontiguousarray(array)
+        if array.ndim != 1 or array.dtype.hasobject:
+            raise ValueError('Only one dimensional arrays of numeric values can be shared')
+
+        nbytes = array.nbytes
+        offset = -(-self._position // ALIGNMENT) * ALIGNMENT
+        if nbytes > self.blockSize:
+            block, offset = self._newBlock(max(nbytes, 1)), 0
+
+        else:
+            if self._current is None or offset + nbytes > self.blockSize:
+                self._retireCurrent()
+                self._current, offset = self._newBlock(self.blockSize), 0
+
+            block = self._current
+            self._position = offset + nbytes
+
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)[:] = array
+        self._refCounts[block.name] += 1
+        return ArrayRef(block.name, offset, array.dtype.str, len(array))
+
+    def putSpectrum(self, wave: np.array, flux: np.array, error: Optional[np.array] = None) -> SpectrumRef:
+        """Copy the arrays of a spectrum into shared memory
+
+        Args:
+            wave: Wavelength values
+            flux: Flux values
+            error: Optional flux errors
+
+        Returns:
+            References to the shared arrays
+        """
+
+        return SpectrumRef(self.put(wave), self.put(flux), None if error is None else self.put(error))
+
+    def putSeries(self, series: pd.Series) -> SpectrumRef:
+        """Copy a ``Series`` indexed by wavelength into shared memory
+
+        Args:
+            series: Flux values indexed by wavelength
+
+        Returns:
+            References to the shared arrays
+        """
+
+        return self.putSpectrum(series.index.values, series.values)
+
+    def release(self, ref: Any) -> None:
+        """Release a reference returned by the store
+
+        Args:
+            ref: An ``ArrayRef`` or ``SpectrumRef``
+        """
+
+        for arrayRef in (ref.refs() if isinstance(ref, SpectrumRef) else (ref,)):
+            self._refCounts[arrayRef.block] -= 1
+            self._freeIfUnused(arrayRef.block)
+
+    def _retireCurrent(self) -> None:
+        """Stop writing to the current block so it can be freed when unused"""
+
+        if self._current is not None:
+            name, self._current, self._position = self._current.name, None, 0
+            self._freeIfUnused(name)
+
+    def _freeIfUnused(self, name: str) -> None:
+        """Free a block that is no longer written to and has no references"""
+
+        if self._refCounts.get(name) == 0 and (self._current is None or self._current.name != name):
+            block = self._blocks.pop(name)
+            del self._refCounts[name]
+            block.close()
+            block.unlink()
+
+    def close(self) -> None:
+        """Free all blocks owned by the store"""
+
+        self._current = None
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+
+        self._blocks.clear()
+        self._refCounts.clear()
+
+    def __enter__(self) -> SharedArrayStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+@contextmanager
+def shareArrays(enabled: bool, *arrays: Optional[np.array]) -> Iterator[Tuple[Any, ...]]:
+    """Place arrays in shared memory for the duration of a context
+
+    Args:
+        enabled: Whether to use shared memory. Arrays are yielded unchanged if ``False``.
+        *arrays: Arrays to share. ``None`` values are passed through unchanged.
+
+    Yields:
+        An ``ArrayRef`` (or the original value) for each array
+    """
+
+    if not enabled:
+        yield arrays
+        return
+
+    with SharedArrayStore(max(1, sum(a.nbytes + ALIGNMENT for a in arrays if a is not None))) as store:
+        yield tuple(None if a is None else store.put(a) for a in arrays)
@@ -3,7 +3,8 @@ from unittest import TestCase
 import numpy as np
 import pandas as pd
 
-from leed.accessors.base import Base
+import leed
+from leed.accessors.base import Base, SpectralArrays
 
 
 class AttributeGetters(TestCase):
@@ -34,3 +35,40 @@ class Validation(TestCase):
 
         with self.assertRaises(ValueError):
             Base(pd.Series([1, 2, 3], index=[3, 2, 1])).validate()
+
+
+class CoreSpectrum(TestCase):
+    """Tests for the array backed ``core`` attribute"""
+
+    def testSharesMemory(self) -> None:
+        """Test the core spectrum does not copy the series data"""
+
+        series = pd.Series(np.arange(10, 20, dtype=float))
+        self.assertTrue(np.shares_memory(series.values, Base(series).core.flux))
+
+    def testReplacedIndex(self) -> None:
+        """Test the core spectrum reflects changes to the series index"""
+
+        series = pd.Series(np.arange(10, 20, dtype=float))
+        series.spectrum.core
+        series.index = np.arange(100, 110)
+        np.testing.assert_array_equal(series.index.values, series.spectrum.core.wave)
+
+    def testUnsortedError(self) -> None:
+        """Test a ValueError is raised when building the core of an unsorted series"""
+
+        with self.assertRaises(ValueError):
+            Base(pd.Series([1, 2, 3], index=[3, 2, 1])).core
+
+
+class AbstractInterface(TestCase):
+    """Tests for the abstract ``SpectralArrays`` interface"""
+
+    def testMissingLikeError(self) -> None:
+        """Test a TypeError is raised when instantiating a subclass without ``_like``"""
+
+        class Incomplete(SpectralArrays):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
@@ -78,3 +78,130 @@ class Velocity(TestCase):
         np.testing.assert_almost_equal(
             expected, self.flux.feature.velocity(self.lambdaRestFrame),
             err_msg='Fitted velocity not close to simulated velocity')
+
+
+class FitGaussianLinearized(TestCase):
+    """Tests for the closed form fitting of a gaussian to spectral data"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Simulate gaussian feature"""
+
+        cls.wave = np.arange(1000, 2000)
+        cls.avg = 1400
+        cls.stdDev = 100
+        cls.depth = -1.5
+        cls.offset = 100
+        cls.spectrum = simulate.gaussian(
+            cls.wave, mean=cls.avg, stddev=cls.stdDev, depth=cls.depth, offset=cls.offset)
+
+    def testRecoveredParameters(self) -> None:
+        """Test the fit recovers the simulated parameters"""
+
+        gaussianFit = self.spectrum.feature._fitGaussian('fast')
+        np.testing.assert_allclose(
+            [-self.depth, self.avg, self.stdDev, self.offset], gaussianFit.params, rtol=1e-6)
+
+    def testBatchedSamples(self) -> None:
+        """Test masked samples are fit independently"""
+
+        mask = np.zeros((2, len(self.wave)), dtype=bool)
+        mask[0, 100:900] = True
+        mask[1, 200:700] = True
+
+        gaussianFit = self.spectrum.feature.fitGaussianLinearized(self.wave, self.spectrum.values, mask)
+        for i in range(len(mask)):
+            sample = self.spectrum[mask[i]]
+            np.testing.assert_allclose(sample.feature._fitGaussian('fast').avg, gaussianFit.avg[i])
+
+    def testFlatSpectrumFails(self) -> None:
+        """Test ``np.nan`` values are returned when fitting a spectrum with no feature"""
+
+        flux = np.full_like(self.wave, 10, dtype=float)
+        gaussianFit = self.spectrum.feature.fitGaussianLinearized(self.wave, flux)
+        self.assertTrue(np.isnan(gaussianFit.avg[0]))
+        self.assertFalse(gaussianFit.isPlausible(self.wave[0], self.wave[-1])[0])
+
+    def testPlausibleFit(self) -> None:
+        """Test fits are only plausible when centered within, and narrower than, the fitted range"""
+
+        gaussianFit = self.spectrum.feature._fitGaussian('fast')
+        self.assertTrue(gaussianFit.isPlausible(self.wave[0], self.wave[-1]))
+        self.assertFalse(gaussianFit.isPlausible(self.avg + 1, self.wave[-1]))
+        self.assertFalse(gaussianFit.isPlausible(self.avg - 40, self.avg + 40))
+
+    def testFailedFitFallsBack(self) -> None:
+        """Test ``_fitGaussian`` falls back to ``curve_fit`` when the closed form fit fails"""
+
+        flux = self.spectrum.copy()
+        flux.iloc[-1] = 1e3  # A single bright pixel skews the offset estimated by the closed form fit
+        linearized = flux.feature.fitGaussianLinearized(self.wave, flux.values)[0]
+        self.assertFalse(linearized.isPlausible(self.wave[0], self.wave[-1]))
+        np.testing.assert_allclose(flux.feature._fitGaussian('exact').params, flux.feature._fitGaussian('fast').params)
+
+    def testRefinedFit(self) -> None:
+        """Test refining the closed form fit recovers the simulated parameters"""
+
+        gaussianFit = self.spectrum.feature._fitGaussian('refine')
+        np.testing.assert_allclose(
+            [-self.depth, self.avg, self.stdDev, self.offset], gaussianFit.params)
+
+    def testUnknownMethod(self) -> None:
+        """Test a ValueError error is raised for an unknown fitting method"""
+
+        with self.assertRaises(ValueError):
+            self.spectrum.feature.velocity(self.avg, method='made up method')
+
+
+class GaussianJacobian(TestCase):
+    """Tests for the analytic jacobian of the gaussian model"""
+
+    def runTest(self) -> None:
+        """Test the analytic jacobian matches finite differences"""
+
+        x = np.linspace(1000, 2000, 50)
+        params = np.array([1.5, 1400., 100., 10.])
+        step = 1e-6 * np.maximum(np.abs(params), 1)
+
+        gaussian = leed.FeatureAccessor.gaussian
+        expected = np.empty((len(x), len(params)))
+        for i in range(len(params)):
+            upper, lower = params.copy(), params.copy()
+            upper[i] += step[i]
+            lower[i] -= step[i]
+            expected[:, i] = (gaussian(x, *upper) - gaussian(x, *lower)) / (2 * step[i])
+
+        np.testing.assert_allclose(expected, leed.FeatureAccessor.gaussianJacobian(x, *params), atol=1e-8)
+
+
+class WarmStartedFit(TestCase):
+    """Tests for seeding a gaussian fit with a previous fit result"""
+
+    def runTest(self) -> None:
+        """Test a warm started fit recovers the same parameters as a cold start"""
+
+        wave = np.arange(1000, 2000)
+        spectrum = simulate.gaussian(wave, mean=1400, stddev=100, depth=-1.5, offset=100)
+        coldFit = spectrum.feature.fitGaussian(wave, spectrum.values)
+        warmFit = spectrum.feature.fitGaussian(wave[5:-5], spectrum.values[5:-5], coldFit)
+        np.testing.assert_allclose(coldFit.params, warmFit.params)
+
+
+class RefineGaussianBatch(TestCase):
+    """Tests for refining closed form fits of many flux realizations at once"""
+
+    def runTest(self) -> None:
+        """Test batched fits of noisy realizations match individual ``curve_fit`` fits"""
+
+        wave = np.arange(1000, 2000, dtype=float)
+        flux = simulate.gaussian(wave, mean=1400, stddev=100, depth=-1.5, offset=100).values
+        draws = flux + np.random.default_rng(0).normal(0, .05, (20, len(wave)))
+
+        linearized = leed.FeatureAccessor.fitGaussianLinearized(wave, draws)
+        refined, converged = leed.FeatureAccessor.refineGaussianBatch(wave, draws, linearized)
+        self.assertTrue(converged.all())
+
+        for i, realization in enumerate(draws):
+            exactFit = leed.FeatureAccessor.fitGaussian(wave, realization)
+            np.testing.assert_allclose(exactFit.params, refined[i].params, rtol=1e-5)
+            np.testing.assert_allclose(exactFit.avgErr, refined[i].avgErr, rtol=1e-3)
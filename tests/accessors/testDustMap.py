@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+from astropy.io import fits
+
+from leed.accessors import dustMap as dustMapModule
+from leed.accessors.dustMap import DustMap, toGalactic
+
+
+def writeMockMap(directory: Path) -> None:
+    """Write small random maps for both galactic hemispheres"""
+
+    rng = np.random.default_rng(0)
+    for fileName, sign in (('SFD_dust_4096_ngp.fits', 1), ('SFD_dust_4096_sgp.fits', -1)):
+        header = fits.Header()
+        header['CRPIX1'] = header['CRPIX2'] = 33
+        header['LAM_SCAL'] = 30.
+        header['LAM_NSGP'] = sign
+        data = rng.uniform(0, 1, (64, 64)).astype('>f4')
+        fits.PrimaryHDU(data, header).writeto(directory / fileName)
+
+
+class GalacticConversion(TestCase):
+    """Tests for the conversion of celestial to galactic coordinates"""
+
+    def testMatchesAstropy(self) -> None:
+        """Test converted coordinates match ``astropy.coordinates``"""
+
+        rng = np.random.default_rng(1)
+        ra, dec = rng.uniform(0, 360, 50), rng.uniform(-89, 89, 50)
+        expected = SkyCoord(ra * u.deg, dec * u.deg, frame='fk5').galactic
+
+        l, b = toGalactic(np.deg2rad(ra), np.deg2rad(dec), 'fk5j2000')
+        np.testing.assert_allclose(expected.b.radian, b, atol=1e-8)
+        np.testing.assert_allclose(np.cos(expected.l.radian), np.cos(l), atol=1e-8)
+        np.testing.assert_allclose(np.sin(expected.l.radian), np.sin(l), atol=1e-8)
+
+    def testUnknownFrame(self) -> None:
+        """Test a ValueError is raised for an unknown coordinate frame"""
+
+        with self.assertRaises(ValueError):
+            toGalactic(0, 0, 'made up frame')
+
+
+class DustMapLookup(TestCase):
+    """Tests for E(B-V) lookups from a mock dust map"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tempDir = TemporaryDirectory()
+        writeMockMap(Path(cls.tempDir.name))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tempDir.cleanup()
+
+    def setUp(self) -> None:
+        self.dustMap = DustMap(self.tempDir.name)
+
+    def testFilesOpenedLazily(self) -> None:
+        """Test hemispheres are only opened when a coordinate falls inside them"""
+
+        self.assertEqual(dict(), self.dustMap._hemispheres)
+        self.dustMap.ebv(0, 90, frame='galactic')
+        self.assertEqual([1], list(self.dustMap._hemispheres))
+
+    def testGalacticPole(self) -> None:
+        """Test the galactic pole maps onto the reference pixel"""
+
+        with fits.open(Path(self.tempDir.name) / 'SFD_dust_4096_ngp.fits') as hdul:
+            expected = hdul[0].data[32, 32] * self.dustMap.scaling
+
+        self.assertAlmostEqual(expected, self.dustMap.ebv(0, 90, frame='galactic'))
+
+    def testVectorizedMatchesScalar(self) -> None:
+        """Test arrays of coordinates match individual lookups in both hemispheres"""
+
+        rng = np.random.default_rng(2)
+        ra, dec = rng.uniform(0, 360, 20), rng.uniform(-90, 90, 20)
+        vectorized = self.dustMap.ebv(ra, dec)
+        scalar = [DustMap(self.tempDir.name).ebv(r, d) for r, d in zip(ra, dec)]
+        np.testing.assert_allclose(scalar, vectorized)
+
+    def testScalarReturnType(self) -> None:
+        """Test scalar coordinates return a single float"""
+
+        self.assertIsInstance(self.dustMap.ebv(10., 20.), float)
+
+    def testMemoizedLookups(self) -> None:
+        """Test repeated coordinates are served without reading the map"""
+
+        expected = self.dustMap.ebv([10., 20.], [-30., 40.])
+        self.dustMap.mapDir = Path('does_not_exist')
+        self.dustMap._hemispheres.clear()
+        np.testing.assert_array_equal(expected, self.dustMap.ebv([10., 20.], [-30., 40.]))
+
+    def testMemoSizeBound(self) -> None:
+        """Test the memo does not grow past its maximum size"""
+
+        dustMap = DustMap(self.tempDir.name, memoSize=5)
+        dustMap.ebv(np.arange(10.), np.arange(10.))
+        self.assertEqual(5, len(dustMap._memo))
+
+    def testConcurrentLookups(self) -> None:
+        """Test lookups from many threads load each hemisphere once and return the same values"""
+
+        rng = np.random.default_rng(3)
+        coordinates = [(rng.uniform(0, 360, 20), rng.uniform(-90, 90, 20)) for _ in range(50)]
+        expected = [DustMap(self.tempDir.name).ebv(ra, dec) for ra, dec in coordinates]
+
+        dustMap = DustMap(self.tempDir.name, memoSize=30)
+        with patch.object(dustMapModule, '_Hemisphere', wraps=dustMapModule._Hemisphere) as hemisphere:
+            with ThreadPoolExecutor(8) as executor:
+                returned = list(executor.map(lambda args: dustMap.ebv(*args), coordinates * 4))
+
+        self.assertEqual(2, hemisphere.call_count)
+        np.testing.assert_allclose(expected * 4, returned)
+
+    def testUnknownUnit(self) -> None:
+        """Test a ValueError is raised for an unknown unit"""
+
+        with self.assertRaises(ValueError):
+            self.dustMap.ebv(10, 20, unit='furlong')
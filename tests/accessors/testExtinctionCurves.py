@@ -0,0 +1,113 @@
+from unittest import TestCase
+
+import extinction
+import numpy as np
+import pandas as pd
+
+import leed.accessors  # noqa: F401 Registers the spectrum accessor
+from leed.accessors.extinctionCurves import ExtinctionCurveCache, gridFingerprint
+
+
+class GridFingerprint(TestCase):
+    """Tests for the fingerprinting of wavelength grids"""
+
+    def testEqualGrids(self) -> None:
+        """Test equal grids have the same fingerprint regardless of dtype"""
+
+        wave = np.arange(3000, 4000)
+        self.assertEqual(gridFingerprint(wave), gridFingerprint(wave.astype(float)))
+
+    def testDifferentGrids(self) -> None:
+        """Test different grids have different fingerprints"""
+
+        wave = np.arange(3000., 4000.)
+        self.assertNotEqual(gridFingerprint(wave), gridFingerprint(wave + 1e-6))
+
+
+class CurveCaching(TestCase):
+    """Tests for the caching of unit extinction curves"""
+
+    def setUp(self) -> None:
+        self.cache = ExtinctionCurveCache(maxEntries=2)
+        self.wave = np.arange(3000., 7000., 2)
+
+    def testMatchesExtinctionLaw(self) -> None:
+        """Test scaled unit curves match the extinction law for a given A_V"""
+
+        rv, ebv = 2.7, .15
+        expected = 10 ** (-0.4 * extinction.fitzpatrick99(self.wave, rv * ebv, rv))
+        np.testing.assert_allclose(expected, self.cache.transmission(self.wave, ebv, rv))
+
+    def testCurveReused(self) -> None:
+        """Test repeated lookups on the same grid and Rv are served from the cache"""
+
+        first = self.cache.unitCurve(self.wave, 3.1)
+        second = self.cache.unitCurve(self.wave.copy(), 3.1)
+        self.assertIs(first, second)
+        self.assertEqual((1, 1, 1), self.cache.cacheInfo)
+
+    def testRvInKey(self) -> None:
+        """Test curves are cached separately for each Rv"""
+
+        self.cache.unitCurve(self.wave, 3.1)
+        self.cache.unitCurve(self.wave, 2.0)
+        self.assertEqual(2, self.cache.cacheInfo.misses)
+
+    def testLeastRecentlyUsedEvicted(self) -> None:
+        """Test the least recently used curve is evicted when the cache is full"""
+
+        self.cache.unitCurve(self.wave, 1)
+        self.cache.unitCurve(self.wave, 2)
+        self.cache.unitCurve(self.wave, 1)
+        self.cache.unitCurve(self.wave, 3)
+
+        self.cache.unitCurve(self.wave, 1)
+        self.assertEqual(3, self.cache.cacheInfo.misses)
+        self.cache.unitCurve(self.wave, 2)
+        self.assertEqual(4, self.cache.cacheInfo.misses)
+        self.assertEqual(2, self.cache.cacheInfo.entries)
+
+    def testCurvesReadOnly(self) -> None:
+        """Test cached curves cannot be modified in place"""
+
+        with self.assertRaises(ValueError):
+            self.cache.unitCurve(self.wave)[0] = 0
+
+
+class StackCorrection(TestCase):
+    """Tests for correcting stacks of spectra sharing a wavelength grid"""
+
+    def setUp(self) -> None:
+        self.cache = ExtinctionCurveCache()
+        self.wave = np.arange(3000., 7000., 2)
+        self.fluxes = np.random.default_rng(0).uniform(1, 2, (4, len(self.wave)))
+
+    def testMatchesIndividualCorrection(self) -> None:
+        """Test each row matches correcting the spectrum on its own"""
+
+        ebv = np.array([0, .05, .1, .2])
+        corrected = self.cache.correctStack(self.wave, self.fluxes, ebv)
+        for flux, value, row in zip(self.fluxes, ebv, corrected):
+            np.testing.assert_allclose(self.cache.correct(self.wave, flux, value), row)
+
+        self.assertEqual(1, self.cache.cacheInfo.misses)
+
+    def testScalarEbv(self) -> None:
+        """Test a single E(B-V) value is applied to every spectrum"""
+
+        corrected = self.cache.correctStack(self.wave, self.fluxes, .1)
+        expected = self.cache.correctStack(self.wave, self.fluxes, np.full(4, .1))
+        np.testing.assert_allclose(expected, corrected)
+
+    def testShapeMismatch(self) -> None:
+        """Test a ValueError is raised when fluxes do not match the grid"""
+
+        with self.assertRaises(ValueError):
+            self.cache.correctStack(self.wave[1:], self.fluxes, .1)
+
+    def testMatchesAccessor(self) -> None:
+        """Test stacked corrections match ``SpectrumAccessor.correctExtinction``"""
+
+        corrected = self.cache.correctStack(self.wave, self.fluxes, .1)
+        expected = pd.Series(self.fluxes[0], index=self.wave).spectrum.correctExtinction(ebv=.1)
+        np.testing.assert_allclose(expected.values, corrected[0])
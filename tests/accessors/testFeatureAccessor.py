@@ -1,7 +1,9 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 
+from leed.accessors.spectrum import Spectrum
 from leed.exceptions import FeatureNotObserved
 from leed.app.settings import FeatureDefinition
 from .. import simulate
@@ -71,3 +73,52 @@ class GuessFeatureBounds(TestCase):
         feat_start, feat_end = self.spectrum.feature.guessBounds(self.feature)
         self.assertEqual(self.peak_wavelengths[0], feat_start, 'Incorrect min peak')
         self.assertEqual(self.peak_wavelengths[1], feat_end, 'Incorrect max peak')
+
+
+class GuessAllFeatureBounds(TestCase):
+    """Tests for the ``guessAllBounds`` function"""
+
+    def setUp(self) -> None:
+        """Simulate delta function features and define one observed and one unobserved feature"""
+
+        wave = np.arange(7000, 8001)
+        self.peak_wavelengths = (7100, 7500)
+        self.spectrum = simulate.delta_func(wave, peak_wave=self.peak_wavelengths)
+
+        self.observedFeature = FeatureDefinition(
+            'observed',
+            self.peak_wavelengths[0] - 10,
+            self.peak_wavelengths[1] - 10,
+            wave.mean(),
+            self.peak_wavelengths[0] + 10,
+            self.peak_wavelengths[1] + 10
+        )
+
+        self.unobservedFeature = FeatureDefinition('unobserved', 9000, 9500, 9250, 9100, 9600)
+        self.bounds = self.spectrum.feature.guessAllBounds([self.observedFeature, self.unobservedFeature])
+
+    def testMatchesGuessBounds(self) -> None:
+        """Test bounds of observed features match the ``guessBounds`` function"""
+
+        expected = self.spectrum.feature.guessBounds(self.observedFeature)
+        returned = tuple(self.bounds.loc['observed', ['feat_start', 'feat_end']])
+        self.assertEqual(expected, returned)
+
+    def testObservedFlag(self) -> None:
+        """Test features are flagged as observed or unobserved"""
+
+        self.assertTrue(self.bounds.loc['observed', 'observed'])
+        self.assertFalse(self.bounds.loc['unobserved', 'observed'])
+
+    def testUnobservedBoundsAreNan(self) -> None:
+        """Test boundaries of unobserved features are ``np.nan``"""
+
+        self.assertTrue(self.bounds.loc['unobserved', ['feat_start', 'feat_end']].isna().all())
+
+    def testCoreBuiltOnce(self) -> None:
+        """Test the array-backed spectrum is built once for all features"""
+
+        with patch.object(Spectrum, 'fromSeries', wraps=Spectrum.fromSeries) as fromSeries:
+            self.spectrum.feature.guessAllBounds([self.observedFeature, self.observedFeature, self.unobservedFeature])
+
+        self.assertEqual(1, fromSeries.call_count)
@@ -0,0 +1,269 @@
+from typing import Tuple
+from unittest import TestCase
+
+import numpy as np
+from astropy.table import Table
+
+import leed
+from leed.accessors import featureSampling
+from leed.app.settings import FeatureDefinition, RESOURCES_DIR
+from .. import simulate
+
+# Features measured in the example spectrum of sn2005kc
+FE_II_FEATURE = FeatureDefinition(
+    feature_id='Fe II, Si II', lower_blue=4500, lower_red=5050, restframe=5169, upper_blue=4700, upper_red=5550)
+SI_II_FEATURE = FeatureDefinition(
+    feature_id='Si II 4130', lower_blue=3900, lower_red=4000, restframe=4129.78, upper_blue=4000, upper_red=4150)
+
+
+def exampleFeature(feature: FeatureDefinition) -> Tuple[np.array, np.array, int, int]:
+    """Return the normalized example spectrum and the bounds of a feature
+
+    Args:
+        feature: The feature to find the bounds of
+
+    Returns:
+        - The wavelength values of the spectrum
+        - The flux values of the spectrum
+        - The index of the starting wavelength of the feature
+        - The index of the ending wavelength of the feature
+    """
+
+    spectrum = Table.read(RESOURCES_DIR / 'sn2005kc.ecsv').to_pandas(index='wavelength').flux
+    spectrum = spectrum / spectrum.median()
+    idxStart, idxEnd = spectrum.spectrum._featureIndices(*spectrum.feature.guessBounds(feature))
+    return spectrum.index.values, spectrum.values, idxStart, idxEnd
+
+
+class SampleIndices(TestCase):
+    """Tests for the ``sampleIndices`` function"""
+
+    def testGridSize(self) -> None:
+        """Test one index pair is returned for every offset in the grid"""
+
+        nstep = 3
+        starts, ends = featureSampling.sampleIndices(10, 50, nstep)
+        self.assertEqual((2 * nstep + 1) ** 2, len(starts))
+        self.assertEqual((2 * nstep + 1) ** 2, len(ends))
+
+    def testGridOrder(self) -> None:
+        """Test samples are ordered by increasing start and decreasing end offsets"""
+
+        starts, ends = featureSampling.sampleIndices(10, 50, 1)
+        np.testing.assert_array_equal([9, 9, 9, 10, 10, 10, 11, 11, 11], starts)
+        np.testing.assert_array_equal([51, 50, 49, 51, 50, 49, 51, 50, 49], ends)
+
+
+class BatchedProperties(TestCase):
+    """Test batched calculations match calculations on individual samples"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Simulate a gaussian feature and measure it for a grid of samples"""
+
+        wave = np.arange(4000, 5000)
+        cls.restFrame = np.mean(wave)
+        cls.spectrum = simulate.gaussian(wave, mean=cls.restFrame - 10, stddev=100)
+        cls.starts, cls.ends = featureSampling.sampleIndices(20, 980, 2)
+        cls.samples = featureSampling.sampleProperties(
+            cls.spectrum.index.values, cls.spectrum.values, cls.starts, cls.ends, cls.restFrame)
+
+    def testPseudoContinuum(self) -> None:
+        """Test the fitted continuum matches the ``fitPseudoContinuum`` method"""
+
+        wave, flux = self.spectrum.index.values, self.spectrum.values
+        slope, intercept = featureSampling.pseudoContinuum(wave, flux, self.starts, self.ends)
+        for s, e, m, b in zip(self.starts, self.ends, slope, intercept):
+            sample = self.spectrum.iloc[s:e]
+            np.testing.assert_allclose(sample.feature.fitPseudoContinuum(), m * sample.index + b)
+
+    def testPew(self) -> None:
+        """Test batched pEW values match the ``pew`` method"""
+
+        for s, e, pew in zip(self.starts, self.ends, self.samples.pew):
+            sample = self.spectrum.iloc[s:e]
+            np.testing.assert_allclose(sample.feature.pew(sample.feature.fitPseudoContinuum()), pew)
+
+    def testArea(self) -> None:
+        """Test batched area values match the ``area`` method"""
+
+        for s, e, area in zip(self.starts, self.ends, self.samples.area):
+            sample = self.spectrum.iloc[s:e]
+            np.testing.assert_allclose(sample.feature.area(sample.feature.fitPseudoContinuum()), area)
+
+    def testVelocity(self) -> None:
+        """Test batched velocity values match the ``velocity`` method"""
+
+        for s, e, velocity in zip(self.starts, self.ends, self.samples.velocity):
+            sample = self.spectrum.iloc[s:e]
+            np.testing.assert_allclose(sample.feature.velocity(self.restFrame), velocity)
+
+
+class FitMethods(TestCase):
+    """Test velocities are consistent between fitting methods"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Simulate a gaussian feature"""
+
+        cls.wave = np.arange(4000, 5000)
+        cls.restFrame = np.mean(cls.wave)
+        cls.flux = simulate.gaussian(cls.wave, mean=cls.restFrame - 10, stddev=100).values
+        cls.starts, cls.ends = featureSampling.sampleIndices(20, 980, 2)
+        cls.exact, _ = featureSampling.velocity(cls.wave, cls.flux, cls.starts, cls.ends, cls.restFrame, 'exact')
+
+    def testFastVelocity(self) -> None:
+        """Test closed form velocities match the exact fit"""
+
+        fast, _ = featureSampling.velocity(self.wave, self.flux, self.starts, self.ends, self.restFrame, 'fast')
+        np.testing.assert_allclose(self.exact, fast, rtol=1e-5)
+
+    def testRefinedVelocity(self) -> None:
+        """Test refined velocities match the exact fit"""
+
+        refined, _ = featureSampling.velocity(self.wave, self.flux, self.starts, self.ends, self.restFrame, 'refine')
+        np.testing.assert_allclose(self.exact, refined)
+
+    def testUnknownMethod(self) -> None:
+        """Test a ValueError error is raised for an unknown fitting method"""
+
+        with self.assertRaises(ValueError):
+            featureSampling.velocity(self.wave, self.flux, self.starts, self.ends, self.restFrame, 'made up method')
+
+
+class ObservedFitMethods(TestCase):
+    """Test fitting methods on features in an observed spectrum"""
+
+    def testFastFallsBackToExact(self) -> None:
+        """Test samples the closed form fit cannot describe are fit with ``curve_fit``"""
+
+        wave, flux, idxStart, idxEnd = exampleFeature(SI_II_FEATURE)
+        starts, ends = featureSampling.sampleIndices(idxStart, idxEnd, 5)
+        lo, hi, mask = featureSampling._pixelMask(starts, ends)
+        linearized = leed.FeatureAccessor.fitGaussianLinearized(wave[lo:hi], flux[lo:hi], mask)
+        failed = ~linearized.isPlausible(wave[starts], wave[ends - 1])
+        self.assertTrue(np.isnan(linearized.avg).any())
+
+        exact, _ = featureSampling.velocity(wave, flux, starts, ends, SI_II_FEATURE.restframe, 'exact')
+        fast, _ = featureSampling.velocity(wave, flux, starts, ends, SI_II_FEATURE.restframe, 'fast')
+        np.testing.assert_allclose(exact[failed], fast[failed])
+
+    def testRefinedVelocity(self) -> None:
+        """Test refined velocities match the exact fit"""
+
+        wave, flux, idxStart, idxEnd = exampleFeature(FE_II_FEATURE)
+        starts, ends = featureSampling.sampleIndices(idxStart, idxEnd, 5)
+        exact, _ = featureSampling.velocity(wave, flux, starts, ends, FE_II_FEATURE.restframe, 'exact')
+        refined, _ = featureSampling.velocity(wave, flux, starts, ends, FE_II_FEATURE.restframe, 'refine')
+        np.testing.assert_allclose(exact, refined, rtol=1e-4)
+
+
+class ObservedFeatureVelocities(TestCase):
+    """Tests for the velocities of resampled features in an observed spectrum"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Measure the velocity of every sample of the example feature"""
+
+        cls.wave, cls.flux, idxStart, idxEnd = exampleFeature(FE_II_FEATURE)
+        cls.starts, cls.ends = featureSampling.sampleIndices(idxStart, idxEnd, 5)
+        cls.velocities, _ = featureSampling.velocity(
+            cls.wave, cls.flux, cls.starts, cls.ends, FE_II_FEATURE.restframe)
+
+    def testSamplesFitIndependently(self) -> None:
+        """Test the velocity of each sample does not depend on the other samples"""
+
+        for start, end, velocity in zip(self.starts, self.ends, self.velocities):
+            single, _ = featureSampling.velocity(
+                self.wave, self.flux, np.array([start]), np.array([end]), FE_II_FEATURE.restframe)
+
+            np.testing.assert_allclose(single, velocity)
+
+
+class ErrorPropagation(TestCase):
+    """Test formal errors match a numerical propagation of flux errors"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Simulate a noisy gaussian feature with a sloped continuum"""
+
+        rng = np.random.default_rng(1)
+        cls.wave = np.arange(4000, 4100, dtype=float)
+        cls.flux = simulate.gaussian(cls.wave, stddev=10).values + .01 * cls.wave + rng.normal(0, .05, 100)
+        cls.error = rng.uniform(.01, .1, 100)
+        cls.starts, cls.ends = featureSampling.sampleIndices(10, 90, 2)
+
+    def _numericalError(self, func: callable) -> np.array:
+        """Propagate flux errors through a function using finite differences"""
+
+        step = 1e-6
+        variance = np.zeros(len(self.starts))
+        for pixel in range(len(self.flux)):
+            upper, lower = self.flux.copy(), self.flux.copy()
+            upper[pixel] += step
+            lower[pixel] -= step
+            derivative = (func(upper) - func(lower)) / (2 * step)
+            variance += (derivative * self.error[pixel]) ** 2
+
+        return np.sqrt(variance)
+
+    def testPewError(self) -> None:
+        """Test the formal pEW error matches numerical propagation"""
+
+        def pew(flux):
+            slope, intercept = featureSampling.pseudoContinuum(self.wave, flux, self.starts, self.ends)
+            return featureSampling.pew(self.wave, flux, self.starts, self.ends, slope, intercept)
+
+        slope, intercept = featureSampling.pseudoContinuum(self.wave, self.flux, self.starts, self.ends)
+        formal = featureSampling.pewError(
+            self.wave, self.flux, self.error, self.starts, self.ends, slope, intercept)
+        np.testing.assert_allclose(self._numericalError(pew), formal, rtol=1e-5)
+
+    def testAreaError(self) -> None:
+        """Test the formal area error matches numerical propagation"""
+
+        def area(flux):
+            slope, intercept = featureSampling.pseudoContinuum(self.wave, flux, self.starts, self.ends)
+            return featureSampling.area(self.wave, flux, self.starts, self.ends, slope, intercept)
+
+        formal = featureSampling.areaError(self.wave, self.error, self.starts, self.ends)
+        np.testing.assert_allclose(self._numericalError(area), formal, rtol=1e-5)
+
+
+class NoiseEstimation(TestCase):
+    """Tests for the ``estimateNoise`` function"""
+
+    def runTest(self) -> None:
+        """Test the estimated noise recovers the standard deviation of white noise"""
+
+        flux = np.random.default_rng(2).normal(10, .5, 100_000)
+        np.testing.assert_allclose(.5, featureSampling.estimateNoise(flux), rtol=.01)
+
+
+class MeasureDraws(TestCase):
+    """Test properties measured for flux realizations match single sample measurements"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Measure a few noisy realizations of a gaussian feature"""
+
+        cls.wave = np.arange(4000, 4500, dtype=float)
+        cls.restFrame = 4300
+        flux = simulate.gaussian(cls.wave, stddev=50).values
+        cls.draws = featureSampling.drawFlux(flux, np.full_like(flux, .01), 5, seed=0)
+        cls.measured = featureSampling.measureDraws(cls.wave, cls.draws, cls.restFrame, 'exact')
+
+    def testDrawShape(self) -> None:
+        """Test one row is drawn per realization"""
+
+        self.assertEqual((5, len(self.wave)), self.draws.shape)
+
+    def testMatchesSampledProperties(self) -> None:
+        """Test each realization matches ``sampleProperties`` over the full range"""
+
+        starts, ends = np.array([0]), np.array([len(self.wave)])
+        for i, flux in enumerate(self.draws):
+            sample = featureSampling.sampleProperties(self.wave, flux, starts, ends, self.restFrame)
+            np.testing.assert_allclose(sample.pew[0], self.measured.pew[i])
+            np.testing.assert_allclose(sample.area[0], self.measured.area[i])
+            np.testing.assert_allclose(sample.velocity[0], self.measured.velocity[i], rtol=1e-6)
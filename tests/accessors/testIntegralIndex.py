@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+import leed
+from leed.accessors import featureSampling
+from leed.accessors.integralIndex import IntegralIndex
+from .. import simulate
+
+
+class RangeIntegrals(TestCase):
+    """Tests for integrals evaluated from the cumulative index"""
+
+    def setUp(self) -> None:
+        """Simulate a spectrum with an irregular wavelength grid"""
+
+        self.wave = np.cumsum(np.random.default_rng(0).uniform(.5, 1.5, 500)) + 4000
+        self.flux = np.sin(self.wave / 10) + 2
+        self.index = IntegralIndex(self.wave, self.flux)
+
+    def testFluxIntegral(self) -> None:
+        """Test the flux integral matches ``np.trapz`` over the same range"""
+
+        for start, end in [(0, 500), (10, 11), (37, 402), (250, 251)]:
+            expected = np.trapz(x=self.wave[start:end], y=self.flux[start:end])
+            np.testing.assert_allclose(expected, self.index.flux(start, end), atol=1e-9)
+
+    def testVectorizedRanges(self) -> None:
+        """Test arrays of ranges return one integral per range"""
+
+        starts, ends = np.array([0, 10, 20]), np.array([100, 200, 300])
+        expected = [np.trapz(x=self.wave[s:e], y=self.flux[s:e]) for s, e in zip(starts, ends)]
+        np.testing.assert_allclose(expected, self.index.flux(starts, ends))
+
+    def testCumulativeAtPixels(self) -> None:
+        """Test cumulative integrals at pixel wavelengths match ``np.trapz``"""
+
+        expected = [np.trapz(x=self.wave[:i + 1], y=self.flux[:i + 1]) for i in (0, 10, 499)]
+        np.testing.assert_allclose(expected, self.index.cumulative(self.wave[[0, 10, 499]]), atol=1e-9)
+
+    def testCumulativeBetweenPixels(self) -> None:
+        """Test cumulative integrals between pixels use the linearly interpolated flux"""
+
+        x = (self.wave[10] + self.wave[11]) / 2
+        midFlux = (self.flux[10] + self.flux[11]) / 2
+        expected = np.trapz(x=np.append(self.wave[:11], x), y=np.append(self.flux[:11], midFlux))
+        np.testing.assert_allclose(expected, self.index.cumulative(x))
+
+    def testCumulativeOutOfRange(self) -> None:
+        """Test wavelengths outside the spectrum return NaN"""
+
+        self.assertTrue(np.all(np.isnan(self.index.cumulative([self.wave[0] - 1, self.wave[-1] + 1]))))
+
+
+class IndexedSampling(TestCase):
+    """Test resampled areas are unchanged when using the integral index"""
+
+    def runTest(self) -> None:
+        wave = np.arange(4000, 5000)
+        spectrum = simulate.gaussian(wave, mean=4490, stddev=100)
+        starts, ends = featureSampling.sampleIndices(20, 980, 5)
+        slope, intercept = featureSampling.pseudoContinuum(wave, spectrum.values, starts, ends)
+
+        expected = featureSampling.area(wave, spectrum.values, starts, ends, slope, intercept)
+        indexed = featureSampling.area(
+            wave, spectrum.values, starts, ends, slope, intercept, spectrum.spectrum.integralIndex)
+
+        np.testing.assert_allclose(expected, indexed)
@@ -0,0 +1,59 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from scipy.ndimage.filters import generic_filter, median_filter
+
+from leed.accessors import kernels
+
+
+class RunningKernels(TestCase):
+    """Test running-window kernels match the equivalent ``scipy.ndimage`` filters"""
+
+    def setUp(self) -> None:
+        """Define random float and integer arrays"""
+
+        rng = np.random.default_rng(0)
+        self.arrays = [rng.normal(size=500), rng.integers(-10, 10, 500)]
+        self.sizes = [1, 2, 5, 10, 51]
+
+    def testRunningSum(self) -> None:
+        """Test ``runningSum`` matches a generic filter using ``np.sum``"""
+
+        for values in self.arrays:
+            for size in self.sizes:
+                expected = generic_filter(values, np.sum, size)
+                np.testing.assert_allclose(expected, kernels.runningSum(values, size), atol=1e-10)
+
+    def testRunningAverage(self) -> None:
+        """Test ``runningAverage`` matches a generic filter using ``np.average``"""
+
+        for values in self.arrays:
+            for size in self.sizes:
+                expected = generic_filter(values, np.average, size)
+                np.testing.assert_allclose(expected, kernels.runningAverage(values, size), atol=1e-10)
+
+    def testRunningMedian(self) -> None:
+        """Test ``runningMedian`` matches ``median_filter`` for odd and even window sizes"""
+
+        for values in self.arrays:
+            for size in self.sizes + [64, 255]:
+                np.testing.assert_equal(median_filter(values, size), kernels.runningMedian(values, size))
+
+    def testRunningMedianBlocks(self) -> None:
+        """Test ``runningMedian`` matches ``median_filter`` when windows span several blocks"""
+
+        with patch.object(kernels, '_MEDIAN_BLOCK', 16):
+            for values in self.arrays:
+                for size in (3, 10, 51):
+                    np.testing.assert_equal(median_filter(values, size), kernels.runningMedian(values, size))
+
+    def testWindowLargerThanArray(self) -> None:
+        """Test edges are reflected repeatedly for windows longer than the array"""
+
+        # ``generic_filter`` reads uninitialized memory beyond 8 times the array length
+        values = np.array([3., 1., 2.])
+        for size in (4, 5, 6, 7, 12, 23):
+            np.testing.assert_allclose(generic_filter(values, np.sum, size), kernels.runningSum(values, size))
+            np.testing.assert_allclose(generic_filter(values, np.average, size), kernels.runningAverage(values, size))
+            np.testing.assert_equal(median_filter(values, size), kernels.runningMedian(values, size))
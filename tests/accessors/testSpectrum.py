@@ -0,0 +1,101 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+import leed
+from leed.accessors import Spectrum
+from .. import simulate
+
+
+class Construction(TestCase):
+    """Tests for the construction of ``Spectrum`` instances"""
+
+    def testUnsortedError(self) -> None:
+        """Test a ValueError is raised for unsorted wavelengths"""
+
+        with self.assertRaises(ValueError):
+            Spectrum([3, 2, 1], [1, 2, 3])
+
+    def testLengthMismatchError(self) -> None:
+        """Test a ValueError is raised for arrays of different lengths"""
+
+        with self.assertRaises(ValueError):
+            Spectrum([1, 2, 3], [1, 2])
+
+    def testNoInstanceDict(self) -> None:
+        """Test instances use slots instead of an instance dictionary"""
+
+        self.assertFalse(hasattr(Spectrum([1, 2, 3], [1, 2, 3]), '__dict__'))
+
+    def testFromSeriesSharesMemory(self) -> None:
+        """Test spectra created from a ``Series`` do not copy the data"""
+
+        series = pd.Series(np.arange(10, 20, dtype=float), index=np.arange(10, dtype=float))
+        spectrum = Spectrum.fromSeries(series)
+        self.assertTrue(np.shares_memory(series.values, spectrum.flux))
+        self.assertTrue(np.shares_memory(series.index.values, spectrum.wave))
+
+
+class Slicing(TestCase):
+    """Tests for the slicing of ``Spectrum`` instances"""
+
+    def setUp(self) -> None:
+        self.spectrum = Spectrum(np.arange(10.), np.arange(10.) ** 2, np.ones(10))
+
+    def testSliceIsView(self) -> None:
+        """Test slices share memory with the parent spectrum"""
+
+        sliced = self.spectrum[2:5]
+        np.testing.assert_array_equal([2, 3, 4], sliced.wave)
+        self.assertTrue(np.shares_memory(self.spectrum.flux, sliced.flux))
+        self.assertTrue(np.shares_memory(self.spectrum.error, sliced.error))
+
+    def testNonContiguousError(self) -> None:
+        """Test a TypeError is raised for non-contiguous indexing"""
+
+        with self.assertRaises(TypeError):
+            self.spectrum[::2]
+
+    def testIntegerIndexError(self) -> None:
+        """Test a TypeError is raised when indexing a single pixel"""
+
+        with self.assertRaises(TypeError):
+            self.spectrum[2]
+
+
+class MatchesAccessor(TestCase):
+    """Test calculations on a ``Spectrum`` match the ``feature`` accessor"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Simulate a gaussian feature"""
+
+        wave = np.arange(1000, 2000)
+        cls.restFrame = np.mean(wave)
+        cls.series = simulate.gaussian(wave, mean=cls.restFrame - 100, stddev=100)
+        cls.spectrum = Spectrum.fromSeries(cls.series)
+
+    def testPseudoContinuum(self) -> None:
+        """Test the fitted continuum matches the accessor"""
+
+        np.testing.assert_array_equal(
+            self.series.feature.fitPseudoContinuum().values,
+            self.spectrum.fitPseudoContinuum().flux)
+
+    def testPew(self) -> None:
+        """Test the pEW matches the accessor"""
+
+        expected = self.series.feature.pew(self.series.feature.fitPseudoContinuum())
+        self.assertEqual(expected, self.spectrum.pew(self.spectrum.fitPseudoContinuum()))
+
+    def testArea(self) -> None:
+        """Test the area matches the accessor"""
+
+        expected = self.series.feature.area(self.series.feature.fitPseudoContinuum())
+        self.assertEqual(expected, self.spectrum.area(self.spectrum.fitPseudoContinuum()))
+
+    def testVelocity(self) -> None:
+        """Test the velocity matches the accessor"""
+
+        self.assertEqual(self.series.feature.velocity(self.restFrame), self.spectrum.velocity(self.restFrame))
@@ -5,8 +5,10 @@ import numpy as np
 import pandas as pd
 from scipy.ndimage.filters import gaussian_filter, generic_filter, median_filter
 
+from leed.accessors import featureSampling
 from leed.accessors.spectrumAccessor import DUSTMAP
 from leed.exceptions import SamplingRangeError
+from leed.executors import ProcessExecutor
 from tests import simulate
 
 
@@ -48,6 +50,19 @@ class FluxBinning(TestCase):
         medianFlux = median_filter(self.flux, self.bin_size)
         np.testing.assert_equal(medianFlux, binnedFlux)
 
+    def testWideBinnedMedian(self) -> None:
+        """Test wide median bins match a median filter"""
+
+        flux = pd.Series(np.random.default_rng(0).normal(size=1001), index=self.flux.index)
+        np.testing.assert_equal(median_filter(flux, 101), flux.spectrum.bin(101, 'median'))
+
+    def testBinLongerThanSpectrum(self) -> None:
+        """Test bins longer than twice the spectrum match ``generic_filter``"""
+
+        flux = pd.Series(np.arange(5.), index=np.arange(5.) + 1000)
+        for method, func in (('sum', np.sum), ('average', np.average)):
+            np.testing.assert_allclose(generic_filter(flux, func, 12), flux.spectrum.bin(12, method))
+
     def testUnknownMethod(self) -> None:
         """Test a ValueError error is raised for an unknown binning method"""
 
@@ -55,6 +70,53 @@ class FluxBinning(TestCase):
             self.flux.spectrum.bin(size=5, method='made up method')
 
 
+class FluxConservingRebin(TestCase):
+    """Tests for the ``rebin`` function"""
+
+    def setUp(self) -> None:
+        """Define a mock spectrum with non-constant flux"""
+
+        wave = np.arange(4000, 4101, dtype=float)
+        self.flux = pd.Series(np.sin(wave / 5) + 2, index=wave)
+
+    def testFluxIsConserved(self) -> None:
+        """Test the integrated flux over all bins matches the input spectrum"""
+
+        rebinned = self.flux.spectrum.rebin(binWidth=10)
+        expected = np.trapz(x=self.flux.index, y=self.flux.values)
+        np.testing.assert_allclose(expected, (rebinned * 10).sum())
+
+    def testBinCenters(self) -> None:
+        """Test bins are indexed by centers on a grid anchored at multiples of the bin width"""
+
+        rebinned = self.flux.spectrum.rebin(binWidth=20)
+        np.testing.assert_array_equal([4010, 4030, 4050, 4070, 4090], rebinned.index)
+
+    def testConstantFlux(self) -> None:
+        """Test a constant spectrum is unchanged by rebinning onto a custom grid"""
+
+        flux = pd.Series(np.full(len(self.flux), 3.), index=self.flux.index)
+        rebinned = flux.spectrum.rebin(grid=[4012, 4033, 4051, 4080])
+        np.testing.assert_allclose(3, rebinned)
+
+    def testUncoveredBinsAreNan(self) -> None:
+        """Test bins extending beyond the spectrum are NaN"""
+
+        rebinned = self.flux.spectrum.rebin(grid=[3990, 4050, 4110])
+        self.assertTrue(np.isnan(rebinned.iloc[0]))
+        self.assertFalse(np.isnan(rebinned.iloc[1]))
+        self.assertTrue(np.isnan(rebinned.iloc[2]))
+
+    def testGridOrWidthRequired(self) -> None:
+        """Test a ValueError is raised unless exactly one of the bin width or grid is given"""
+
+        with self.assertRaises(ValueError):
+            self.flux.spectrum.rebin()
+
+        with self.assertRaises(ValueError):
+            self.flux.spectrum.rebin(binWidth=10, grid=[4010, 4020])
+
+
 class RestFraming(TestCase):
     """Tests for the rest framing of observed wavelengths"""
 
@@ -107,6 +169,28 @@ class ExtinctionCorrection(TestCase):
         pd.testing.assert_series_equal(self.flux, corrected)
 
 
+class PrecomputedExtinction(TestCase):
+    """Tests for extinction correction using a precomputed E(B-V) value"""
+
+    def setUp(self) -> None:
+        wave = np.arange(4000., 5000.)
+        self.flux = pd.Series(np.ones_like(wave), index=wave)
+
+    def testCorrectionUsesEbv(self) -> None:
+        """Test flux is corrected using the given E(B-V) value"""
+
+        ebv, rv = .1, 3.1
+        ext = extinction.fitzpatrick99(self.flux.index.values, a_v=rv * ebv, r_v=rv)
+        corrected = self.flux.spectrum.correctExtinction(ebv=ebv, rv=rv)
+        np.testing.assert_allclose(self.flux / 10 ** (0.4 * ext), corrected)
+
+    def testMissingCoordinates(self) -> None:
+        """Test a ValueError is raised without coordinates or E(B-V)"""
+
+        with self.assertRaises(ValueError):
+            self.flux.spectrum.correctExtinction()
+
+
 class FeatureSampling(TestCase):
 
     @classmethod
@@ -192,3 +276,130 @@ class FeatureSampling(TestCase):
                 restFrame=self.lambda_rest,
                 nstep=10
             )
+
+    def testFormalErrors(self) -> None:
+        """Test formal errors are propagated from the given flux errors"""
+
+        error = pd.Series(np.full(len(self.flux), .01), index=self.flux.index)
+        properties = self.flux.spectrum.sampleFeatureProperties(
+            featStart=self.featureStart,
+            featEnd=self.featureEnd,
+            restFrame=self.lambda_rest,
+            nstep=1,
+            error=error
+        )
+
+        velErr, pewErr, areaErr = properties[1], properties[4], properties[7]
+        self.assertTrue(all(np.isfinite([velErr, pewErr, areaErr])))
+        self.assertGreater(pewErr, 0)
+        self.assertGreater(areaErr, 0)
+
+    def testSummaryStatistics(self) -> None:
+        """Test returned values are the mean, average formal error, and standard deviation of the samples"""
+
+        nstep = 2
+        error = pd.Series(np.full(len(self.flux), .01), index=self.flux.index)
+        properties = self.flux.spectrum.sampleFeatureProperties(
+            featStart=self.featureStart,
+            featEnd=self.featureEnd,
+            restFrame=self.lambda_rest,
+            nstep=nstep,
+            error=error
+        )
+
+        idxStart, idxEnd = self.flux.spectrum._featureIndices(self.featureStart, self.featureEnd)
+        starts, ends = featureSampling.sampleIndices(idxStart, idxEnd, nstep)
+        wave, flux = self.flux.index.values.astype(float), self.flux.values.astype(float)
+        samples = featureSampling.sampleProperties(
+            wave, flux, starts, ends, self.lambda_rest, error=error.values)
+
+        expected = []
+        for values, errors in (
+                (samples.velocity, samples.velocityErr),
+                (samples.pew, samples.pewErr),
+                (samples.area, samples.areaErr)):
+            expected.extend((np.mean(values), np.mean(errors), np.std(values)))
+
+        np.testing.assert_allclose(expected, properties, rtol=1e-6)
+
+    def testInPlaceChangesMeasured(self) -> None:
+        """Test features are measured from the current flux after modifying the series in place"""
+
+        kwargs = dict(featStart=self.featureStart, featEnd=self.featureEnd, restFrame=self.lambda_rest, nstep=1)
+        area = self.flux.spectrum.sampleFeatureProperties(**kwargs)[6]
+
+        self.flux *= 2
+        np.testing.assert_allclose(2 * area, self.flux.spectrum.sampleFeatureProperties(**kwargs)[6])
+
+    def testExecutorMatchesSerial(self) -> None:
+        """Test resampled features measured with an executor match serial measurements"""
+
+        kwargs = dict(featStart=self.featureStart, featEnd=self.featureEnd, restFrame=self.lambda_rest, nstep=2)
+        serial = self.flux.spectrum.sampleFeatureProperties(**kwargs)
+        with ProcessExecutor(2, chunksize=7) as executor:
+            parallel = self.flux.spectrum.sampleFeatureProperties(**kwargs, executor=executor)
+
+        np.testing.assert_allclose(serial, parallel, rtol=1e-6, atol=1e-8)
+
+
+class MonteCarloSampling(TestCase):
+    """Tests for the Monte Carlo estimation of feature properties"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Define a noisy mock spectrum with a gaussian feature and measure the feature"""
+
+        wave = np.arange(4000, 5000)
+        cls.featureStart = 4020
+        cls.featureEnd = 4980
+        cls.lambda_rest = np.mean(wave)
+
+        rng = np.random.default_rng(0)
+        cls.flux = simulate.gaussian(wave, mean=cls.lambda_rest - 10, stddev=100) + rng.normal(0, .05, len(wave))
+        cls.error = pd.Series(np.full(len(wave), .05), index=wave)
+        cls.properties, cls.percentiles = cls.flux.spectrum.monteCarloFeatureProperties(
+            cls.featureStart, cls.featureEnd, cls.lambda_rest, ndraws=500, seed=1, error=cls.error)
+
+    def testReturnedValues(self) -> None:
+        """Test nine property values are returned"""
+
+        self.assertEqual(9, len(self.properties))
+
+    def testPercentileTable(self) -> None:
+        """Test a percentile is returned for each property"""
+
+        self.assertListEqual(['vel', 'pew', 'area'], list(self.percentiles.index))
+        self.assertListEqual([16, 50, 84], list(self.percentiles.columns))
+
+    def testSeededDraws(self) -> None:
+        """Test results are reproducible for a fixed seed"""
+
+        properties, percentiles = self.flux.spectrum.monteCarloFeatureProperties(
+            self.featureStart, self.featureEnd, self.lambda_rest, ndraws=500, seed=1, error=self.error)
+
+        np.testing.assert_array_equal(self.properties, properties)
+        pd.testing.assert_frame_equal(self.percentiles, percentiles)
+
+    def testDefaultMatchesExactFit(self) -> None:
+        """Test velocity percentiles from the default batched fit match per-draw ``curve_fit`` fits"""
+
+        _, exact = self.flux.spectrum.monteCarloFeatureProperties(
+            self.featureStart, self.featureEnd, self.lambda_rest,
+            ndraws=500, seed=1, error=self.error, fitMethod='exact')
+
+        np.testing.assert_allclose(self.percentiles.loc['vel'], exact.loc['vel'], rtol=1e-3)
+
+    def testErrorsAgree(self) -> None:
+        """Test the Monte Carlo pEW and area errors agree with the formal errors"""
+
+        np.testing.assert_allclose(self.properties[4], self.properties[5], rtol=.1)
+        np.testing.assert_allclose(self.properties[7], self.properties[8], rtol=.1)
+
+    def testResampledFormalErrors(self) -> None:
+        """Test formal errors of resampled features agree with the Monte Carlo errors"""
+
+        resampled = self.flux.spectrum.sampleFeatureProperties(
+            self.featureStart, self.featureEnd, self.lambda_rest, nstep=5, error=self.error)
+
+        monteCarloErrors = [self.properties[2], self.properties[5], self.properties[8]]
+        np.testing.assert_allclose(monteCarloErrors, [resampled[1], resampled[4], resampled[7]], rtol=.1)
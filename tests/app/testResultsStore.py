@@ -0,0 +1,180 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from leed.app.resultsStore import ResultsStore, emptyResults, openResults, storePath
+from leed.app.utils import get_results_dataframe
+
+
+def makeResults(objIds, times, featNames=('pW1', 'pW2'), pew=1.) -> pd.DataFrame:
+    """Build a results table with one row per object, time, and feature"""
+
+    index = pd.MultiIndex.from_product([objIds, times, featNames], names=['obj_id', 'time', 'feat_name'])
+    data = emptyResults().reindex(index)
+    data['pew'] = pew
+    data['notes'] = 'note'
+    return data
+
+
+class Upserting(TestCase):
+    """Tests for saving results to the store"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.store = ResultsStore(Path(self.tempDir.name) / 'results.sqlite')
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.tempDir.cleanup()
+
+    def testRepeatedSavesNotDuplicated(self) -> None:
+        """Test saving the same rows twice does not create duplicates"""
+
+        results = makeResults(['a'], [1.5])
+        self.store.upsert(results)
+        self.store.upsert(results)
+        self.assertEqual(len(results), len(self.store))
+
+    def testExistingRowsReplaced(self) -> None:
+        """Test saved values are replaced by newer values with the same key"""
+
+        self.store.upsert(makeResults(['a'], [1.5], pew=1))
+        self.store.upsert(makeResults(['a'], [1.5], featNames=['pW1'], pew=2))
+        self.assertEqual(2, self.store.get('a', 1.5, 'pW1')['pew'])
+        self.assertEqual(1, self.store.get('a', 1.5, 'pW2')['pew'])
+
+    def testRoundTrip(self) -> None:
+        """Test results read back match the saved results"""
+
+        results = makeResults(['a', '1'], [1.5, 2.5])
+        self.store.upsert(results)
+        pd.testing.assert_frame_equal(results.sort_index(), self.store.read(), check_dtype=False)
+
+    def testObjectIdsAreStrings(self) -> None:
+        """Test numeric object Ids are stored as strings"""
+
+        self.store.upsert(makeResults([123], [1.5]))
+        self.assertListEqual(['123'], list(self.store.read().index.unique('obj_id')))
+
+    def testMissingValues(self) -> None:
+        """Test missing values are read back as NaN"""
+
+        self.store.upsert(makeResults(['a'], [1.5]))
+        self.assertTrue(np.isnan(self.store.get('a', 1.5, 'pW1')['vel']))
+
+
+class Lookups(TestCase):
+    """Tests for reading results from the store"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tempDir = TemporaryDirectory()
+        cls.store = ResultsStore(Path(cls.tempDir.name) / 'results.sqlite')
+        cls.store.upsert(makeResults(['a', 'b'], [1.5, 2.5]))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.store.close()
+        cls.tempDir.cleanup()
+
+    def testPointLookup(self) -> None:
+        """Test a single saved feature is returned by key"""
+
+        row = self.store.get('b', 2.5, 'pW2')
+        self.assertEqual(('b', 2.5, 'pW2'), row.name)
+
+    def testMissingKey(self) -> None:
+        """Test ``None`` is returned for features that have not been saved"""
+
+        self.assertIsNone(self.store.get('c', 1.5, 'pW1'))
+
+    def testReadSingleObject(self) -> None:
+        """Test reading results for a single object"""
+
+        data = self.store.read('a')
+        self.assertListEqual(['a'], list(data.index.unique('obj_id')))
+        self.assertEqual(4, len(data))
+
+    def testColumnsMatchEmptyResults(self) -> None:
+        """Test read results have the same columns as an empty results table"""
+
+        self.assertListEqual(list(emptyResults().columns), list(self.store.read().columns))
+
+
+class CsvCompatibility(TestCase):
+    """Tests for synchronizing the store with CSV files"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.csvPath = Path(self.tempDir.name) / 'results.csv'
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def testStorePath(self) -> None:
+        """Test CSV files are stored in a database next to the file"""
+
+        self.assertEqual(self.csvPath.with_suffix('.sqlite'), storePath(self.csvPath))
+        self.assertEqual(self.csvPath.with_suffix('.db'), storePath(self.csvPath.with_suffix('.db')))
+
+    def testLegacyAppendedCsv(self) -> None:
+        """Test repeated headers and duplicate rows written by ``to_csv(mode='a')`` are dropped"""
+
+        makeResults(['a'], [1.5], pew=1).to_csv(self.csvPath, mode='a')
+        makeResults(['a'], [1.5], pew=2).to_csv(self.csvPath, mode='a')
+
+        data = get_results_dataframe(self.csvPath)
+        self.assertEqual(2, len(data))
+        self.assertTrue((data['pew'] == 2).all())
+
+    def testExportRoundTrip(self) -> None:
+        """Test exported CSV files are not re-imported unless they change"""
+
+        with openResults(self.csvPath) as store:
+            store.upsert(makeResults(['a'], [1.5]))
+            store.exportCsv(self.csvPath)
+
+        with openResults(self.csvPath) as store:
+            store.upsert(makeResults(['b'], [1.5]))
+
+        self.assertEqual(4, len(get_results_dataframe(self.csvPath)))
+
+    def testReadDoesNotCreateFiles(self) -> None:
+        """Test reading results does not create a store next to the output file"""
+
+        pd.testing.assert_frame_equal(emptyResults(), get_results_dataframe(self.csvPath))
+
+        makeResults(['a'], [1.5]).to_csv(self.csvPath)
+        self.assertEqual(2, len(get_results_dataframe(self.csvPath)))
+        self.assertListEqual([self.csvPath], list(Path(self.tempDir.name).iterdir()))
+
+    def testExternalChangesImported(self) -> None:
+        """Test rows from CSV files changed outside of the store replace stored rows with the same key"""
+
+        with openResults(self.csvPath) as store:
+            store.upsert(makeResults(['a'], [1.5], pew=1))
+
+        makeResults(['a', 'b'], [1.5], pew=2).to_csv(self.csvPath)
+        data = get_results_dataframe(self.csvPath)
+        self.assertListEqual(['a', 'b'], list(data.index.unique('obj_id')))
+        self.assertTrue((data['pew'] == 2).all())
+
+        with openResults(self.csvPath) as store:
+            pd.testing.assert_frame_equal(data, store.read())
+
+    def testUnexportedRowsKept(self) -> None:
+        """Test stored rows missing from a changed CSV file are not discarded"""
+
+        with openResults(self.csvPath) as store:
+            store.upsert(makeResults(['a'], [1.5]))
+            store.exportCsv(self.csvPath)
+            store.upsert(makeResults(['b'], [1.5]))  # Saved but never exported
+
+        makeResults(['c'], [1.5]).to_csv(self.csvPath)
+        self.assertListEqual(['a', 'b', 'c'], list(get_results_dataframe(self.csvPath).index.unique('obj_id')))
+
+        with openResults(self.csvPath) as store:
+            self.assertListEqual(['a', 'b', 'c'], list(store.read().index.unique('obj_id')))
@@ -0,0 +1,132 @@
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from leed.app.resultsStore import appendJournal, journalPath, openResults, toRecords
+from leed.app.resultsWriter import ResultsWriter
+from leed.app.utils import get_results_dataframe
+from tests.app.testResultsStore import makeResults
+
+
+def countSaved(path: Path) -> int:
+    """Return the number of results in the store for a given output file"""
+
+    with openResults(path) as store:
+        return len(store)
+
+
+class WriteBehind(TestCase):
+    """Tests for saving results from the background thread"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'results.csv'
+        self.writer = ResultsWriter(self.path, flushInterval=60)
+
+    def tearDown(self) -> None:
+        self.writer.close()
+        self.tempDir.cleanup()
+
+    def testWritesAreDeferred(self) -> None:
+        """Test results are journaled but not saved until flushed"""
+
+        self.writer.write(makeResults(['a'], [1.5]))
+        self.assertTrue(self.writer.journal.exists())
+
+        self.writer.flush(timeout=5)
+        self.assertEqual(2, countSaved(self.path))
+        self.assertFalse(self.writer.journal.exists())
+
+    def testFullBatchWritten(self) -> None:
+        """Test results are saved once a full batch is queued"""
+
+        self.writer.close()
+        self.writer = ResultsWriter(self.path, batchSize=4, flushInterval=60)
+        self.writer.write(makeResults(['a', 'b'], [1.5]))
+
+        deadline = time.monotonic() + 5
+        while countSaved(self.path) < 4 and time.monotonic() < deadline:
+            time.sleep(.01)
+
+        self.assertEqual(4, countSaved(self.path))
+
+    def testCloseSavesQueuedResults(self) -> None:
+        """Test closing the writer saves all queued results"""
+
+        self.writer.write(makeResults(['a'], [1.5]))
+        self.writer.write(makeResults(['b'], [1.5]))
+        self.writer.close()
+        self.assertEqual(4, countSaved(self.path))
+
+    def testWriteAfterClose(self) -> None:
+        """Test a RuntimeError is raised when writing to a closed writer"""
+
+        self.writer.close()
+        with self.assertRaises(RuntimeError):
+            self.writer.write(makeResults(['a'], [1.5]))
+
+
+class TimedFlush(TestCase):
+    """Tests for saving results after the flush interval"""
+
+    def testResultsSavedAfterInterval(self) -> None:
+        """Test queued results are saved without an explicit flush"""
+
+        with TemporaryDirectory() as tempDir:
+            path = Path(tempDir) / 'results.csv'
+            with ResultsWriter(path, flushInterval=.05) as writer:
+                writer.write(makeResults(['a'], [1.5]))
+
+                deadline = time.monotonic() + 5
+                while countSaved(path) < 2 and time.monotonic() < deadline:
+                    time.sleep(.01)
+
+                self.assertEqual(2, countSaved(path))
+
+
+class JournalReplay(TestCase):
+    """Tests for recovering results left in the journal"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'results.csv'
+        self.journal = journalPath(self.path)
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def testJournalRead(self) -> None:
+        """Test journaled results are loaded by ``get_results_dataframe`` without removing the journal"""
+
+        appendJournal(self.journal, toRecords(makeResults(['a'], [1.5])))
+        self.assertEqual(2, len(get_results_dataframe(self.path)))
+        self.assertTrue(self.journal.exists())
+
+    def testJournalReplayed(self) -> None:
+        """Test journaled results are saved to the store and the journal removed when the store is opened"""
+
+        appendJournal(self.journal, toRecords(makeResults(['a'], [1.5])))
+        self.assertEqual(2, countSaved(self.path))
+        self.assertFalse(self.journal.exists())
+
+    def testJournalReplacesSaved(self) -> None:
+        """Test journaled results take precedence over saved results with the same key"""
+
+        with openResults(self.path) as store:
+            store.upsert(makeResults(['a', 'b'], [1.5], pew=1))
+
+        appendJournal(self.journal, toRecords(makeResults(['a'], [1.5], pew=2)))
+        data = get_results_dataframe(self.path)
+        self.assertEqual(4, len(data))
+        self.assertListEqual([2, 2], data.loc['a', 'pew'].tolist())
+        self.assertListEqual([1, 1], data.loc['b', 'pew'].tolist())
+
+    def testPartialLineIgnored(self) -> None:
+        """Test a partially written final record is skipped"""
+
+        appendJournal(self.journal, toRecords(makeResults(['a'], [1.5])))
+        with self.journal.open('a') as journal:
+            journal.write('["b", 1.5, "pW')
+
+        self.assertEqual(2, len(get_results_dataframe(self.path)))
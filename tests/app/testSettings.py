@@ -0,0 +1,117 @@
+import os
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from leed.app import settings as settingsModule
+from leed.app.settings import SettingsLoader, addSettingsListener, loadSettings, removeSettingsListener
+
+
+class SettingsCaching(TestCase):
+    """Tests for reusing parsed settings files"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        SettingsLoader(defaults=True).saveToDisk(self.path)
+
+    def tearDown(self) -> None:
+        self.tempDir.cleanup()
+
+    def testUnchangedFileNotParsed(self) -> None:
+        """Test an unchanged file is only parsed once"""
+
+        loadSettings(self.path)
+        with patch.object(settingsModule.yaml, 'safe_load') as safeLoad:
+            loadSettings(self.path)
+
+        safeLoad.assert_not_called()
+
+    def testModifiedFileParsed(self) -> None:
+        """Test settings are read again after the file is modified"""
+
+        loadSettings(self.path)
+        text = self.path.read_text().replace('nstep: 5', 'nstep: 7')
+        self.path.write_text(text)
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(7, loadSettings(self.path).prepare.nstep)
+
+    def testReturnsCopies(self) -> None:
+        """Test modifying returned settings does not change the cached settings"""
+
+        loadSettings(self.path).prepare.nstep = 100
+        self.assertEqual(5, loadSettings(self.path).prepare.nstep)
+
+    def testMissingFileCreated(self) -> None:
+        """Test default settings are written when the file does not exist"""
+
+        path = Path(self.tempDir.name) / 'new' / 'settings.yml'
+        self.assertEqual(SettingsLoader(defaults=True), loadSettings(path))
+        self.assertTrue(path.exists())
+
+
+class SettingsListeners(TestCase):
+    """Tests for notifying listeners of changed settings"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        SettingsLoader(defaults=True).saveToDisk(self.path)
+        self.received = []
+        addSettingsListener(self.received.append, self.path)
+
+    def tearDown(self) -> None:
+        removeSettingsListener(self.received.append, self.path)
+        self.tempDir.cleanup()
+
+    def testNotifiedOnSave(self) -> None:
+        """Test listeners receive settings saved to disk"""
+
+        settings = loadSettings(self.path)
+        settings.prepare.rv = 2.
+        settings.saveToDisk(self.path)
+        self.assertEqual(1, len(self.received))
+        self.assertEqual(2., self.received[0].prepare.rv)
+
+    def testNotNotifiedWithoutChanges(self) -> None:
+        """Test listeners are not called when settings are loaded without changes"""
+
+        loadSettings(self.path)
+        loadSettings(self.path)
+        self.assertListEqual([], self.received)
+
+    def testRemovedListener(self) -> None:
+        """Test removed listeners are no longer called"""
+
+        removeSettingsListener(self.received.append, self.path)
+        loadSettings(self.path).saveToDisk(self.path)
+        self.assertListEqual([], self.received)
+
+    def testListenersCalledWithoutLock(self) -> None:
+        """Test listeners can read settings from another thread when notified"""
+
+        finished = []
+
+        def listener(settings) -> None:
+            reader = threading.Thread(target=lambda: finished.append(loadSettings(self.path)))
+            reader.start()
+            reader.join(timeout=5)
+
+        addSettingsListener(listener, self.path)
+        try:
+            # Changes are reported both when settings are saved and when a modified file is read
+            loadSettings(self.path).saveToDisk(self.path)
+            text = self.path.read_text().replace('nstep: 5', 'nstep: 7')
+            self.path.write_text(text)
+            stat = self.path.stat()
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            loadSettings(self.path)
+
+        finally:
+            removeSettingsListener(listener, self.path)
+
+        self.assertEqual(2, len(finished))
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication
+
+from leed.app.settings import SettingsLoader, loadSettings
+from leed.app.settingsService import SettingsService
+
+app = QApplication.instance() or QApplication([])
+
+
+class ChangeSignal(TestCase):
+    """Tests for the ``settingsChanged`` signal"""
+
+    def setUp(self) -> None:
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        self.service = SettingsService(self.path)
+        self.received = []
+        self.service.settingsChanged.connect(self.received.append)
+
+    def tearDown(self) -> None:
+        self.service.close()
+        self.tempDir.cleanup()
+
+    def testFileCreated(self) -> None:
+        """Test the settings file is created if it does not exist"""
+
+        self.assertTrue(self.path.exists())
+        self.assertEqual(SettingsLoader(defaults=True), self.service.settings())
+
+    def testEmittedOnSave(self) -> None:
+        """Test the signal is emitted when settings are saved"""
+
+        settings = self.service.settings()
+        settings.prepare.bin_size = 20
+        settings.saveToDisk(self.path)
+        self.assertEqual(1, len(self.received))
+        self.assertEqual(20, self.received[0].prepare.bin_size)
+
+    def testEmittedOnExternalChange(self) -> None:
+        """Test the signal is emitted when the file is modified outside the application"""
+
+        text = self.path.read_text().replace('bin_size: 10', 'bin_size: 15')
+        self.path.write_text(text)
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.service.reload()
+        self.assertEqual(15, self.received[-1].prepare.bin_size)
+
+    def testNotEmittedWhenUnchanged(self) -> None:
+        """Test reloading an unchanged file does not emit the signal"""
+
+        self.service.reload()
+        self.assertListEqual([], self.received)
+
+
+class SharedInstance(TestCase):
+    """Tests for the service following the default settings file"""
+
+    def setUp(self) -> None:
+        """Point the default settings path at a temporary file"""
+
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        self.patches = [
+            patch('leed.app.settings.SETTINGS_PATH', self.path),
+            patch('leed.app.settingsService.SETTINGS_PATH', self.path)
+        ]
+
+        for p in self.patches:
+            p.start()
+
+        SettingsService._instance = None
+
+    def tearDown(self) -> None:
+        if SettingsService._instance is not None:
+            SettingsService._instance.close()
+            SettingsService._instance = None
+
+        for p in self.patches:
+            p.stop()
+
+        self.tempDir.cleanup()
+
+    def testSharedInstance(self) -> None:
+        """Test ``instance`` always returns the same service"""
+
+        self.assertIs(SettingsService.instance(), SettingsService.instance())
+        self.assertEqual(loadSettings(), SettingsService.instance().settings())
+
+    def testDefaultPath(self) -> None:
+        """Test the shared service follows the default settings file"""
+
+        self.assertEqual(self.path, SettingsService.instance().path)
+        self.assertTrue(self.path.exists())
@@ -0,0 +1,212 @@
+import threading
+from collections import Counter
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from leed.app.utils import SpectralAccessor
+
+
+class MockData:
+    """Callable returning mock supernova data and recording which objects were loaded"""
+
+    def __init__(self) -> None:
+        self.calls = Counter()
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, objId: str) -> pd.DataFrame:
+        with self._lock:
+            self.calls[objId] += 1
+            self.threads.add(threading.current_thread().name)
+
+        wave = np.arange(4000, 4010)
+        return pd.DataFrame({'time': [1] * 5 + [2] * 5, 'flux': np.ones(10)}, index=wave)
+
+
+class Prefetching(TestCase):
+    """Tests for the background prefetching of supernova data"""
+
+    def setUp(self) -> None:
+        """Create an accessor over five mock supernovae"""
+
+        self.func = MockData()
+        self.objIds = ['a', 'b', 'c', 'd', 'e']
+        self.accessor = SpectralAccessor(self.func, self.objIds, 'time', prefetch=1)
+
+    def tearDown(self) -> None:
+        self.accessor.close()
+
+    def _waitForPrefetch(self) -> None:
+        """Block until all pending prefetches finish"""
+
+        for future in list(self.accessor._futures.values()):
+            future.result()
+
+    def testNeighborsArePrefetched(self) -> None:
+        """Test the next supernova is loaded without navigating to it"""
+
+        self._waitForPrefetch()
+        self.assertEqual(1, self.func.calls['b'])
+
+    def testNoDuplicateLoads(self) -> None:
+        """Test revisiting a prefetched supernova does not load it a second time"""
+
+        self.accessor.loadNextSN()
+        self.accessor.loadNextSN()
+        self.accessor.loadPreviousSN()
+        self._waitForPrefetch()
+        self.assertEqual(1, self.func.calls['b'])
+        self.assertEqual(1, self.func.calls['c'])
+        self.assertEqual(1, self.func.calls['d'])
+
+    def testLoadsOffMainThread(self) -> None:
+        """Test data is loaded on the background thread"""
+
+        self.accessor.goTo('e', 2)
+        self._waitForPrefetch()
+        self.assertNotIn(threading.current_thread().name, self.func.threads)
+
+    def testLoadedDataMatches(self) -> None:
+        """Test the loaded spectrum matches the data returned by the access function"""
+
+        self.accessor.loadNextSN()
+        self.assertEqual('b', self.accessor.currentSN)
+        pd.testing.assert_series_equal(self.func('b').flux[:5], self.accessor.spectrum)
+
+    def testFinishedPrefetchesAreCached(self) -> None:
+        """Test prefetched data is kept in the cache after moving away from it"""
+
+        self._waitForPrefetch()
+        self.accessor.goTo('e', 1)
+        self.assertIn('b', self.accessor._cache)
+
+        self.accessor.goTo('b', 1)
+        self.assertEqual(1, self.func.calls['b'])
+
+    def testPrefetchesCountAgainstMemoryLimit(self) -> None:
+        """Test finished prefetches are bounded by the cache memory limit"""
+
+        nbytes = int(self.func('a').memory_usage(deep=True).sum())
+        accessor = SpectralAccessor(MockData(), self.objIds, 'time', prefetch=2, maxCacheBytes=2 * nbytes)
+        for objId in self.objIds:
+            accessor.goTo(objId, 1)
+            self.assertLessEqual(accessor.cacheInfo.nbytes, 2 * nbytes)
+
+        accessor.close()
+
+    def testStopIterationAtEnd(self) -> None:
+        """Test ``StopIteration`` is raised when moving past the last supernova"""
+
+        self.accessor.goTo('e', 1)
+        with self.assertRaises(StopIteration):
+            self.accessor.loadNextSN()
+
+
+class SynchronousAccess(TestCase):
+    """Tests for an accessor with prefetching disabled"""
+
+    def runTest(self) -> None:
+        """Test only the requested supernova is loaded on the calling thread"""
+
+        func = MockData()
+        accessor = SpectralAccessor(func, ['a', 'b'], 'time', prefetch=0)
+        self.assertEqual({'a': 1}, dict(func.calls))
+        self.assertEqual({threading.current_thread().name}, func.threads)
+        accessor.close()
+
+
+class DataCaching(TestCase):
+    """Tests for the LRU cache of loaded supernova data"""
+
+    def setUp(self) -> None:
+        """Create an accessor without prefetching and a two entry cache"""
+
+        self.func = MockData()
+        self.accessor = SpectralAccessor(self.func, ['a', 'b', 'c'], 'time', prefetch=0, maxCacheEntries=2)
+
+    def testRevisitedDataIsCached(self) -> None:
+        """Test going back and forth between supernovae does not reload data"""
+
+        self.accessor.loadNextSN()
+        self.accessor.loadPreviousSN()
+        self.accessor.goTo('b', 1)
+        self.assertEqual({'a': 1, 'b': 1}, dict(self.func.calls))
+
+    def testHitMissCounters(self) -> None:
+        """Test cache hits and misses are counted"""
+
+        self.accessor.loadNextSN()
+        self.accessor.loadPreviousSN()
+        info = self.accessor.cacheInfo
+        self.assertEqual(1, info.hits)
+        self.assertEqual(2, info.misses)
+        self.assertEqual(2, info.entries)
+
+    def testEvictionByEntries(self) -> None:
+        """Test the least recently used supernova is evicted when the cache is full"""
+
+        self.accessor.loadNextSN()
+        self.accessor.loadNextSN()
+        self.accessor.goTo('a', 1)
+        self.assertEqual(2, self.func.calls['a'])
+
+    def testEvictionByMemory(self) -> None:
+        """Test entries are evicted when the cached data exceeds the memory limit"""
+
+        nbytes = int(self.func('a').memory_usage(deep=True).sum())
+        accessor = SpectralAccessor(MockData(), ['a', 'b', 'c'], 'time', prefetch=0, maxCacheBytes=nbytes)
+        accessor.loadNextSN()
+        self.assertEqual(1, accessor.cacheInfo.entries)
+        self.assertEqual(nbytes, accessor.cacheInfo.nbytes)
+
+    def testSpecForSNUsesCache(self) -> None:
+        """Test listing spectra for a supernova uses the requested Id and cached data"""
+
+        self.assertEqual([1, 2], self.accessor.specForSN('b'))
+        self.accessor.loadNextSN()
+        self.assertEqual(1, self.func.calls['b'])
+
+    def testInvalidate(self) -> None:
+        """Test invalidated data is reloaded on next access"""
+
+        self.accessor.invalidate('a')
+        self.accessor.goTo('a', 1)
+        self.assertEqual(2, self.func.calls['a'])
+
+        self.accessor.invalidate()
+        self.assertEqual(0, self.accessor.cacheInfo.entries)
+
+
+class SpectrumGrouping(TestCase):
+    """Tests for the index of individual spectra within supernova data"""
+
+    def setUp(self) -> None:
+        """Create an accessor for data with interleaved spectrum Ids"""
+
+        self.data = pd.DataFrame(
+            {'time': [3, 1, 3, 2, 1, 2], 'flux': np.arange(6.)},
+            index=[4000, 4000, 4001, 4000, 4001, 4001])
+
+        self.accessor = SpectralAccessor(lambda objId: self.data, ['a'], 'time', prefetch=0)
+
+    def testAvailableSpecIds(self) -> None:
+        """Test spectrum Ids are sorted and unique"""
+
+        self.assertEqual([1, 2, 3], self.accessor.availableSpecIds)
+
+    def testSpectrumMatchesMask(self) -> None:
+        """Test each spectrum matches selecting rows with a boolean mask"""
+
+        for specId in self.accessor.availableSpecIds:
+            self.accessor.goTo('a', specId)
+            expected = self.data[self.data['time'] == specId].flux
+            pd.testing.assert_series_equal(expected, self.accessor.spectrum)
+
+    def testSpectrumIsView(self) -> None:
+        """Test spectra are returned without copying data that is already grouped"""
+
+        data = self.data.sort_values('time', kind='stable')
+        accessor = SpectralAccessor(lambda objId: data, ['a'], 'time', prefetch=0)
+        self.assertTrue(np.shares_memory(data.flux.values, accessor.spectrum.values))
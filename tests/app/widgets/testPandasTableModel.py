@@ -0,0 +1,183 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from PyQt5 import QtCore, QtWidgets
+
+from leed.app.widgets import PandasTableModel
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def columnValues(model: PandasTableModel, col: int) -> list:
+    """Return the displayed values of a column for all rows available to the view"""
+
+    return [model.data(model.index(row, col)) for row in range(model.rowCount())]
+
+
+class CellValues(TestCase):
+    """Tests for the values displayed by the model"""
+
+    def setUp(self) -> None:
+        self.data = pd.DataFrame({'name': ['b', 'a', 'c'], 'value': [2., np.nan, 1.], 'flag': [1, 0, 1]})
+        self.model = PandasTableModel(self.data)
+
+    def testDimensions(self) -> None:
+        """Test the row and column counts match the data"""
+
+        self.assertEqual(3, self.model.rowCount())
+        self.assertEqual(3, self.model.columnCount())
+
+    def testCellsMatchData(self) -> None:
+        """Test every cell displays the string representation of its value"""
+
+        for col, name in enumerate(self.data.columns):
+            self.assertListEqual([str(v) for v in self.data[name]], columnValues(self.model, col))
+
+    def testHeaderNames(self) -> None:
+        """Test horizontal headers display column names"""
+
+        header = self.model.headerData(1, QtCore.Qt.Horizontal, QtCore.Qt.DisplayRole)
+        self.assertEqual('value', header)
+
+    def testToPandasReturnsCopy(self) -> None:
+        """Test ``toPandas`` returns a copy of the original data"""
+
+        returned = self.model.toPandas()
+        pd.testing.assert_frame_equal(self.data, returned)
+        self.assertIsNot(self.data, returned)
+
+
+class IncrementalLoading(TestCase):
+    """Tests for exposing rows to the view in batches"""
+
+    def setUp(self) -> None:
+        self.model = PandasTableModel(pd.DataFrame({'value': np.arange(25)}), batchSize=10)
+
+    def testFirstBatchAvailable(self) -> None:
+        """Test only the first batch of rows is initially available"""
+
+        self.assertEqual(10, self.model.rowCount())
+        self.assertTrue(self.model.canFetchMore(QtCore.QModelIndex()))
+
+    def testFetchMore(self) -> None:
+        """Test rows are added one batch at a time until all rows are available"""
+
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        while self.model.canFetchMore(QtCore.QModelIndex()):
+            self.model.fetchMore(QtCore.QModelIndex())
+
+        self.assertListEqual([(10, 19), (20, 24)], inserted)
+        self.assertEqual(25, self.model.rowCount())
+
+
+class Sorting(TestCase):
+    """Tests for sorting the table by a column"""
+
+    def setUp(self) -> None:
+        self.data = pd.DataFrame({'name': ['b', 'a', 'c', 'd'], 'value': [2., np.nan, 1., 3.]})
+        self.model = PandasTableModel(self.data)
+
+    def testAscending(self) -> None:
+        """Test sorting in ascending order places missing values last"""
+
+        self.model.sort(1, QtCore.Qt.AscendingOrder)
+        self.assertListEqual(['c', 'b', 'd', 'a'], columnValues(self.model, 0))
+
+    def testDescending(self) -> None:
+        """Test sorting in descending order places missing values last"""
+
+        self.model.sort(1, QtCore.Qt.DescendingOrder)
+        self.assertListEqual(['d', 'b', 'c', 'a'], columnValues(self.model, 0))
+
+    def testOriginalOrderRestored(self) -> None:
+        """Test sorting by column -1 restores the original order"""
+
+        self.model.sort(0, QtCore.Qt.DescendingOrder)
+        self.model.sort(-1)
+        self.assertListEqual(list(self.data['name']), columnValues(self.model, 0))
+
+    def testDataNotCopied(self) -> None:
+        """Test sorting does not modify or replace the underlying data"""
+
+        original = self.model._data
+        self.model.sort(1)
+        self.assertIs(original, self.model._data)
+        pd.testing.assert_frame_equal(self.data, self.model.toPandas())
+
+
+class Filtering(TestCase):
+    """Tests for filtering rows by their contents"""
+
+    def setUp(self) -> None:
+        self.data = pd.DataFrame({'name': ['SN2004dt', 'sn2005a', 'SN2006X'], 'notes': ['ok', 'noisy', 'SN ok']})
+        self.model = PandasTableModel(self.data)
+
+    def testCaseInsensitive(self) -> None:
+        """Test rows are matched regardless of case"""
+
+        self.model.setFilter('sn200', column=0)
+        self.assertEqual(3, self.model.rowCount())
+
+    def testSingleColumn(self) -> None:
+        """Test filtering a single column ignores matches in other columns"""
+
+        self.model.setFilter('ok', column=0)
+        self.assertEqual(0, self.model.rowCount())
+
+    def testAllColumns(self) -> None:
+        """Test filtering without a column searches every column"""
+
+        self.model.setFilter('ok')
+        self.assertListEqual(['SN2004dt', 'SN2006X'], columnValues(self.model, 0))
+
+    def testFilterWithSort(self) -> None:
+        """Test filtered rows follow the sort order"""
+
+        self.model.sort(0, QtCore.Qt.DescendingOrder)
+        self.model.setFilter('ok')
+        self.assertListEqual(['SN2006X', 'SN2004dt'], columnValues(self.model, 0))
+
+    def testClearFilter(self) -> None:
+        """Test an empty filter shows all rows"""
+
+        self.model.setFilter('noisy')
+        self.model.setFilter('')
+        self.assertEqual(3, self.model.rowCount())
+
+
+class AppendingRows(TestCase):
+    """Tests for appending rows to a sorted or filtered model"""
+
+    def setUp(self) -> None:
+        self.model = PandasTableModel(pd.DataFrame({'name': ['a', 'b'], 'value': [1., 2.]}))
+
+    def testFilteredRowsNotShown(self) -> None:
+        """Test appended rows not matching the filter are hidden"""
+
+        self.model.setFilter('a', column=0)
+        self.model._appendRows(pd.DataFrame({'name': ['c', 'aa'], 'value': [3., 4.]}))
+        self.assertListEqual(['a', 'aa'], columnValues(self.model, 0))
+
+    def testResortIncludesNewRows(self) -> None:
+        """Test appended rows are moved into place when the table is sorted again"""
+
+        self.model.sort(1, QtCore.Qt.DescendingOrder)
+        self.model._appendRows(pd.DataFrame({'name': ['c'], 'value': [1.5]}))
+        self.model.sort(1, QtCore.Qt.DescendingOrder)
+        self.assertListEqual(['b', 'c', 'a'], columnValues(self.model, 0))
+
+    def testRepeatedSingleRowAppends(self) -> None:
+        """Test appending one row at a time grows the column arrays geometrically"""
+
+        rows = [pd.DataFrame({'name': [f'n{i}'], 'value': [float(i)]}) for i in range(200)]
+        reallocations = 0
+        for row in rows:
+            array = self.model._arrays[1]
+            self.model._appendRows(row)
+            reallocations += self.model._arrays[1] is not array
+
+        self.assertLess(reallocations, 10)
+        expected = pd.concat([pd.DataFrame({'name': ['a', 'b'], 'value': [1., 2.]})] + rows, ignore_index=True)
+        pd.testing.assert_frame_equal(expected, self.model.toPandas())
@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+import pandas as pd
+from PyQt5 import QtWidgets
+
+from leed.app.widgets import ResultsModel
+from leed.app.windows.savedResultsWindow import SavedResultsWindow
+from tests.app.testResultsStore import makeResults
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class CompactStorage(TestCase):
+    """Tests for the column types used to store results"""
+
+    def setUp(self) -> None:
+        self.model = ResultsModel(makeResults(['a', 'b'], [1.5, 2.5]))
+
+    def testCategoricalColumns(self) -> None:
+        """Test object Ids and feature names are stored as categoricals"""
+
+        self.assertIsInstance(self.model._data['feat_name'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(self.model._data['obj_id'].dtype, pd.CategoricalDtype)
+
+    def testRoundTrip(self) -> None:
+        """Test ``toPandas`` returns the original values"""
+
+        expected = makeResults(['a', 'b'], [1.5, 2.5])
+        pd.testing.assert_frame_equal(expected, self.model.toPandas(), check_dtype=False, check_index_type=False)
+
+    def testEmptyModel(self) -> None:
+        """Test a model can be created without any results"""
+
+        self.assertEqual(0, ResultsModel().rowCount())
+
+
+class IncrementalUpdates(TestCase):
+    """Tests for adding results to an existing model"""
+
+    def setUp(self) -> None:
+        self.model = ResultsModel(makeResults(['a'], [1.5]))
+        self.inserted = []
+        self.changed = []
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+        self.model.dataChanged.connect(lambda first, last: self.changed.append((first.row(), last.row())))
+
+    def testNewRowsInserted(self) -> None:
+        """Test new results emit a single row insertion at the end of the table"""
+
+        self.model.upsert(makeResults(['b', 'c'], [1.5]))
+        self.assertListEqual([(2, 5)], self.inserted)
+        self.assertEqual(6, self.model.rowCount())
+
+    def testExistingRowsUpdated(self) -> None:
+        """Test existing results are replaced in place"""
+
+        self.model.upsert(makeResults(['a'], [1.5], featNames=['pW2'], pew=5))
+        self.assertListEqual([], self.inserted)
+        self.assertListEqual([(1, 1)], self.changed)
+        self.assertEqual(5, self.model.toPandas().loc[('a', 1.5, 'pW2'), 'pew'])
+        self.assertEqual(2, self.model.rowCount())
+
+    def testNewCategoriesAdded(self) -> None:
+        """Test new feature names are added to the categorical column"""
+
+        self.model.upsert(makeResults(['a'], [1.5], featNames=['pW7']))
+        self.assertIn('pW7', self.model._data['feat_name'].cat.categories)
+        self.assertIsInstance(self.model._data['feat_name'].dtype, pd.CategoricalDtype)
+
+
+class LiveResultsWindow(TestCase):
+    """Tests for displaying a ``ResultsModel`` in a ``SavedResultsWindow``"""
+
+    def testViewFollowsModel(self) -> None:
+        """Test the table view shows results added after the window is opened"""
+
+        model = ResultsModel(makeResults(['a'], [1.5]))
+        window = SavedResultsWindow(model)
+        model.upsert(makeResults(['b'], [1.5]))
+        self.assertEqual(4, window.tableView.model().rowCount())
+        self.assertIn('updated', window.statusbar.currentMessage())
+
+    def testCloseDisconnects(self) -> None:
+        """Test closing the window stops it from following the model"""
+
+        model = ResultsModel(makeResults(['a'], [1.5]))
+        window = SavedResultsWindow(model)
+        inserted, changed = model.receivers(model.rowsInserted), model.receivers(model.dataChanged)
+
+        window.close()
+        self.assertEqual(inserted - 1, model.receivers(model.rowsInserted))
+        self.assertEqual(changed - 1, model.receivers(model.dataChanged))
+
+    def testReplacedModelDisconnected(self) -> None:
+        """Test the window stops following a model once it displays another one"""
+
+        model = ResultsModel(makeResults(['a'], [1.5]))
+        connected = model.receivers(model.rowsInserted)
+        window = SavedResultsWindow(model)
+        window.setModel(ResultsModel(makeResults(['b'], [1.5])))
+        self.assertEqual(connected, model.receivers(model.rowsInserted))
+
+        window.updateTableView(makeResults(['c'], [1.5]))
+        self.assertIsNone(window._resultsModel)
@@ -4,6 +4,7 @@ from unittest import TestCase
 from PyQt5.QtWidgets import QApplication
 
 from leed.app.windows import BaseWindow
+from leed.app.windows.baseWindow import loadFormClass
 
 app = QApplication([])
 
@@ -52,3 +53,29 @@ class DisableSlot(TestCase):
         window.setDisabled(False)
         window.disableWindowSlot()
         self.assertFalse(window.isEnabled())
+
+
+class CachedLayouts(TestCase):
+    """Test design files are compiled once and reused by every window"""
+
+    class ResultsLayoutWindow(BaseWindow):
+        designFile = 'ResultsWindow.ui'
+
+    def testFormClassReused(self) -> None:
+        """Test windows using the same design file share a single form class"""
+
+        first = self.ResultsLayoutWindow()
+        misses = loadFormClass.cache_info().misses
+        second = self.ResultsLayoutWindow()
+
+        self.assertIs(type(first.ui), type(second.ui))
+        self.assertEqual(misses, loadFormClass.cache_info().misses)
+
+    def testWidgetsExposed(self) -> None:
+        """Test widgets defined in the design file are available as window attributes"""
+
+        first = self.ResultsLayoutWindow()
+        second = self.ResultsLayoutWindow()
+        self.assertIs(first.ui.tableView, first.tableView)
+        self.assertIsNot(first.tableView, second.tableView)
+        self.assertIs(first, first.tableView.window())
@@ -0,0 +1,62 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication
+
+from leed.app.settings import loadSettings
+from leed.app.settingsService import SettingsService
+from leed.app.windows import FeatureDefinitionsWindow
+
+app = QApplication.instance() or QApplication([])
+
+
+class SettingsSubscription(TestCase):
+    """Tests for following feature definitions saved outside the window"""
+
+    def setUp(self) -> None:
+        """Open the window on a temporary settings file"""
+
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        self.patch = patch('leed.app.settings.SETTINGS_PATH', self.path)
+        self.patch.start()
+
+        SettingsService._instance = SettingsService(self.path)
+        self.window = FeatureDefinitionsWindow()
+
+    def tearDown(self) -> None:
+        self.window.close()
+        SettingsService._instance.close()
+        SettingsService._instance = None
+        self.patch.stop()
+        self.tempDir.cleanup()
+
+    def _saveFeatures(self, numFeatures: int) -> None:
+        """Save settings with only the first few feature definitions"""
+
+        settings = loadSettings(self.path)
+        settings.features = settings.features[:numFeatures]
+        settings.saveToDisk(self.path)
+
+    def testTableFollowsSavedFeatures(self) -> None:
+        """Test the table is repopulated when features are saved elsewhere"""
+
+        self._saveFeatures(2)
+        self.assertEqual(2, self.window.tableWidget.rowCount())
+
+    def testApplySavesFeatures(self) -> None:
+        """Test applied features are saved to the followed settings file"""
+
+        self.window.tableWidget.removeRow(0)
+        self.window.apply()
+        self.assertEqual(self.window.tableWidget.contentsToList(), loadSettings(self.path).features)
+
+    def testCloseDisconnects(self) -> None:
+        """Test closed windows stop following saved settings"""
+
+        numRows = self.window.tableWidget.rowCount()
+        self.window.close()
+        self._saveFeatures(2)
+        self.assertEqual(numRows, self.window.tableWidget.rowCount())
@@ -0,0 +1,59 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication
+
+from leed.app.settings import ColorSettings, SettingsLoader, loadSettings
+from leed.app.settingsService import SettingsService
+from leed.app.windows import PlotSettingsWindow
+
+app = QApplication.instance() or QApplication([])
+
+
+class SettingsSubscription(TestCase):
+    """Tests for keeping settings saved outside the window"""
+
+    def setUp(self) -> None:
+        """Open the window on a temporary settings file and edit a plot color"""
+
+        self.tempDir = TemporaryDirectory()
+        self.path = Path(self.tempDir.name) / 'settings.yml'
+        self.patch = patch('leed.app.settings.SETTINGS_PATH', self.path)
+        self.patch.start()
+
+        SettingsService._instance = SettingsService(self.path)
+        self.window = PlotSettingsWindow()
+        self.color = ColorSettings(1, 2, 3, 4)
+        self.window.settings.plotting.boundary.color = self.color
+
+        # Save different feature definitions while the window is open
+        settings = loadSettings(self.path)
+        settings.features = settings.features[:2]
+        settings.saveToDisk(self.path)
+        self.features = settings.features
+
+    def tearDown(self) -> None:
+        self.window.close()
+        SettingsService._instance.close()
+        SettingsService._instance = None
+        self.patch.stop()
+        self.tempDir.cleanup()
+
+    def testApplyKeepsSavedFeatures(self) -> None:
+        """Test applying plot settings does not overwrite features saved elsewhere"""
+
+        self.window.apply()
+        saved = loadSettings(self.path)
+        self.assertEqual(self.features, saved.features)
+        self.assertEqual(self.color, saved.plotting.boundary.color)
+
+    def testRestoreDefaultsKeepsFeatures(self) -> None:
+        """Test restoring defaults only resets the plot settings"""
+
+        self.window.restoreDefaults()
+        self.window.apply()
+        saved = loadSettings(self.path)
+        self.assertEqual(self.features, saved.features)
+        self.assertEqual(SettingsLoader(defaults=True).plotting, saved.plotting)
@@ -0,0 +1,117 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from leed import batch
+from leed.app.settings import FeatureDefinition
+from leed.app.utils import SpectralAccessor, get_results_dataframe
+from leed.executors import LocalClusterExecutor, ProcessExecutor
+from tests import simulate
+
+FEATURES = [
+    FeatureDefinition('Blue', 3600, 3800, 4000, 4200, 4400),
+    FeatureDefinition('Red', 6600, 6800, 7000, 7200, 7400),
+]
+
+
+def getData(objId: str) -> pd.DataFrame:
+    """Return two simulated spectra with a gaussian absorption feature"""
+
+    wave = np.arange(3500, 4500, dtype=float)
+    frames = []
+    for time, depth in ((1, .5), (2, .4)):
+        flux = simulate.gaussian(wave, depth=-depth, mean=4000 + len(objId), stddev=100, offset=1).values
+        frames.append(pd.DataFrame({'time': time, 'flux': flux}, index=wave))
+
+    return pd.concat(frames)
+
+
+def getAccessor() -> SpectralAccessor:
+    """Return an accessor over simulated data"""
+
+    return SpectralAccessor(getData, ['a', 'bb', 'ccc'], 'time')
+
+
+class LoadFactory(TestCase):
+    """Tests for the importing of accessor factories"""
+
+    def testColonPath(self) -> None:
+        """Test factories can be specified as ``module:attribute``"""
+
+        self.assertIs(getAccessor, batch.loadFactory('tests.testBatch:getAccessor'))
+
+    def testDottedPath(self) -> None:
+        """Test factories can be specified as ``module.attribute``"""
+
+        self.assertIs(getAccessor, batch.loadFactory('tests.testBatch.getAccessor'))
+
+
+class MeasureAll(TestCase):
+    """Tests for the measurement of every spectrum in an accessor"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Measure simulated data serially, with a process pool, and with a local cluster"""
+
+        cls.tempDir = TemporaryDirectory()
+        cls.serialPath = Path(cls.tempDir.name) / 'serial.csv'
+        cls.parallelPath = Path(cls.tempDir.name) / 'parallel.csv'
+        cls.clusterPath = Path(cls.tempDir.name) / 'cluster.csv'
+        cls.results = batch.measureAll(getAccessor(), FEATURES, cls.serialPath, nstep=1)
+        with ProcessExecutor(2) as executor:
+            batch.measureAll(getAccessor(), FEATURES, cls.parallelPath, executor, nstep=1)
+
+        with LocalClusterExecutor(nodes=2, chunksize=2) as executor:
+            batch.measureAll(getAccessor(), FEATURES, cls.clusterPath, executor, nstep=1)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tempDir.cleanup()
+
+    def testOneRowPerFeature(self) -> None:
+        """Test a row is written for every object, spectrum, and feature"""
+
+        self.assertEqual(3 * 2 * len(FEATURES), len(self.results))
+
+    def testOutputIndependentOfWorkers(self) -> None:
+        """Test the written results do not depend on the executor"""
+
+        self.assertEqual(self.serialPath.read_text(), self.parallelPath.read_text())
+        self.assertEqual(self.serialPath.read_text(), self.clusterPath.read_text())
+
+    def testReadableAsResults(self) -> None:
+        """Test the written file is readable with ``get_results_dataframe``"""
+
+        saved = get_results_dataframe(self.serialPath)
+        self.assertListEqual(list(get_results_dataframe().columns), list(saved.columns))
+        self.assertEqual(len(self.results), len(saved))
+
+    def testUnobservedFeatureFlagged(self) -> None:
+        """Test features outside the observed wavelength range are flagged with NaN values"""
+
+        unobserved = self.results.xs('Red', level='feat_name')
+        self.assertTrue((unobserved.feat_flag == 1).all())
+        self.assertTrue(unobserved.vel.isna().all())
+
+    def testObservedFeatureMeasured(self) -> None:
+        """Test observed features are measured"""
+
+        observed = self.results.xs('Blue', level='feat_name')
+        self.assertTrue((observed.feat_flag == 0).all())
+        self.assertFalse(observed.pew.isna().any())
+
+
+class PreprocessAll(TestCase):
+    """Tests for the parallel loading of object data"""
+
+    def runTest(self) -> None:
+        """Test objects are returned in order with the data from the access function"""
+
+        with ProcessExecutor(2) as executor:
+            loaded = list(batch.preprocessAll(getData, ['a', 'bb', 'ccc'], executor))
+
+        self.assertEqual(['a', 'bb', 'ccc'], [objId for objId, _ in loaded])
+        pd.testing.assert_frame_equal(getData('bb'), loaded[1][1])
@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest import TestCase
+
+from leed import executors
+
+
+def square(x: int) -> int:
+    """Return the square of a number, finishing later for smaller inputs"""
+
+    time.sleep(.001 * (10 - x % 10))
+    return x * x
+
+
+def fail(x: int) -> int:
+    """Raise an error for odd inputs"""
+
+    if x % 2:
+        raise ValueError(f'Odd input {x}')
+
+    return x
+
+
+class ExecutorOrdering:
+    """Tests shared by every executor type"""
+
+    def makeExecutor(self, chunksize: int) -> executors.Executor:
+        raise NotImplementedError
+
+    def testResultsInOrder(self) -> None:
+        """Test results are returned in input order for several chunk sizes"""
+
+        for chunksize in (1, 3, 50):
+            with self.makeExecutor(chunksize) as executor:
+                self.assertEqual([x * x for x in range(25)], executor.map(square, range(25)))
+
+    def testChunksizeOverride(self) -> None:
+        """Test the chunk size passed to ``map`` overrides the default"""
+
+        with self.makeExecutor(1) as executor:
+            self.assertEqual([x * x for x in range(7)], executor.map(square, range(7), chunksize=4))
+
+    def testErrorsPropagate(self) -> None:
+        """Test errors raised by tasks are raised by ``map``"""
+
+        with self.makeExecutor(2) as executor, self.assertRaises(ValueError):
+            executor.map(fail, range(5))
+
+
+class Serial(ExecutorOrdering, TestCase):
+    """Tests for the ``SerialExecutor`` class"""
+
+    def makeExecutor(self, chunksize: int) -> executors.Executor:
+        return executors.SerialExecutor(chunksize)
+
+    def testRunsInCallingThread(self) -> None:
+        """Test tasks are evaluated in the calling thread"""
+
+        executor = executors.SerialExecutor()
+        names = executor.map(lambda _: threading.current_thread().name, range(3))
+        self.assertEqual({threading.current_thread().name}, set(names))
+
+
+class Threads(ExecutorOrdering, TestCase):
+    """Tests for the ``ThreadExecutor`` class"""
+
+    def makeExecutor(self, chunksize: int) -> executors.Executor:
+        return executors.ThreadExecutor(3, chunksize)
+
+
+class Processes(ExecutorOrdering, TestCase):
+    """Tests for the ``ProcessExecutor`` class"""
+
+    def makeExecutor(self, chunksize: int) -> executors.Executor:
+        return executors.ProcessExecutor(2, chunksize)
+
+
+class LocalCluster(ExecutorOrdering, TestCase):
+    """Tests for the ``LocalClusterExecutor`` class"""
+
+    def makeExecutor(self, chunksize: int) -> executors.Executor:
+        return executors.LocalClusterExecutor(nodes=2, workersPerNode=1, chunksize=chunksize)
+
+    def testWorkerCount(self) -> None:
+        """Test the number of workers is the total over all nodes"""
+
+        with executors.LocalClusterExecutor(nodes=3, workersPerNode=2) as executor:
+            self.assertEqual(6, executor.workers)
+
+    def testSharedScheduler(self) -> None:
+        """Test an existing scheduler is not shut down by the executor"""
+
+        scheduler = executors.LocalScheduler(nodes=2)
+        with executors.LocalClusterExecutor(scheduler=scheduler) as executor:
+            executor.map(square, range(3))
+
+        self.assertEqual(4, scheduler.submit(square, 2).result())
+        scheduler.shutdown()
+
+
+class InvalidArguments(TestCase):
+    """Tests for the validation of executor arguments"""
+
+    def runTest(self) -> None:
+        """Test a ValueError is raised for a non-positive chunk size"""
+
+        with self.assertRaises(ValueError):
+            executors.SerialExecutor(chunksize=0)
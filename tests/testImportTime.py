@@ -0,0 +1,137 @@
+"""Import time budget for the ``leed`` package.
+
+Each test imports a module in a fresh interpreter with ``-X importtime`` and
+records the cumulative import time of every module. ``numpy`` and ``pandas``
+are imported first so their cost is excluded from the budget.
+
+Budgets are multiples of the time taken to start a bare interpreter, so they
+scale with the speed of the machine running the tests. Set the
+``LEED_STRICT_IMPORT_TIME`` environment variable to use tighter budgets.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from unittest import TestCase
+
+# Maximum cumulative import time as a multiple of the interpreter startup time, excluding numpy and pandas
+IMPORT_BUDGETS = {
+    'leed': 5.,
+    'leed.batch': 5.,
+}
+
+# Budgets used when ``LEED_STRICT_IMPORT_TIME`` is set
+STRICT_IMPORT_BUDGETS = {
+    'leed': 2.,
+    'leed.batch': 2.,
+}
+
+# Number of repeated measurements, of which the fastest is used
+REPEATS = 3
+
+# Dependencies that should only be imported on first use
+DEFERRED_MODULES = ('PyQt5', 'astropy', 'scipy', 'extinction', 'pyqtgraph', 'uncertainties')
+
+
+def startupTime() -> float:
+    """Return the time in seconds taken to start and exit a bare interpreter"""
+
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def importTimes(module: str) -> Dict[str, float]:
+    """Import a module in a new interpreter and return the cumulative import time of each module
+
+    Modules imported by ``numpy`` and ``pandas`` are not included.
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        A dictionary mapping module names to import times in seconds
+    """
+
+    code = f'import numpy, pandas; import {module}'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True
+    )
+
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+
+        # Modules are listed once imported, so everything before pandas was imported for numpy and pandas
+        if name.strip() == 'pandas':
+            times.clear()
+
+    return times
+
+
+def importedModules(module: str) -> List[str]:
+    """Import a module in a new interpreter and return the names of all imported top level packages
+
+    Args:
+        module: Name of the module to import
+
+    Returns:
+        Names of top level packages in ``sys.modules``
+    """
+
+    code = f'import sys, {module}; print(" ".join(sorted({{m.split(".")[0] for m in sys.modules}})))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class ImportBudget(TestCase):
+    """Tests for the time taken to import the package"""
+
+    def testBudgets(self) -> None:
+        """Test modules are imported within their time budget"""
+
+        budgets = STRICT_IMPORT_BUDGETS if os.environ.get('LEED_STRICT_IMPORT_TIME') else IMPORT_BUDGETS
+        startup = startupTime()
+        for module, budget in budgets.items():
+            times = min((importTimes(module) for _ in range(REPEATS)), key=lambda t: t[module])
+            slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+            report = '\n'.join(f'{t:8.3f} s  {name}' for name, t in slowest)
+            print(
+                f'\nImport of {module}: {times[module]:.3f} s '
+                f'({times[module] / startup:.1f}x interpreter startup of {startup:.3f} s)\n{report}',
+                file=sys.stderr
+            )
+
+            with self.subTest(module=module):
+                self.assertLessEqual(
+                    times[module], budget * startup,
+                    f'Import of {module} exceeded {budget}x interpreter startup:\n{report}')
+
+
+class DeferredImports(TestCase):
+    """Tests for heavy dependencies being imported on first use"""
+
+    def testPackageImport(self) -> None:
+        """Test importing the package does not import heavy dependencies"""
+
+        imported = importedModules('leed')
+        for dependency in DEFERRED_MODULES:
+            self.assertNotIn(dependency, imported)
+
+    def testBatchImport(self) -> None:
+        """Test batch processing can be imported without Qt or heavy dependencies"""
+
+        imported = importedModules('leed.batch')
+        for dependency in DEFERRED_MODULES:
+            self.assertNotIn(dependency, imported)
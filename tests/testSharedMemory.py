@@ -0,0 +1,137 @@
+from multiprocessing import shared_memory
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from leed.executors import ProcessExecutor
+from leed.sharedMemory import ArrayRef, SharedArrayStore, SpectrumRef, resolve, shareArrays
+
+
+def totalFlux(ref: SpectrumRef) -> float:
+    """Sum the flux of a shared spectrum in a worker process"""
+
+    return float(ref.toSeries().sum())
+
+
+class ArrayRoundTrip(TestCase):
+    """Tests for sharing arrays through a ``SharedArrayStore``"""
+
+    def setUp(self) -> None:
+        self.store = SharedArrayStore(blockSize=1024)
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def testValuesPreserved(self) -> None:
+        """Test resolved arrays match the original values and dtype"""
+
+        for array in (np.arange(10, dtype=float), np.arange(5, dtype=np.int32), np.array([], dtype=float)):
+            resolved = self.store.put(array).resolve()
+            np.testing.assert_array_equal(array, resolved)
+            self.assertEqual(array.dtype, resolved.dtype)
+
+    def testResolvedArraysAreReadOnly(self) -> None:
+        """Test arrays rebuilt from shared memory cannot be modified"""
+
+        resolved = self.store.put(np.arange(10.)).resolve()
+        with self.assertRaises(ValueError):
+            resolved[0] = 1
+
+    def testArraysPacked(self) -> None:
+        """Test small arrays share a block and large arrays get a dedicated block"""
+
+        first = self.store.put(np.arange(10.))
+        second = self.store.put(np.arange(10.))
+        large = self.store.put(np.arange(1000.))
+        self.assertEqual(first.block, second.block)
+        self.assertNotEqual(first.block, large.block)
+        self.assertEqual(0, second.offset % 64)
+
+    def testSeriesIsZeroCopy(self) -> None:
+        """Test series rebuilt from a reference do not copy the shared arrays"""
+
+        ref = self.store.putSeries(pd.Series(np.arange(10.), index=np.arange(4000., 4010.)))
+        series = ref.toSeries()
+        self.assertTrue(np.shares_memory(ref.flux.resolve(), series.values))
+        self.assertTrue(np.shares_memory(ref.wave.resolve(), series.index.values))
+
+    def testSpectrum(self) -> None:
+        """Test spectra rebuilt from a reference match the original arrays"""
+
+        wave, flux = np.arange(4000., 4010.), np.arange(10.)
+        spectrum = self.store.putSpectrum(wave, flux, flux / 10).toSpectrum()
+        np.testing.assert_array_equal(wave, spectrum.wave)
+        np.testing.assert_array_equal(flux / 10, spectrum.error)
+
+    def testObjectArraysRejected(self) -> None:
+        """Test a ValueError is raised for arrays of python objects"""
+
+        with self.assertRaises(ValueError):
+            self.store.put(np.array(['a', None], dtype=object))
+
+
+class BlockLifetime(TestCase):
+    """Tests for freeing shared memory blocks"""
+
+    @staticmethod
+    def blockExists(name: str) -> bool:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def testReleasedBlocksFreed(self) -> None:
+        """Test full blocks are freed once all references are released"""
+
+        with SharedArrayStore(blockSize=100) as store:
+            first = store.put(np.arange(10.))
+            store.put(np.arange(10.))  # Does not fit in the first block
+            self.assertTrue(self.blockExists(first.block))
+
+            store.release(first)
+            self.assertFalse(self.blockExists(first.block))
+
+    def testCloseFreesBlocks(self) -> None:
+        """Test closing the store frees all blocks"""
+
+        store = SharedArrayStore()
+        ref = store.put(np.arange(10.))
+        store.close()
+        self.assertFalse(self.blockExists(ref.block))
+
+
+class WorkerAccess(TestCase):
+    """Tests for resolving shared memory references in worker processes"""
+
+    def runTest(self) -> None:
+        """Test workers see the values written by the parent process"""
+
+        series = [pd.Series(np.full(100, i, dtype=float), index=np.arange(100.)) for i in range(5)]
+        with SharedArrayStore() as store, ProcessExecutor(2) as executor:
+            refs = [store.putSeries(s) for s in series]
+            self.assertEqual([s.sum() for s in series], executor.map(totalFlux, refs))
+
+
+class ShareArrays(TestCase):
+    """Tests for the ``shareArrays`` context manager"""
+
+    def testDisabled(self) -> None:
+        """Test arrays are passed through unchanged when sharing is disabled"""
+
+        array = np.arange(5.)
+        with shareArrays(False, array, None) as (shared, missing):
+            self.assertIs(array, shared)
+            self.assertIsNone(missing)
+
+    def testEnabled(self) -> None:
+        """Test arrays are replaced by references when sharing is enabled"""
+
+        array = np.arange(5.)
+        with shareArrays(True, array, None) as (shared, missing):
+            self.assertIsInstance(shared, ArrayRef)
+            self.assertIsNone(missing)
+            np.testing.assert_array_equal(array, resolve(shared))